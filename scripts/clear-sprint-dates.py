@@ -7,16 +7,22 @@ Usage:
     python3 scripts/clear-sprint-dates.py --sprint 673 --fields duedate
     python3 scripts/clear-sprint-dates.py --sprint 673 --fields customfield_10015,duedate
     python3 scripts/clear-sprint-dates.py --sprint 673 --jql "status != Done"
+    python3 scripts/clear-sprint-dates.py --sprint 673 --bulk      # Jira bulk edit (1000 issues/request)
+    python3 scripts/clear-sprint-dates.py --sprint 673 --no-cache  # bypass the local snapshot
 """
 
 import argparse
 import sys
+import time
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent / ".claude/skills/atlassian-scripts"))
 
+from common.invalidation import invalidate_snapshot, invalidation_summary
+from common.snapshot import SnapshotCache, fetch_search_issues
+from common.transport import HTTPStatusError, PooledJiraAPI
 from lib.auth import create_ssl_context, get_auth_header, load_credentials
-from lib.jira_api import JiraAPI, derive_jira_url
+from lib.jira_api import derive_jira_url
 
 DEFAULT_FIELDS = ["customfield_10015", "duedate"]
 FIELD_LABELS = {
@@ -24,22 +30,10 @@ FIELD_LABELS = {
     "duedate": "Due Date",
 }
 
-
-def fetch_all_tickets(api: JiraAPI, jql: str, fields: list[str]) -> list[dict]:
-    """Fetch all tickets matching JQL with pagination."""
-    tickets = []
-    start_at = 0
-    while True:
-        result = api.search_issues(jql, fields=",".join(["key", *fields]), max_results=50, start_at=start_at)
-        issues = result.get("issues", [])
-        if not issues:
-            break
-        tickets.extend(issues)
-        # stop if we got fewer than max
-        if len(issues) < 50:
-            break
-        start_at += len(issues)
-    return tickets
+# Jira Cloud bulk field edit: POST /rest/api/3/bulk/issues/fields → poll /bulk/queue/{taskId}
+BULK_CHUNK_SIZE = 1000
+BULK_POLL_INTERVAL = 1.0  # seconds
+BULK_TIMEOUT = 300  # seconds per chunk
 
 
 def has_dates(issue: dict, fields: list[str]) -> bool:
@@ -48,6 +42,85 @@ def has_dates(issue: dict, fields: list[str]) -> bool:
     return any(f.get(field) is not None for field in fields)
 
 
+def clear_one(api: PooledJiraAPI, key: str, null_fields: dict) -> bool:
+    """Clear fields on one issue via PUT. Prints the outcome."""
+    try:
+        status = api.update_fields(key, null_fields)
+    except Exception as e:
+        print(f"  ✗ {key} — {e}")
+        return False
+    if status == 204:
+        print(f"  ✓ {key}")
+        return True
+    print(f"  ⚠ {key} — HTTP {status}")
+    return False
+
+
+def bulk_clear(api: PooledJiraAPI, tickets: list[dict], fields: list[str]) -> tuple[list[str], list[str], list[str]]:
+    """Clear date fields with the bulk edit API, one task per chunk of up to 1000 issues.
+
+    Returns (cleared_keys, leftover_keys, pending_keys). Leftovers are issues
+    a finished bulk task did not process, a chunk whose task status could not
+    be read, or every remaining issue once bulk edit turns out to be
+    unavailable — the caller falls back to per-issue PUTs for those. Pending
+    issues belong to a task still running at BULK_TIMEOUT; they are not
+    retried, so nothing races the task.
+    """
+    id_to_key = {t["id"]: t["key"] for t in tickets}
+    cleared: list[str] = []
+    leftover: list[str] = []
+    pending: list[str] = []
+
+    for i in range(0, len(tickets), BULK_CHUNK_SIZE):
+        chunk = tickets[i : i + BULK_CHUNK_SIZE]
+        body = {
+            "selectedActions": fields,
+            # Keys rather than IDs, so the mutation log can invalidate them
+            "selectedIssueIdsOrKeys": [t["key"] for t in chunk],
+            # A date picker entry without "date" clears the field
+            "editedFieldsInput": {"datePickerFields": [{"fieldId": f} for f in fields]},
+            "sendBulkNotification": False,
+        }
+        try:
+            task_id = api._request("POST", "/rest/api/3/bulk/issues/fields", body)["taskId"]
+        except HTTPStatusError as e:
+            print(f"  Bulk edit unavailable (HTTP {e.status}) — falling back to per-issue updates")
+            leftover.extend(t["key"] for t in tickets[i:])
+            break
+        print(f"  bulk task {task_id}: {len(chunk)} issues")
+
+        deadline = time.monotonic() + BULK_TIMEOUT
+        try:
+            while True:
+                progress = api._request("GET", f"/rest/api/3/bulk/queue/{task_id}")
+                state = progress.get("status")
+                if state not in ("ENQUEUED", "RUNNING") or time.monotonic() > deadline:
+                    break
+                time.sleep(BULK_POLL_INTERVAL)
+        except HTTPStatusError as e:
+            print(f"  bulk task {task_id}: status unavailable (HTTP {e.status}) — updating this chunk individually")
+            leftover.extend(t["key"] for t in chunk)
+            continue
+
+        if state in ("ENQUEUED", "RUNNING"):
+            print(f"  bulk task {task_id}: still {state} after {BULK_TIMEOUT}s — not retrying its {len(chunk)} issues")
+            pending.extend(t["key"] for t in chunk)
+            continue
+
+        processed = {str(x) for x in progress.get("processedAccessibleIssues", [])}
+        failed_ids = progress.get("failedAccessibleIssues", {}) or {}
+        for t in chunk:
+            if t["id"] in processed and t["id"] not in failed_ids:
+                cleared.append(t["key"])
+            else:
+                leftover.append(t["key"])
+        for issue_id, errors in failed_ids.items():
+            print(f"  ⚠ {id_to_key.get(str(issue_id), issue_id)} — {'; '.join(map(str, errors))}")
+        print(f"  bulk task {task_id}: {state}, {len(processed)}/{len(chunk)} processed")
+
+    return cleared, leftover, pending
+
+
 def main():
     parser = argparse.ArgumentParser(description="Clear date fields from sprint tickets")
     parser.add_argument("--sprint", required=True, type=int, help="Sprint ID (e.g., 673)")
@@ -59,6 +132,10 @@ def main():
     )
     parser.add_argument("--jql", default="", help="Additional JQL filter (e.g., 'status != Done')")
     parser.add_argument("--dry-run", action="store_true", help="Show what would be cleared without making changes")
+    parser.add_argument(
+        "--bulk", action="store_true", help="Use Jira bulk edit (falls back to per-issue PUT when unavailable)"
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the local issue snapshot")
     args = parser.parse_args()
 
     fields = [f.strip() for f in args.fields.split(",")]
@@ -71,7 +148,7 @@ def main():
 
     # Connect
     creds = load_credentials()
-    api = JiraAPI(
+    api = PooledJiraAPI(
         base_url=derive_jira_url(creds["CONFLUENCE_URL"]),
         auth_header=get_auth_header(creds["CONFLUENCE_USERNAME"], creds["CONFLUENCE_API_TOKEN"]),
         ssl_context=create_ssl_context(),
@@ -79,7 +156,9 @@ def main():
 
     # Fetch
     print(f"Fetching tickets: {jql}")
-    all_tickets = fetch_all_tickets(api, jql, fields)
+    # Dry runs read through the local snapshot; real runs always refresh it first
+    cache = None if args.no_cache else SnapshotCache()
+    all_tickets = fetch_search_issues(api, jql, ",".join(["key", *fields]), cache, ttl=0 if not args.dry_run else None)
     tickets_with_dates = [t for t in all_tickets if has_dates(t, fields)]
 
     print(f"Found {len(all_tickets)} tickets, {len(tickets_with_dates)} have dates to clear ({field_names})")
@@ -99,22 +178,29 @@ def main():
     success = 0
     failed = []
     null_fields = {f: None for f in fields}
-
-    for t in tickets_with_dates:
-        key = t["key"]
-        try:
-            status = api.update_fields(key, null_fields)
-            if status == 204:
-                print(f"  ✓ {key}")
-                success += 1
-            else:
-                print(f"  ⚠ {key} — HTTP {status}")
-                failed.append(key)
-        except Exception as e:
-            print(f"  ✗ {key} — {e}")
+    remaining = [t["key"] for t in tickets_with_dates]
+    pending = []
+
+    if args.bulk:
+        cleared, remaining, pending = bulk_clear(api, tickets_with_dates, fields)
+        success += len(cleared)
+        if remaining:
+            print(f"  {len(remaining)} issues not cleared by bulk edit — updating individually")
+
+    for key in remaining:
+        if clear_one(api, key, null_fields):
+            success += 1
+        else:
             failed.append(key)
 
     print(f"\nDone: {success}/{len(tickets_with_dates)} cleared")
+    if pending:
+        print(f"Still running in a bulk task (re-run to verify): {', '.join(pending)}")
+    if api.mutations:
+        invalidate_snapshot(api.mutations, cache or SnapshotCache())
+        print(invalidation_summary(api.mutations, [args.sprint]))
+    stats = api.pool.stats()
+    print(f"Connections: {stats['connections_opened']} opened, {stats['connections_reused']} reused")
     if failed:
         print(f"Failed: {', '.join(failed)}")
 
@@ -0,0 +1,26 @@
+"""Shared helpers for the sprint scripts in scripts/.
+
+Scripts run as ``python3 scripts/<name>.py``, so ``scripts/`` is already on
+``sys.path`` and ``from common import ...`` works without extra setup.
+"""
+
+from common.invalidation import MutationLog, invalidate_snapshot
+from common.issue import Issue, parse_issues
+from common.pagination import iter_search_issues, iter_sprint_issues, paginate
+from common.ratelimit import AdaptiveRateLimiter
+from common.transport import ConnectionPool, HTTPStatusError, PooledConfluenceAPI, PooledJiraAPI
+
+__all__ = [
+    "AdaptiveRateLimiter",
+    "ConnectionPool",
+    "HTTPStatusError",
+    "Issue",
+    "MutationLog",
+    "PooledConfluenceAPI",
+    "PooledJiraAPI",
+    "invalidate_snapshot",
+    "iter_search_issues",
+    "iter_sprint_issues",
+    "paginate",
+    "parse_issues",
+]
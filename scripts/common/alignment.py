@@ -0,0 +1,208 @@
+"""Subtask alignment analysis (HR8 dates, missing dates, missing OE).
+
+Pure functions over common.issue.Issue objects — no API calls — shared by
+sprint-subtask-alignment.py and sprint-doctor.py.
+"""
+
+import re
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+from common.issue import Issue
+from common.sprint import PARENT_TYPES, SKIP_STATUSES
+
+PARENT_FIELDS = (
+    "summary,status,issuetype,assignee,customfield_10015,duedate,customfield_10016,customfield_10107,timetracking"
+)
+SUBTASK_FIELDS = "summary,status,issuetype,parent,assignee,priority,customfield_10015,duedate,timetracking"
+
+# Size → Hours mapping (for subtask OE estimation when parent has Size)
+PARENT_SIZE_TO_SUBTASK_DEFAULT = {"XS": "2h", "S": "4h", "M": "4h", "L": "4h", "XL": "8h"}
+
+# Keyword-based OE estimation for subtasks
+OE_PATTERNS = [
+    (r"migration|schema|table", "2h"),
+    (r"enum|hook|toast|tab|routing|button|action|empty.?state|tag|filter", "2h"),
+    (r"recheck|combine|review|audit", "2h"),
+    (r"transformer|adapter|mapper", "2h"),
+    (r"test|qa|spec", "4h"),
+    (r"route.*controller|controller.*route|endpoint", "4h"),
+    (r"usecase|repository|service", "4h"),
+    (r"api.?integration|connect.*api|เชื่อมต่อ", "4h"),
+    (r"component|layout|sidebar|drawer|panel|card|list|form", "4h"),
+    (r"redlock|lock|race.?condition|security", "4h"),
+    (r"loading|error.?state|success.?state|handle.*state", "2h"),
+    (r"bug|fix|hotfix|แก้", "4h"),
+]
+DEFAULT_OE = "4h"
+_OE_REGEXES = [(re.compile(pattern), hours) for pattern, hours in OE_PATTERNS]
+
+
+@lru_cache(maxsize=4096)
+def estimate_oe(summary: str) -> str:
+    """Estimate original_estimate from subtask summary keywords."""
+    lower = summary.lower()
+    for regex, hours in _OE_REGEXES:
+        if regex.search(lower):
+            return hours
+    return DEFAULT_OE
+
+
+def clamp_date(date_str: str, min_date: str, max_date: str) -> str:
+    """Clamp a date string within [min_date, max_date] range."""
+    if date_str < min_date:
+        return min_date
+    if date_str > max_date:
+        return max_date
+    return date_str
+
+
+def distribute_dates(count: int, parent_start: str, parent_due: str) -> list[tuple[str, str]]:
+    """Distribute subtask dates evenly within parent range."""
+    start = datetime.strptime(parent_start, "%Y-%m-%d")
+    end = datetime.strptime(parent_due, "%Y-%m-%d")
+    total_days = max((end - start).days, count)
+
+    days_per = max(total_days // count, 1)
+    results = []
+    for i in range(count):
+        s = start + timedelta(days=i * days_per)
+        d = min(s + timedelta(days=days_per - 1), end)
+        # Clamp to parent range
+        s = max(s, start)
+        d = min(d, end)
+        results.append((s.strftime("%Y-%m-%d"), d.strftime("%Y-%m-%d")))
+    return results
+
+
+def collect_parents(issues) -> dict[str, Issue]:
+    """Index active Story/Task/Bug issues by key."""
+    return {i.key: i for i in issues if i.status not in SKIP_STATUSES and i.type in PARENT_TYPES}
+
+
+def subtask_priority_key(s: Issue) -> tuple[int, str]:
+    """Sort key: priority (Highest=1 first), then due date."""
+    return (s.priority_rank, s.due or "9999-12-31")
+
+
+def analyze_alignment(parents: dict[str, Issue], active_subtasks: list[Issue], report_only: bool = False) -> tuple:
+    """Check subtasks against their parents and collect fixes.
+
+    Single grouped pass: subtasks are bucketed by parent once, each parent's
+    date distribution is computed once, and slots are handed out by index —
+    O(n) overall instead of rescanning siblings for every subtask.
+
+    Returns (date_violations, missing_dates, missing_oe, fixes).
+    """
+    date_violations = []
+    missing_dates = []
+    missing_oe = []
+    fixes = []  # (key, fields_to_update, reason)
+    parent_extensions = {}  # parent_key → new_due (extend parent if subtasks overshoot)
+
+    # Group subtasks by parent for date distribution
+    # Sort each group by priority (Highest first → gets earlier dates)
+    subtasks_by_parent: dict[str, list[Issue]] = {}
+    for s in active_subtasks:
+        if s.parent in parents:
+            subtasks_by_parent.setdefault(s.parent, []).append(s)
+
+    # Per parent: extension (max subtask due) + one distribution for subtasks missing dates
+    distributed: dict[str, tuple[str, str]] = {}  # subtask key → (start, due)
+    for parent_key, subs in subtasks_by_parent.items():
+        subs.sort(key=subtask_priority_key)
+        p = parents[parent_key]
+        p_start = p.start
+        p_due = p.due
+        if not p_due:
+            continue
+
+        max_sub_due = max((s.due or p_due for s in subs), default=p_due)
+        if max_sub_due > p_due:
+            parent_extensions[parent_key] = max_sub_due
+
+        if report_only or not p_start:
+            continue
+        missing_in_group = [x for x in subs if not x.start or not x.due]
+        if missing_in_group:
+            dates = distribute_dates(len(missing_in_group), p_start, parent_extensions.get(parent_key, p_due))
+            for x, slot in zip(missing_in_group, dates, strict=False):
+                distributed[x.key] = slot
+
+    for s in active_subtasks:
+        key = s.key
+        parent_key = s.parent
+
+        if parent_key not in parents:
+            continue
+
+        p = parents[parent_key]
+        p_start = p.start
+        p_due = p.due
+
+        if not p_start or not p_due:
+            continue  # Parent has no dates — can't validate
+
+        # Use extended parent due if applicable
+        effective_p_due = parent_extensions.get(parent_key, p_due)
+
+        sub_start = s.start
+        sub_due = s.due
+
+        update_fields: dict = {}
+
+        # Check dates
+        if not sub_start or not sub_due:
+            missing_dates.append((key, parent_key, sub_start, sub_due))
+            # Fix: slot assigned by the grouped distribution above
+            if key in distributed:
+                new_start, new_due = distributed[key]
+                update_fields["customfield_10015"] = new_start
+                update_fields["duedate"] = new_due
+        else:
+            # Check HR8 violations — only flag start-before-parent (subtask too early)
+            # For subtask-due > parent-due: extend parent instead of clamping subtask
+            violations = []
+            new_start = sub_start
+
+            if sub_start < p_start:
+                violations.append(f"start {sub_start} < parent start {p_start}")
+                new_start = p_start
+            if sub_due > p_due:
+                violations.append(f"due {sub_due} > parent due {p_due} → extend parent to {effective_p_due}")
+
+            if violations:
+                date_violations.append((key, parent_key, sub_start, sub_due, p_start, p_due, "; ".join(violations)))
+                if not report_only:
+                    new_start = clamp_date(new_start, p_start, effective_p_due)
+                    new_due = sub_due
+                    # If due is before new start, move due to new start
+                    if new_due < new_start:
+                        new_due = new_start
+                    if new_start != sub_start:
+                        update_fields["customfield_10015"] = new_start
+                    if new_due != sub_due:
+                        update_fields["duedate"] = new_due
+
+        # Check OE
+        if not s.estimate:
+            missing_oe.append((key, parent_key, s.summary))
+            if not report_only:
+                estimated = estimate_oe(s.summary)
+                update_fields["timetracking"] = {"originalEstimate": estimated}
+
+        if update_fields:
+            reason_parts = []
+            if "customfield_10015" in update_fields or "duedate" in update_fields:
+                reason_parts.append("dates")
+            if "timetracking" in update_fields:
+                reason_parts.append(f"OE={update_fields['timetracking']['originalEstimate']}")
+            fixes.append((key, update_fields, ", ".join(reason_parts)))
+
+    # Add parent extension fixes
+    for parent_key, new_due in parent_extensions.items():
+        p = parents[parent_key]
+        if not report_only:
+            fixes.append((parent_key, {"duedate": new_due}, f"extend due {p.due}→{new_due} (subtasks overshoot)"))
+
+    return date_violations, missing_dates, missing_oe, fixes
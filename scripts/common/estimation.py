@@ -0,0 +1,54 @@
+"""Story Points / Original Estimate derived from the Size (T-shirt) field.
+
+Size → SP: XS=1, S=2, M=3, L=5, XL=8
+Size → Hours: XS=2h, S=4h, M=8h, L=16h, XL=32h
+"""
+
+from common.issue import Issue
+from common.sprint import SKIP_STATUSES
+
+SIZE_TO_SP = {"XS": 1, "S": 2, "M": 3, "L": 5, "XL": 8}
+SIZE_TO_HOURS = {"XS": "2h", "S": "4h", "M": "8h", "L": "16h", "XL": "32h"}
+
+ESTIMATION_FIELDS = "summary,status,issuetype,parent,customfield_10016,customfield_10107,timetracking"
+
+
+def extract_size_letter(size_value: str | None) -> str | None:
+    """Extract size letter from Jira value like 'M (1-2 days)'."""
+    if not size_value:
+        return None
+    token = size_value.strip().split()[0].upper()
+    return token if token in SIZE_TO_SP else None
+
+
+def plan_estimate(issue: Issue, force: bool = False) -> dict:
+    """Field updates for one issue (empty if nothing to set).
+
+    Subtask-level issues (has parent, not Story/Bug) get timetracking OE;
+    everything else gets Story Points. Existing values are kept unless force.
+    """
+    size_letter = extract_size_letter(issue.size)
+    if not size_letter:
+        return {}
+
+    # Subtask-level: has parent and not Story/Bug
+    if issue.parent and issue.type not in ("Story", "Bug"):
+        if not issue.estimate or force:
+            return {"timetracking": {"originalEstimate": SIZE_TO_HOURS[size_letter]}}
+        return {}
+
+    if not issue.story_points or force:
+        return {"customfield_10016": SIZE_TO_SP[size_letter]}
+    return {}
+
+
+def estimation_fixes(issues, force: bool = False) -> list[tuple[str, dict, str]]:
+    """(key, fields, reason) for every active issue whose SP/OE should be set from Size."""
+    fixes = []
+    for issue in issues:
+        if issue.status in SKIP_STATUSES:
+            continue
+        update_fields = plan_estimate(issue, force)
+        if update_fields:
+            fixes.append((issue.key, update_fields, f"Size={extract_size_letter(issue.size)}"))
+    return fixes
@@ -0,0 +1,117 @@
+"""Concurrent Epic → Story → Subtask loading.
+
+``load_children`` splits parent keys into ``parent in (...)`` batches, runs
+them on a thread pool and paginates each one to the end, so a parent with
+dozens of subtasks is never truncated at one page. Results are deduplicated
+by key (an issue can only match one batch, but overlapping root sets and
+re-parented issues can repeat) and keep parent order, not completion order.
+
+``load_hierarchy`` walks that level by level from a sprint or JQL root set.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from common.snapshot import SnapshotCache, fetch_search_issues, fetch_sprint_issues
+
+PARENT_BATCH = 20  # keys per `parent in (...)` query — keeps the JQL well under URL limits
+DEFAULT_WORKERS = 4
+
+
+def _with_parent(fields: str) -> str:
+    names = [f.strip() for f in fields.split(",") if f.strip()]
+    return fields if "parent" in names else ",".join([*names, "parent"])
+
+
+def load_children(
+    api,
+    parent_keys: list[str],
+    fields: str,
+    cache: SnapshotCache | None = None,
+    ttl: float | None = None,
+    workers: int = DEFAULT_WORKERS,
+    batch_size: int = PARENT_BATCH,
+) -> list[dict]:
+    """All direct children of ``parent_keys``, fully paginated and deduplicated.
+
+    Batches run concurrently (HR2: no ORDER BY with parent); output follows
+    batch order, so it is deterministic regardless of which query finishes first.
+    """
+    keys = list(dict.fromkeys(parent_keys))
+    batches = [keys[i : i + batch_size] for i in range(0, len(keys), batch_size)]
+    if not batches:
+        return []
+
+    def fetch(batch: list[str]) -> list[dict]:
+        return fetch_search_issues(api, f"parent in ({','.join(batch)})", fields, cache, ttl)
+
+    with ThreadPoolExecutor(max_workers=max(min(workers, len(batches)), 1)) as pool:
+        results = list(pool.map(fetch, batches))
+
+    seen: dict[str, dict] = {}
+    for issues in results:
+        for issue in issues:
+            seen.setdefault(issue["key"], issue)
+    return list(seen.values())
+
+
+def load_hierarchy(
+    api,
+    roots: list[dict],
+    fields: str,
+    depth: int = 2,
+    cache: SnapshotCache | None = None,
+    ttl: float | None = None,
+    workers: int = DEFAULT_WORKERS,
+) -> dict[str, list[dict]]:
+    """Children of every issue reachable from ``roots``, keyed by parent key.
+
+    ``depth`` levels below the roots are loaded (2 = Epic → Story → Subtask).
+    Issues already seen are not expanded again, so cycles and issues that
+    appear both as roots and as children cost nothing extra.
+    """
+    fields = _with_parent(fields)
+    tree: dict[str, list[dict]] = {}
+    seen = {r["key"] for r in roots}
+    frontier = [r["key"] for r in roots]
+
+    for _ in range(depth):
+        if not frontier:
+            break
+        children = load_children(api, frontier, fields, cache, ttl, workers)
+        frontier = []
+        for child in children:
+            parent = (child.get("fields", {}).get("parent") or {}).get("key")
+            if parent:
+                tree.setdefault(parent, []).append(child)
+            if child["key"] not in seen:
+                seen.add(child["key"])
+                frontier.append(child["key"])
+    return tree
+
+
+def sprint_hierarchy(
+    api,
+    sprint_id: int,
+    fields: str,
+    depth: int = 2,
+    cache: SnapshotCache | None = None,
+    ttl: float | None = None,
+    workers: int = DEFAULT_WORKERS,
+) -> tuple[list[dict], dict[str, list[dict]]]:
+    """(sprint issues, children by parent key) for a sprint."""
+    roots = fetch_sprint_issues(api, sprint_id, fields, cache, ttl)
+    return roots, load_hierarchy(api, roots, fields, depth, cache, ttl, workers)
+
+
+def search_hierarchy(
+    api,
+    jql: str,
+    fields: str,
+    depth: int = 2,
+    cache: SnapshotCache | None = None,
+    ttl: float | None = None,
+    workers: int = DEFAULT_WORKERS,
+) -> tuple[list[dict], dict[str, list[dict]]]:
+    """(matching issues, children by parent key) for a JQL query."""
+    roots = fetch_search_issues(api, jql, fields, cache, ttl)
+    return roots, load_hierarchy(api, roots, fields, depth, cache, ttl, workers)
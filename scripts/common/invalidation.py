@@ -0,0 +1,98 @@
+"""Snapshot invalidation for the keys a run actually changed.
+
+PooledTransport records every successful write in a ``MutationLog``. At the
+end of an --apply run, ``invalidate_snapshot`` marks only the SnapshotCache
+snapshots containing those keys stale (next read does an incremental
+refresh; re-ranked scopes get a full one) instead of dropping them all.
+
+jira-cache-server lives outside this repo and is not notified, so
+``invalidation_summary`` ends with the cache_invalidate reminder.
+"""
+
+import re
+import threading
+from urllib.parse import urlsplit
+
+REMINDER_KEYS = 20  # changed keys listed in the cache_invalidate reminder
+
+_ISSUE_PATH = re.compile(r"^/rest/api/\d+/issue/([A-Z][A-Z0-9_]*-\d+)(?:/|$|\?)")
+_SPRINT_PATH = re.compile(r"^/rest/agile/1\.0/sprint/(\d+)(?:/|$|\?)")
+_RANK_PATH = "/rest/agile/1.0/issue/rank"
+_BULK_PATH = "/rest/api/3/bulk/issues/"
+_CREATE_PATH = re.compile(r"^/rest/api/\d+/issue/?$")
+
+
+class MutationLog:
+    """Thread-safe record of issue keys and sprints changed during a run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys: dict[str, None] = {}  # insertion-ordered set
+        self._ranked: dict[str, None] = {}
+        self._sprints: dict[int, None] = {}
+
+    def record(self, keys=(), sprint_ids=(), ranked=False):
+        with self._lock:
+            for k in keys:
+                self._keys[k] = None
+                if ranked:
+                    self._ranked[k] = None
+            for s in sprint_ids:
+                self._sprints[int(s)] = None
+
+    def record_request(self, method: str, path: str, data, result):
+        """Derive mutated keys/sprints from a successful write request."""
+        if method == "GET":
+            return
+        path = urlsplit(path).path
+        if m := _ISSUE_PATH.match(path):
+            self.record(keys=[m.group(1)])
+        elif _CREATE_PATH.match(path) and isinstance(result, dict) and result.get("key"):
+            self.record(keys=[result["key"]])
+        elif path.startswith(_RANK_PATH) and isinstance(data, dict):
+            self.record(keys=data.get("issues", []), ranked=True)
+        elif path.startswith(_BULK_PATH) and isinstance(data, dict):
+            self.record(keys=data.get("selectedIssueIdsOrKeys", []))
+        elif m := _SPRINT_PATH.match(path):
+            self.record(sprint_ids=[m.group(1)])
+
+    @property
+    def keys(self) -> list[str]:
+        with self._lock:
+            return list(self._keys)
+
+    @property
+    def ranked_keys(self) -> list[str]:
+        with self._lock:
+            return list(self._ranked)
+
+    @property
+    def sprint_ids(self) -> list[int]:
+        with self._lock:
+            return list(self._sprints)
+
+    def __bool__(self) -> bool:
+        with self._lock:
+            return bool(self._keys or self._sprints)
+
+
+def invalidate_snapshot(log: MutationLog, snapshot) -> int:
+    """Mark snapshots holding the mutated keys stale. Returns the number of keys."""
+    keys = log.keys
+    if keys:
+        snapshot.invalidate(keys, reordered=log.ranked_keys)
+    return len(keys)
+
+
+def invalidation_summary(log: MutationLog, sprint_ids=()) -> str:
+    """What invalidate_snapshot did, plus the cache_invalidate reminder for jira-cache-server."""
+    keys = log.keys
+    shown = ", ".join(keys[:REMINDER_KEYS])
+    if len(keys) > REMINDER_KEYS:
+        shown += f" (+{len(keys) - REMINDER_KEYS} more)"
+    sprints = list(dict.fromkeys([*log.sprint_ids, *(int(s) for s in sprint_ids)]))
+    call = f"cache_invalidate(sprint_id={sprints[0]})" if len(sprints) == 1 else "cache_invalidate"
+    return (
+        f"Marked {len(keys)} changed issues stale in the local snapshot\n"
+        f"⚠️  jira-cache-server is not notified — run {call} after this! Changed: {shown or '-'}"
+    )
@@ -0,0 +1,112 @@
+"""Compact, slotted view of a Jira issue.
+
+Sprint analyses only ever read a dozen scalar fields, but a raw search
+response keeps every issue as several levels of nested dicts. ``Issue``
+parses the projected fields once, keeps plain attributes in ``__slots__``
+(no per-instance ``__dict__``) and interns repeated strings such as status
+and type names, so board-wide loads stay small and hot loops read
+attributes instead of chaining ``.get()`` calls.
+"""
+
+import sys
+
+from common.sprint import PRIORITY_ORDER
+
+START_DATE_FIELD = "customfield_10015"
+STORY_POINTS_FIELD = "customfield_10016"
+SIZE_FIELD = "customfield_10107"
+
+_intern = sys.intern
+
+
+def parse_date(val) -> str | None:
+    """Extract date string from Jira field value."""
+    if isinstance(val, dict):
+        return val.get("value") or None
+    return val or None
+
+
+def _option(val) -> str | None:
+    """Value of a select-list field (option dict or plain string)."""
+    if isinstance(val, dict):
+        return val.get("value")
+    return val
+
+
+class Issue:
+    """One Jira issue reduced to the fields the sprint scripts use."""
+
+    __slots__ = (
+        "assignee",
+        "due",
+        "estimate",
+        "key",
+        "parent",
+        "priority",
+        "size",
+        "start",
+        "status",
+        "story_points",
+        "summary",
+        "type",
+    )
+
+    def __init__(
+        self,
+        key: str,
+        summary: str = "",
+        status: str = "?",
+        type: str = "?",
+        parent: str | None = None,
+        assignee: str = "Unassigned",
+        priority: str = "Medium",
+        start: str | None = None,
+        due: str | None = None,
+        size: str | None = None,
+        story_points: float | None = None,
+        estimate: str | None = None,
+    ):
+        self.key = key
+        self.summary = summary
+        self.status = _intern(status)
+        self.type = _intern(type)
+        self.parent = parent
+        self.assignee = _intern(assignee)
+        self.priority = _intern(priority)
+        self.start = start
+        self.due = due
+        self.size = size
+        self.story_points = story_points
+        self.estimate = estimate
+
+    @classmethod
+    def from_json(cls, raw: dict) -> "Issue":
+        """Parse a search/sprint response entry. Missing fields get the usual defaults."""
+        f = raw.get("fields") or {}
+        return cls(
+            key=raw["key"],
+            summary=f.get("summary") or "",
+            status=(f.get("status") or {}).get("name", "?"),
+            type=(f.get("issuetype") or {}).get("name", "?"),
+            parent=(f.get("parent") or {}).get("key"),
+            assignee=(f.get("assignee") or {}).get("displayName", "Unassigned"),
+            priority=(f.get("priority") or {}).get("name", "Medium"),
+            start=parse_date(f.get(START_DATE_FIELD)),
+            due=f.get("duedate") or None,
+            size=_option(f.get(SIZE_FIELD)),
+            story_points=f.get(STORY_POINTS_FIELD),
+            estimate=(f.get("timetracking") or {}).get("originalEstimate") or None,
+        )
+
+    @property
+    def priority_rank(self) -> int:
+        """Numeric priority (Highest=1); unknown names rank as Medium."""
+        return PRIORITY_ORDER.get(self.priority, 3)
+
+    def __repr__(self) -> str:
+        return f"Issue({self.key!r}, status={self.status!r}, type={self.type!r}, parent={self.parent!r})"
+
+
+def parse_issues(raw_issues) -> list[Issue]:
+    """Parse raw issue dicts into Issue objects, keeping order."""
+    return [Issue.from_json(raw) for raw in raw_issues]
@@ -0,0 +1,55 @@
+"""Streaming pagination for Jira search/sprint endpoints.
+
+``paginate`` yields issues page by page and fetches page N+1 on a background
+thread while the caller is still processing page N, so network latency
+overlaps with local work instead of adding to it.
+"""
+
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+
+PAGE_SIZE = 50  # Agile sprint endpoint caps maxResults at 50
+
+FetchPage = Callable[[int, int], dict]  # (start_at, max_results) → Jira response dict
+
+
+def paginate(fetch_page: FetchPage, page_size: int = PAGE_SIZE) -> Iterator[dict]:
+    """Yield every issue from a startAt/maxResults paginated endpoint.
+
+    Stops on an empty page, a short page, or once ``total`` (when the
+    response includes it) has been reached — so no trailing empty request
+    is made for sprints whose size is known up front.
+    """
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        start_at = 0
+        pending = pool.submit(fetch_page, start_at, page_size)
+        while pending is not None:
+            result = pending.result()
+            batch = result.get("issues", [])
+            if not batch:
+                return
+
+            start_at += len(batch)
+            total = result.get("total")
+            more = len(batch) >= page_size and (total is None or start_at < total)
+            pending = pool.submit(fetch_page, start_at, page_size) if more else None
+
+            yield from batch
+
+
+def iter_sprint_issues(api, sprint_id: int, fields: str, page_size: int = PAGE_SIZE) -> Iterator[dict]:
+    """Stream all issues in a sprint (GET /rest/agile/1.0/sprint/{id}/issue)."""
+    return paginate(
+        lambda start_at, max_results: api.get_sprint_issues(
+            sprint_id, fields=fields, max_results=max_results, start_at=start_at
+        ),
+        page_size,
+    )
+
+
+def iter_search_issues(api, jql: str, fields: str, page_size: int = PAGE_SIZE) -> Iterator[dict]:
+    """Stream all issues matching a JQL query."""
+    return paginate(
+        lambda start_at, max_results: api.search_issues(jql, fields=fields, max_results=max_results, start_at=start_at),
+        page_size,
+    )
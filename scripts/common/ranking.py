@@ -0,0 +1,96 @@
+"""Board ranking by due date + priority with minimal rank moves."""
+
+from common.issue import Issue
+from common.sprint import PARENT_TYPES, SKIP_STATUSES
+
+RANK_FIELDS = "summary,status,issuetype,priority,duedate,assignee"
+RANK_BATCH_SIZE = 50  # PUT /rest/agile/1.0/issue/rank accepts up to 50 issues
+NO_DUE_DATE = "9999-12-31"  # sorts undated issues after every real date
+
+
+def rank_candidates(issues) -> list[Issue]:
+    """Active parent issues, in the order given.
+
+    The sprint issue endpoint returns issues in board rank order, so the
+    result doubles as the current board order for plan_rank_moves().
+    """
+    return [i for i in issues if i.status not in SKIP_STATUSES and i.type in PARENT_TYPES]
+
+
+def sort_for_rank(parents: list[Issue], due_overrides: dict[str, str | None] | None = None) -> list[Issue]:
+    """Target order: due date ASC (no date last), then priority rank ASC (Highest=1 first).
+
+    ``due_overrides`` maps keys to due dates that are about to be written,
+    so callers can rank on the board as it will look after their updates.
+    """
+    overrides = due_overrides or {}
+    return sorted(parents, key=lambda x: (overrides.get(x.key, x.due) or NO_DUE_DATE, x.priority_rank))
+
+
+def longest_increasing_subsequence(seq: list[int]) -> set[int]:
+    """Return the indices of one longest strictly increasing subsequence (O(n log n))."""
+    tails: list[int] = []  # tails[k] = index into seq of the smallest tail of a run of length k+1
+    prev = [-1] * len(seq)
+    for i, v in enumerate(seq):
+        lo, hi = 0, len(tails)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if seq[tails[mid]] < v:
+                lo = mid + 1
+            else:
+                hi = mid
+        prev[i] = tails[lo - 1] if lo else -1
+        if lo == len(tails):
+            tails.append(i)
+        else:
+            tails[lo] = i
+
+    keep = set()
+    i = tails[-1] if tails else -1
+    while i != -1:
+        keep.add(i)
+        i = prev[i]
+    return keep
+
+
+def plan_rank_moves(current: list[str], target: list[str]) -> list[tuple[list[str], str | None, str | None]]:
+    """Plan the fewest rank calls that turn `current` board order into `target`.
+
+    Issues on the longest increasing subsequence (w.r.t. target position)
+    stay put. Every other issue is moved; consecutive movers in target order
+    form one run ranked after their target predecessor (or before the first
+    anchor when the run opens the list). Returns [(keys, rank_after, rank_before)].
+    """
+    target_pos = {k: i for i, k in enumerate(target)}
+    seq = [target_pos[k] for k in current]
+    stay = {current[i] for i in longest_increasing_subsequence(seq)}
+
+    moves = []
+    run: list[str] = []
+    for i, key in enumerate(target):
+        if key not in stay:
+            run.append(key)
+        if run and (key in stay or i == len(target) - 1):
+            start = target_pos[run[0]]
+            after = target[start - 1] if start > 0 else None
+            before = None if after else next((k for k in target if k in stay), None)
+            for j in range(0, len(run), RANK_BATCH_SIZE):
+                chunk = run[j : j + RANK_BATCH_SIZE]
+                moves.append((chunk, after, before))
+                after, before = chunk[-1], None
+            run = []
+    return moves
+
+
+def rank_run(api, keys: list[str], rank_after: str | None, rank_before: str | None):
+    """Rank `keys` (in order) after/before an anchor issue. Raises on partial failure."""
+    body: dict = {"issues": keys}
+    if rank_after:
+        body["rankAfterIssue"] = rank_after
+    else:
+        body["rankBeforeIssue"] = rank_before
+    result = api._request("PUT", "/rest/agile/1.0/issue/rank", body)
+    # 207 Multi-Status lists per-issue outcomes
+    failed = [e for e in result.get("entries", []) if e.get("errors")]
+    if failed:
+        raise RuntimeError("; ".join(f"{e.get('issueKey')}: {', '.join(e['errors'])}" for e in failed))
@@ -0,0 +1,123 @@
+"""Adaptive client-side rate limiting for Atlassian Cloud.
+
+``AdaptiveRateLimiter`` is a token bucket shared by every thread using one
+API client. It learns from the server instead of a fixed ``time.sleep``:
+
+- ``429`` / ``503`` + ``Retry-After`` → pause all callers for that long and halve the rate
+- ``X-RateLimit-NearLimit: true`` or low ``X-RateLimit-Remaining`` → back off gently
+- ``X-RateLimit-Remaining: 0`` → pause until ``X-RateLimit-Reset``
+- otherwise → creep the rate back up (additive increase)
+"""
+
+import threading
+import time
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+
+DEFAULT_RATE = 10.0  # requests/second to start with
+MIN_RATE = 0.5
+MAX_RATE = 50.0
+RATE_STEP = 0.5  # additive increase per healthy response
+DEFAULT_BACKOFF = 2.0  # seconds, when throttled without Retry-After
+MAX_BACKOFF = 60.0
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse Retry-After — delta seconds or HTTP-date — into seconds from now."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max((when - datetime.now(UTC)).total_seconds(), 0.0)
+
+
+def _parse_reset(value: str | None) -> float | None:
+    """Parse X-RateLimit-Reset (ISO 8601 timestamp) into seconds from now."""
+    if not value:
+        return None
+    try:
+        when = datetime.fromisoformat(value.strip())
+    except ValueError:
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=UTC)
+    return max((when - datetime.now(UTC)).total_seconds(), 0.0)
+
+
+class AdaptiveRateLimiter:
+    """Thread-safe token bucket whose rate follows server feedback (AIMD)."""
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_RATE,
+        burst: int | None = None,
+        min_rate: float = MIN_RATE,
+        max_rate: float = MAX_RATE,
+    ):
+        self.rate = rate
+        self.burst = burst or max(int(rate), 1)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+        self.throttled = 0
+
+    def acquire(self):
+        """Block until a request may be sent."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    wait = self._blocked_until - now
+                else:
+                    self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                    self._last = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def observe(self, status: int, headers: dict, attempt: int = 0) -> float | None:
+        """Feed a response back in. Returns a delay in seconds if the call should be retried."""
+        h = {k.lower(): v for k, v in headers.items()}
+        retry_after = parse_retry_after(h.get("retry-after"))
+
+        with self._lock:
+            now = time.monotonic()
+
+            if status == 429 or (status == 503 and retry_after is not None):
+                delay = retry_after if retry_after is not None else min(DEFAULT_BACKOFF * 2**attempt, MAX_BACKOFF)
+                self.throttled += 1
+                self.rate = max(self.min_rate, self.rate / 2)
+                self._tokens = 0.0
+                self._blocked_until = max(self._blocked_until, now + delay)
+                return delay
+
+            remaining = h.get("x-ratelimit-remaining")
+            limit = h.get("x-ratelimit-limit")
+            if remaining is not None and remaining.strip() == "0":
+                reset = _parse_reset(h.get("x-ratelimit-reset"))
+                if reset:
+                    self._blocked_until = max(self._blocked_until, now + reset)
+                self.rate = max(self.min_rate, self.rate / 2)
+            elif h.get("x-ratelimit-nearlimit", "").lower() == "true" or (
+                remaining and limit and remaining.isdigit() and limit.isdigit() and int(remaining) < int(limit) // 10
+            ):
+                self.rate = max(self.min_rate, self.rate * 0.75)
+            elif status < 400:
+                self.rate = min(self.max_rate, self.rate + RATE_STEP)
+        return None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"rate": round(self.rate, 2), "throttled": self.throttled}
@@ -0,0 +1,235 @@
+"""Local SQLite snapshot of sprint / JQL issue sets.
+
+Read-through cache for ``get_sprint_issues`` / ``search_issues`` callers,
+keyed by scope (sprint or JQL) and field set:
+
+- snapshot younger than ``ttl`` seconds → served from disk, no request
+- older → incremental refresh: ``(<scope>) AND updated >= "-<N>m"``
+  upserts issues changed since the last sync, and a second query drops
+  cached keys that left the scope; if a cached issue was deleted (Jira
+  rejects the key) the snapshot is fetched in full instead
+- older than FULL_REFRESH_AFTER, or never fetched → full fetch
+- ``invalidate(keys)`` (see common.invalidation) marks only the snapshots
+  holding those keys stale, so the next read refreshes them even within ttl
+
+Issues keep their position from the last full fetch (sprint endpoint =
+board rank order); issues that join later are appended. Callers that need
+the exact live rank order (re-ranking with --apply) should bypass the cache.
+
+One SnapshotCache may be shared across threads: database access is
+serialized, network fetches are not.
+"""
+
+import json
+import math
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from common.pagination import iter_search_issues, iter_sprint_issues
+
+DEFAULT_DB_PATH = Path.home() / ".cache" / "jira-generator" / "sprint-snapshots.db"
+DEFAULT_TTL = 300  # seconds a snapshot is served without asking Jira
+FULL_REFRESH_AFTER = 24 * 3600  # seconds — catches deletions and rank-only changes
+# The `updated` bound is relative ("-42m"), so Jira evaluates it on its own clock
+# and timezone; step back a few minutes to cover clock drift and request latency.
+SYNC_SKEW = 5 * 60
+KEY_BATCH = 100
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    scope TEXT NOT NULL,
+    fields TEXT NOT NULL,
+    synced_at REAL NOT NULL,
+    full_synced_at REAL NOT NULL,
+    stale INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (scope, fields)
+);
+CREATE TABLE IF NOT EXISTS issues (
+    scope TEXT NOT NULL,
+    fields TEXT NOT NULL,
+    key TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (scope, fields, key)
+);
+"""
+
+
+def _since_jql(since: float) -> str:
+    """``updated`` bound for changes since ``since``, relative to Jira's "now".
+
+    An absolute date would be read in the Jira profile's timezone, which
+    need not match this machine's.
+    """
+    return f'updated >= "-{math.ceil((time.time() - since) / 60)}m"'
+
+
+def _status(exc: Exception) -> int | None:
+    """HTTP status of a failed request (common.transport or urllib error)."""
+    return getattr(exc, "status", None) or getattr(exc, "code", None)
+
+
+def _normalize_fields(fields: str) -> str:
+    return ",".join(sorted({f.strip() for f in fields.split(",") if f.strip()}))
+
+
+class SnapshotCache:
+    """On-disk issue snapshots with incremental refresh."""
+
+    def __init__(self, path: Path = DEFAULT_DB_PATH, ttl: float = DEFAULT_TTL):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.ttl = ttl
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.RLock()
+        self.db.executescript(_SCHEMA)
+        if "stale" not in {c[1] for c in self.db.execute("PRAGMA table_info(snapshots)")}:
+            self.db.execute("ALTER TABLE snapshots ADD COLUMN stale INTEGER NOT NULL DEFAULT 0")
+        self.requests_saved = 0
+
+    def sprint_issues(self, api, sprint_id: int, fields: str, ttl: float | None = None) -> list[dict]:
+        """All issues in a sprint, in board rank order as of the last full fetch."""
+        return self._read_through(
+            api,
+            scope=f"sprint = {sprint_id}",
+            outside=f"(sprint != {sprint_id} OR sprint is EMPTY)",
+            fields=fields,
+            full_fetch=lambda: iter_sprint_issues(api, sprint_id, fields),
+            ttl=ttl,
+        )
+
+    def search_issues(self, api, jql: str, fields: str, ttl: float | None = None) -> list[dict]:
+        """All issues matching a JQL query (no ORDER BY — order is fetch order)."""
+        return self._read_through(
+            api,
+            scope=jql,
+            outside=f"NOT ({jql})",
+            fields=fields,
+            full_fetch=lambda: iter_search_issues(api, jql, fields),
+            ttl=ttl,
+        )
+
+    def _read_through(self, api, scope: str, outside: str, fields: str, full_fetch, ttl: float | None) -> list[dict]:
+        ttl = self.ttl if ttl is None else ttl
+        fkey = _normalize_fields(fields)
+        now = time.time()
+        with self._lock:
+            row = self.db.execute(
+                "SELECT synced_at, full_synced_at, stale FROM snapshots WHERE scope = ? AND fields = ?", (scope, fkey)
+            ).fetchone()
+
+        if row and not row[2] and now - row[0] < ttl:
+            with self._lock:
+                self.requests_saved += 1
+        else:
+            full = row is None or now - row[1] > FULL_REFRESH_AFTER
+            if full or not self._refresh(api, scope, outside, fields, fkey, since=row[0] - SYNC_SKEW, now=now):
+                self._replace(scope, fkey, list(full_fetch()), now)
+
+        with self._lock:
+            rows = self.db.execute(
+                "SELECT data FROM issues WHERE scope = ? AND fields = ? ORDER BY position", (scope, fkey)
+            ).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def _replace(self, scope: str, fkey: str, issues: list[dict], now: float):
+        with self._lock, self.db:
+            self.db.execute("DELETE FROM issues WHERE scope = ? AND fields = ?", (scope, fkey))
+            self.db.executemany(
+                "INSERT OR REPLACE INTO issues (scope, fields, key, position, data) VALUES (?, ?, ?, ?, ?)",
+                [(scope, fkey, i["key"], pos, json.dumps(i, ensure_ascii=False)) for pos, i in enumerate(issues)],
+            )
+            self.db.execute(
+                "INSERT OR REPLACE INTO snapshots (scope, fields, synced_at, full_synced_at, stale) VALUES (?, ?, ?, ?, 0)",
+                (scope, fkey, now, now),
+            )
+
+    def _refresh(self, api, scope: str, outside: str, fields: str, fkey: str, since: float, now: float) -> bool:
+        """Apply changes since ``since``. False when a full fetch is needed instead."""
+        since_jql = _since_jql(since)
+        changed = list(iter_search_issues(api, f"({scope}) AND {since_jql}", fields))
+
+        with self._lock:
+            cached_keys = [
+                k for (k,) in self.db.execute("SELECT key FROM issues WHERE scope = ? AND fields = ?", (scope, fkey))
+            ]
+        gone = []
+        for i in range(0, len(cached_keys), KEY_BATCH):
+            batch = ",".join(cached_keys[i : i + KEY_BATCH])
+            try:
+                gone.extend(
+                    x["key"] for x in iter_search_issues(api, f"key in ({batch}) AND {since_jql} AND {outside}", "key")
+                )
+            except Exception as e:
+                # `key in (...)` is a 400 once any of the keys was deleted
+                if _status(e) != 400:
+                    raise
+                return False
+
+        with self._lock, self.db:
+            next_pos = self.db.execute(
+                "SELECT COALESCE(MAX(position), -1) + 1 FROM issues WHERE scope = ? AND fields = ?", (scope, fkey)
+            ).fetchone()[0]
+            for issue in changed:
+                data = json.dumps(issue, ensure_ascii=False)
+                updated = self.db.execute(
+                    "UPDATE issues SET data = ? WHERE scope = ? AND fields = ? AND key = ?",
+                    (data, scope, fkey, issue["key"]),
+                ).rowcount
+                if not updated:
+                    self.db.execute(
+                        "INSERT INTO issues (scope, fields, key, position, data) VALUES (?, ?, ?, ?, ?)",
+                        (scope, fkey, issue["key"], next_pos, data),
+                    )
+                    next_pos += 1
+            self.db.executemany(
+                "DELETE FROM issues WHERE scope = ? AND fields = ? AND key = ?", [(scope, fkey, k) for k in gone]
+            )
+            self.db.execute(
+                "UPDATE snapshots SET synced_at = ?, stale = 0 WHERE scope = ? AND fields = ?", (now, scope, fkey)
+            )
+        return True
+
+    def invalidate(self, keys: list[str], reordered: list[str] = ()):
+        """Mark snapshots containing `keys` stale; `reordered` keys force a full refetch (rank order)."""
+        with self._lock, self.db:
+            for i in range(0, len(keys), KEY_BATCH):
+                batch = keys[i : i + KEY_BATCH]
+                marks = ",".join("?" * len(batch))
+                self.db.execute(
+                    "UPDATE snapshots SET stale = 1 WHERE (scope, fields) IN "
+                    f"(SELECT DISTINCT scope, fields FROM issues WHERE key IN ({marks}))",
+                    batch,
+                )
+            for i in range(0, len(reordered), KEY_BATCH):
+                batch = list(reordered[i : i + KEY_BATCH])
+                marks = ",".join("?" * len(batch))
+                self.db.execute(
+                    "UPDATE snapshots SET full_synced_at = 0 WHERE (scope, fields) IN "
+                    f"(SELECT DISTINCT scope, fields FROM issues WHERE key IN ({marks}))",
+                    batch,
+                )
+
+    def close(self):
+        with self._lock:
+            self.db.close()
+
+
+def fetch_sprint_issues(
+    api, sprint_id: int, fields: str, cache: SnapshotCache | None, ttl: float | None = None
+) -> list[dict]:
+    """Sprint issues through the snapshot cache, or live when cache is None."""
+    if cache is None:
+        return list(iter_sprint_issues(api, sprint_id, fields))
+    return cache.sprint_issues(api, sprint_id, fields, ttl)
+
+
+def fetch_search_issues(
+    api, jql: str, fields: str, cache: SnapshotCache | None, ttl: float | None = None
+) -> list[dict]:
+    """JQL results through the snapshot cache, or live when cache is None."""
+    if cache is None:
+        return list(iter_search_issues(api, jql, fields))
+    return cache.search_issues(api, jql, fields, ttl)
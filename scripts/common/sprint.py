@@ -0,0 +1,16 @@
+"""Board/sprint constants shared by the sprint scripts."""
+
+BOARD_ID = 2  # BEP board
+SKIP_STATUSES = {"Done", "CANCELED"}
+PARENT_TYPES = {"Story", "Task", "Bug"}
+
+# Priority ordering (lower number = higher priority = ranked first / gets earlier dates)
+PRIORITY_ORDER = {"Highest": 1, "High": 2, "Medium": 3, "Low": 4, "Lowest": 5}
+
+
+def find_active_sprint(api, board_id: int = BOARD_ID) -> tuple[int, str] | None:
+    """Return (sprint_id, sprint_name) of the board's active sprint, or None."""
+    active = api.get_board_sprints(board_id, state="active").get("values", [])
+    if not active:
+        return None
+    return active[0]["id"], active[0]["name"]
@@ -0,0 +1,247 @@
+"""Keep-alive HTTP transport for JiraAPI / ConfluenceAPI.
+
+The atlassian-scripts clients open a fresh TCP + TLS connection for every
+call. ``ConnectionPool`` keeps idle ``http.client`` connections per host and
+hands them out to concurrent borrowers, so bulk jobs pay the handshake once.
+
+``PooledJiraAPI`` / ``PooledConfluenceAPI`` are drop-in replacements that
+route ``_request()`` through a shared pool and an AdaptiveRateLimiter
+(see common.ratelimit), retrying throttled calls automatically::
+
+    api = PooledJiraAPI(base_url=..., auth_header=..., ssl_context=create_ssl_context())
+    ...
+    print(api.pool.stats(), api.limiter.stats())
+"""
+
+import http.client
+import json
+import ssl
+import threading
+from collections.abc import Callable
+from urllib.parse import urlsplit
+
+from lib import ConfluenceAPI
+from lib.jira_api import JiraAPI
+
+from common.invalidation import MutationLog
+from common.ratelimit import AdaptiveRateLimiter
+
+DEFAULT_TIMEOUT = 30
+MAX_IDLE_PER_HOST = 16
+MAX_RETRIES = 5  # for 429 / 503 responses
+
+# Raised by http.client when the server silently dropped an idle keep-alive connection
+_STALE_ERRORS = (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError)
+# Safe to resend after the server may already have processed them
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE", "OPTIONS"})
+
+
+class HTTPStatusError(Exception):
+    """Non-2xx response from Jira/Confluence."""
+
+    def __init__(self, method: str, path: str, status: int, body: str, headers: dict | None = None):
+        self.method = method
+        self.path = path
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+        super().__init__(f"HTTP {status} on {method} {path}: {body[:300]}")
+
+
+class ConnectionPool:
+    """Thread-safe pool of keep-alive connections, keyed by (scheme, host, port)."""
+
+    def __init__(
+        self,
+        ssl_context: ssl.SSLContext | None = None,
+        max_idle_per_host: int = MAX_IDLE_PER_HOST,
+        timeout: float = DEFAULT_TIMEOUT,
+    ):
+        self.ssl_context = ssl_context
+        self.max_idle_per_host = max_idle_per_host
+        self.timeout = timeout
+        self._idle: dict[tuple[str, str, int], list[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self._created = 0
+        self._reused = 0
+        self._requests = 0
+
+    def _new_connection(self, scheme: str, host: str, port: int) -> http.client.HTTPConnection:
+        with self._lock:
+            self._created += 1
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=self.timeout, context=self.ssl_context)
+        return http.client.HTTPConnection(host, port, timeout=self.timeout)
+
+    def _checkout(self, hostkey: tuple[str, str, int]) -> tuple[http.client.HTTPConnection, bool]:
+        """Return (connection, reused). Reuses the most recently returned idle connection."""
+        with self._lock:
+            idle = self._idle.get(hostkey)
+            if idle:
+                self._reused += 1
+                return idle.pop(), True
+        return self._new_connection(*hostkey), False
+
+    def _checkin(self, hostkey: tuple[str, str, int], conn: http.client.HTTPConnection):
+        with self._lock:
+            idle = self._idle.setdefault(hostkey, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        body: bytes | None = None,
+        headers: dict | None = None,
+        before_retry: Callable[[], object] | None = None,
+    ) -> tuple[int, dict, bytes]:
+        """Send one request and return (status, headers, body).
+
+        A reused connection that the server already closed is retried once
+        on a fresh connection, but only when resending cannot duplicate the
+        request: it failed before being fully written, or the method is
+        idempotent. A POST that was written and then lost its connection
+        raises — the server may have created the issue/page already.
+        ``before_retry`` (e.g. the rate limiter's acquire) runs before the resend.
+        """
+        parts = urlsplit(url)
+        scheme = parts.scheme or "https"
+        port = parts.port or (443 if scheme == "https" else 80)
+        hostkey = (scheme, parts.hostname, port)
+        target = parts.path + (f"?{parts.query}" if parts.query else "")
+
+        with self._lock:
+            self._requests += 1
+
+        conn, reused = self._checkout(hostkey)
+        try:
+            return self._send(hostkey, conn, method, target, body, headers)
+        except _STALE_ERRORS as e:
+            if not reused or (e.request_sent and method.upper() not in IDEMPOTENT_METHODS):
+                raise
+        if before_retry:
+            before_retry()
+        return self._send(hostkey, self._new_connection(*hostkey), method, target, body, headers)
+
+    def _send(self, hostkey, conn, method, target, body, headers) -> tuple[int, dict, bytes]:
+        sent = False
+        try:
+            conn.request(method, target, body=body, headers=headers or {})
+            sent = True
+            resp = conn.getresponse()
+            data = resp.read()  # drain fully so the connection can be reused
+        except BaseException as e:
+            conn.close()
+            if isinstance(e, _STALE_ERRORS):
+                e.request_sent = sent
+            raise
+        if resp.will_close:
+            conn.close()
+        else:
+            self._checkin(hostkey, conn)
+        return resp.status, dict(resp.getheaders()), data
+
+    def stats(self) -> dict:
+        """Connection reuse counters: requests sent, connections opened, checkouts served from idle."""
+        with self._lock:
+            idle = sum(len(v) for v in self._idle.values())
+            return {
+                "requests": self._requests,
+                "connections_opened": self._created,
+                "connections_reused": self._reused,
+                "idle": idle,
+            }
+
+    def close(self):
+        with self._lock:
+            conns = [c for idle in self._idle.values() for c in idle]
+            self._idle.clear()
+        for c in conns:
+            c.close()
+
+
+class PooledTransport:
+    """JSON request/response over a ConnectionPool, matching the lib ``_request`` contract.
+
+    Returns the decoded JSON body, or ``{"_status": <code>}`` when the
+    response has no body (e.g. 204 from PUT /issue). Every send waits on the
+    limiter first; throttled responses are retried up to ``max_retries``.
+    Successful writes are recorded in ``mutations`` for cache invalidation.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        auth_header: str,
+        pool: ConnectionPool,
+        limiter: AdaptiveRateLimiter | None = None,
+        max_retries: int = MAX_RETRIES,
+        mutations: MutationLog | None = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.pool = pool
+        self.limiter = limiter
+        self.max_retries = max_retries
+        self.mutations = mutations
+        self.headers = {
+            "Authorization": auth_header,
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+        }
+
+    def request(self, method: str, path: str, data=None):
+        url = path if path.startswith("http") else f"{self.base_url}{path}"
+        body = json.dumps(data).encode("utf-8") if data is not None else None
+        for attempt in range(self.max_retries + 1):
+            if self.limiter:
+                self.limiter.acquire()
+            status, headers, raw = self.pool.request(
+                method, url, body, self.headers, before_retry=self.limiter.acquire if self.limiter else None
+            )
+            retry_in = self.limiter.observe(status, headers, attempt) if self.limiter else None
+            if retry_in is None or attempt == self.max_retries:
+                break
+        text = raw.decode("utf-8", errors="replace")
+        if status >= 400:
+            raise HTTPStatusError(method, path, status, text, headers)
+        result = json.loads(text) if text.strip() else {"_status": status}
+        if self.mutations is not None:
+            self.mutations.record_request(method, path, data, result)
+        return result
+
+
+class _PooledMixin:
+    """Route ``_request(method, path, data)`` through a shared ConnectionPool + rate limiter."""
+
+    def __init__(
+        self,
+        *,
+        base_url: str,
+        auth_header: str,
+        ssl_context=None,
+        pool: ConnectionPool | None = None,
+        limiter: AdaptiveRateLimiter | None = None,
+        **kw,
+    ):
+        super().__init__(base_url=base_url, auth_header=auth_header, ssl_context=ssl_context, **kw)
+        self.pool = pool or ConnectionPool(ssl_context)
+        self.limiter = limiter or AdaptiveRateLimiter()
+        self.mutations = MutationLog()
+        self._transport = PooledTransport(base_url, auth_header, self.pool, self.limiter, mutations=self.mutations)
+
+    def _request(self, method, path, data=None, **kwargs):
+        if kwargs:
+            # Unknown lib-specific options — keep the original code path
+            return super()._request(method, path, data, **kwargs)
+        return self._transport.request(method, path, data)
+
+
+class PooledJiraAPI(_PooledMixin, JiraAPI):
+    """JiraAPI with keep-alive connection reuse."""
+
+
+class PooledConfluenceAPI(_PooledMixin, ConfluenceAPI):
+    """ConfluenceAPI with keep-alive connection reuse."""
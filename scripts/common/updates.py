@@ -0,0 +1,47 @@
+"""Applying field updates to Jira: merging per-key changes and concurrent PUTs."""
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Concurrent update requests in --apply mode (Jira Cloud throttles per user, ~10 req/s is safe)
+DEFAULT_WORKERS = 4
+
+
+def merge_updates(*fix_lists: list[tuple[str, dict, str]]) -> list[tuple[str, dict, str]]:
+    """Coalesce fix lists into one update per key.
+
+    Later lists win on conflicting fields; reasons are joined. Order follows
+    each key's first appearance, so output stays deterministic.
+    """
+    merged: dict[str, tuple[dict, list[str]]] = {}
+    for fixes in fix_lists:
+        for key, fields, reason in fixes:
+            entry = merged.setdefault(key, ({}, []))
+            entry[0].update(fields)
+            if reason:
+                entry[1].append(reason)
+    return [(key, fields, ", ".join(reasons)) for key, (fields, reasons) in merged.items()]
+
+
+def apply_fixes(api, fixes: list[tuple[str, dict, str]], workers: int) -> tuple[list[str], list[str]]:
+    """Apply field updates with bounded concurrency.
+
+    Returns (updated_keys, errors) — both in the original fix order so the
+    summary stays stable regardless of which request finishes first.
+    """
+    results: dict[str, Exception | None] = {}
+
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        futures = {pool.submit(api.update_fields, key, fields): key for key, fields, _ in fixes}
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                future.result()
+                results[key] = None
+                print(f"  ✅ {key}")
+            except Exception as e:
+                results[key] = e
+                print(f"  ❌ {key}: {e}")
+
+    updated = [key for key, _, _ in fixes if results.get(key) is None]
+    errors = [f"{key}: {results[key]}" for key, _, _ in fixes if results.get(key) is not None]
+    return updated, errors
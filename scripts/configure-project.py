@@ -10,11 +10,23 @@ Usage:
     python scripts/configure-project.py --apply          # Apply: placeholders → real values
     python scripts/configure-project.py --revert         # Dry run: show what revert would do
     python scripts/configure-project.py --revert --apply # Revert: real values → placeholders
+    python scripts/configure-project.py --apply --force  # Re-check every file (ignore the manifest)
+    python scripts/configure-project.py --jobs 1         # Process files serially
+
+Files are listed from the git index (plus untracked, non-ignored files) and
+processed on a process pool. A manifest of content hashes, keyed by the
+config hash and direction, remembers which files are already in the target
+state; unchanged files (same size + mtime) are skipped without being read.
 """
 
+import hashlib
 import json
+import os
 import re
+import subprocess
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 # Paths
@@ -23,6 +35,11 @@ PROJECT_DIR = SCRIPT_DIR.parent
 CONFIG_PATH = PROJECT_DIR / ".claude" / "project-config.json"
 SKILLS_DIR = PROJECT_DIR / ".claude" / "skills"
 
+# Manifest of files already in the target state, per project checkout
+MANIFEST_DIR = Path.home() / ".cache" / "jira-generator"
+MANIFEST_VERSION = 1
+PARALLEL_MIN_FILES = 16  # below this, pool start-up costs more than it saves
+
 # Placeholder format: {{KEY}}
 # Default values are used as fallback when config doesn't have the key
 PLACEHOLDERS = {
@@ -150,24 +167,117 @@ def get_replacement_patterns(values: dict, revert: bool = False) -> list[tuple[s
 
 def process_file(filepath: Path, patterns: list[tuple[str, str]], dry_run: bool = True) -> list[str]:
     """Process a single file and return list of changes made."""
+    return _process(filepath, patterns, dry_run)[0]
+
+
+def _process(filepath: Path, patterns: list[tuple[str, str]], dry_run: bool) -> tuple[list[str], dict | None]:
+    """(changes, manifest entry). The entry is None unless the file ends up in the target state."""
     changes = []
 
     try:
         content = filepath.read_text(encoding="utf-8")
     except Exception as e:
-        return [f"  Error reading: {e}"]
+        return [f"  Error reading: {e}"], None
 
     new_content = content
     for pattern, replacement in patterns:
-        matches = re.findall(pattern, new_content)
-        if matches:
-            new_content = re.sub(pattern, replacement, new_content)
-            changes.append(f"  {pattern[:50]}... → {replacement[:50]}... ({len(matches)} matches)")
+        new_content, count = re.subn(pattern, replacement, new_content)
+        if count:
+            changes.append(f"  {pattern[:50]}... → {replacement[:50]}... ({count} matches)")
 
-    if changes and not dry_run:
+    if changes and dry_run:
+        return changes, None
+    if changes:
         filepath.write_text(new_content, encoding="utf-8")
+    return changes, _manifest_entry(filepath)
+
+
+def _process_worker(job: tuple[str, list[tuple[str, str]], bool]) -> tuple[list[str], dict | None]:
+    filepath, patterns, dry_run = job
+    return _process(Path(filepath), patterns, dry_run)
+
+
+# -- Manifest ------------------------------------------------------------------
+
+
+def _manifest_entry(filepath: Path) -> dict:
+    st = filepath.stat()
+    return {
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "sha256": hashlib.sha256(filepath.read_bytes()).hexdigest(),
+    }
+
+
+def manifest_path() -> Path:
+    project = hashlib.sha1(str(PROJECT_DIR.resolve()).encode()).hexdigest()[:12]
+    return MANIFEST_DIR / f"configure-manifest-{project}.json"
+
+
+def config_hash(patterns: list[tuple[str, str]]) -> str:
+    """Identifies the target state: same patterns (values + direction) → same hash."""
+    return hashlib.sha256(json.dumps(patterns).encode("utf-8")).hexdigest()
+
+
+def load_manifest(target: str) -> dict[str, dict]:
+    """{relative path: entry} recorded for `target`, or {} if missing or for another config."""
+    try:
+        with open(manifest_path(), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("version") != MANIFEST_VERSION or manifest.get("config_hash") != target:
+        return {}
+    return manifest.get("files", {})
+
+
+def save_manifest(target: str, files: dict[str, dict]):
+    path = manifest_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"version": MANIFEST_VERSION, "config_hash": target, "files": files}, f)
+    os.replace(tmp, path)
+
+
+def is_current(filepath: Path, entry: dict | None) -> bool:
+    """True if the manifest says the file is already in the target state.
+
+    Same size + mtime → trusted without reading. Otherwise the content hash
+    decides (e.g. a checkout rewrote identical bytes); the caller refreshes
+    the stat fields in `entry` when that matches.
+    """
+    if not entry:
+        return False
+    try:
+        st = filepath.stat()
+    except OSError:
+        return False
+    if st.st_size == entry["size"] and st.st_mtime_ns == entry["mtime_ns"]:
+        return True
+    if st.st_size != entry["size"]:
+        return False
+    try:
+        digest = hashlib.sha256(filepath.read_bytes()).hexdigest()
+    except OSError:
+        return False
+    if digest != entry["sha256"]:
+        return False
+    entry["mtime_ns"] = st.st_mtime_ns
+    return True
 
-    return changes
+
+def _git_files() -> list[Path] | None:
+    """Tracked + untracked (non-ignored) files from the git index, or None outside a git checkout."""
+    try:
+        out = subprocess.run(
+            ["git", "-C", str(PROJECT_DIR), "ls-files", "-z", "--cached", "--others", "--exclude-standard"],
+            capture_output=True,
+            check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return [PROJECT_DIR / p for p in dict.fromkeys(out.decode("utf-8").split("\0")) if p]
 
 
 def collect_files() -> list[Path]:
@@ -176,8 +286,22 @@ def collect_files() -> list[Path]:
     Only documentation and shell files — NOT Python source code
     (Python uses custom field IDs at runtime, replacing would break code).
     """
-    files = []
     self_path = Path(__file__).resolve()
+    listed = _git_files()
+    if listed is not None:
+        skills = SKILLS_DIR.relative_to(PROJECT_DIR).parts
+        files = []
+        for f in listed:
+            parts = f.relative_to(PROJECT_DIR).parts
+            if (
+                (parts[: len(skills)] == skills and f.suffix == ".md")
+                or (len(parts) == 2 and parts[0] == "scripts" and f.suffix in (".sh", ""))
+                or (len(parts) == 1 and f.name in ("CLAUDE.md", "README.md"))
+            ) and f.is_file():
+                files.append(f)
+        return sorted(f for f in files if f.resolve() != self_path)
+
+    files = []
 
     # Skills .md files
     files.extend(SKILLS_DIR.rglob("*.md"))
@@ -204,6 +328,11 @@ def main():
     # Parse args
     apply_changes = "--apply" in sys.argv
     revert_mode = "--revert" in sys.argv
+    force = "--force" in sys.argv
+    jobs = os.cpu_count() or 1
+    if "--jobs" in sys.argv:
+        idx = sys.argv.index("--jobs")
+        jobs = int(sys.argv[idx + 1]) if idx + 1 < len(sys.argv) else jobs
 
     # --revert --apply = revert AND write to files
     # --revert         = revert dry run (show what would change)
@@ -226,20 +355,49 @@ def main():
         print(f"  {k}: {v}")
     print()
 
+    timings = {}
+    t0 = time.perf_counter()
+
     # Get patterns
     patterns = get_replacement_patterns(config_values, revert=revert_mode)
+    target = config_hash(patterns)
 
     # Collect files
     files = collect_files()
+    timings["enumerate"] = time.perf_counter() - t0
 
-    print(f"Scanning {len(files)} files...\n")
+    # Skip files the manifest already knows are in the target state
+    t0 = time.perf_counter()
+    manifest = {} if force else load_manifest(target)
+    todo = []
+    current = {}
+    for filepath in files:
+        rel = str(filepath.relative_to(PROJECT_DIR))
+        if is_current(filepath, manifest.get(rel)):
+            current[rel] = manifest[rel]
+        else:
+            todo.append(filepath)
+    timings["manifest"] = time.perf_counter() - t0
+
+    print(f"Scanning {len(files)} files ({len(files) - len(todo)} unchanged since last run)...\n")
+
+    # Process (parallel above PARALLEL_MIN_FILES)
+    t0 = time.perf_counter()
+    jobs_list = [(str(f), patterns, not apply_changes) for f in todo]
+    if jobs > 1 and len(todo) >= PARALLEL_MIN_FILES:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(_process_worker, jobs_list, chunksize=max(len(todo) // (jobs * 4), 1)))
+    else:
+        results = [_process_worker(job) for job in jobs_list]
+    timings["process"] = time.perf_counter() - t0
 
     total_changes = 0
     files_changed = 0
 
-    for filepath in files:
+    for filepath, (changes, entry) in zip(todo, results, strict=True):
         rel_path = filepath.relative_to(PROJECT_DIR)
-        changes = process_file(filepath, patterns, dry_run=not apply_changes)
+        if entry:
+            current[str(rel_path)] = entry
 
         if changes:
             files_changed += 1
@@ -249,6 +407,13 @@ def main():
                 print(change)
             print()
 
+    t0 = time.perf_counter()
+    try:
+        save_manifest(target, current)
+    except OSError as e:
+        print(f"Warning: manifest not written: {e}")
+    timings["manifest"] += time.perf_counter() - t0
+
     # Summary
     print("=" * 60)
     if apply_changes:
@@ -262,6 +427,7 @@ def main():
             print(f"  python {Path(__file__).name} --apply")
             print("\nOr revert to placeholders:")
             print(f"  python {Path(__file__).name} --revert --apply")
+    print("\nTiming: " + ", ".join(f"{phase} {secs:.2f}s" for phase, secs in timings.items()))
 
 
 if __name__ == "__main__":
@@ -3,18 +3,30 @@
 
 Creates under BEP space as a child of 'Player Doc' (page 81592324).
 Idempotent: checks if page already exists by title.
+Incremental: a hash of each page's rendered storage (generated local-ids
+blanked out) is kept in architecture-page-ids.json; pages whose content is
+unchanged since the last upload are skipped (--force uploads anyway).
+--create-all renders sections on a process pool and uploads changed pages
+concurrently (PUBLISH_WORKERS at a time). Builders keep their state in a
+per-page RenderContext; --check-render verifies parallel builds match serial ones.
 """
 
+import hashlib
 import json
+import os
+import random
+import re
 import sys
+import time
 import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 sys.path.insert(
     0, str(Path(__file__).resolve().parent.parent / ".claude/skills/atlassian-scripts")
 )
+from common.transport import PooledConfluenceAPI
 from lib.auth import create_ssl_context, get_auth_header, load_credentials
-from lib import ConfluenceAPI
 
 SPACE_KEY = "BEP"
 PARENT_PAGE_ID = "81592324"  # Player Doc
@@ -49,7 +61,27 @@ def load_page_ids() -> dict:
 
 
 def save_page_ids(data: dict):
-    PAGE_IDS_FILE.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+    """Write atomically: a crash mid-write must not lose the page IDs."""
+    tmp = PAGE_IDS_FILE.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+    os.replace(tmp, PAGE_IDS_FILE)
+
+
+# uuid4 local-ids are regenerated on every build — not a content change
+_GENERATED_ID = re.compile(
+    r'(ac:local-id="|key="local-id">)[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}'
+)
+
+
+def content_hash(content: str, title: str | None = None, page_id: str | None = None) -> str:
+    """sha256 of page ID + title + storage HTML, with generated local-ids normalized away.
+
+    The page ID is part of the hash: not every page embeds it, and a page
+    recreated under a new ID (still "Loading...") must not match the old one.
+    """
+    normalized = _GENERATED_ID.sub(r"\1", content)
+    return hashlib.sha256(f"{page_id or ''}\0{title or ''}\0{normalized}".encode()).hexdigest()
+
 
 # ─── Mermaid Forge App Constants ───
 MERMAID_APP_ID = "23392b90-4271-4239-98ca-a3e96c663cbb"
@@ -74,8 +106,31 @@ def load_diagram(name: str) -> str:
     return (DIAGRAMS_DIR / name).read_text(encoding="utf-8").strip()
 
 
-# Global code block counter (Forge index counts ALL code blocks on page)
-_code_block_count = 0
+class RenderContext:
+    """Per-page render state, passed explicitly to every builder.
+
+    Carries the page ID (Forge macros reference it), the code block counter
+    (the Forge index counts ALL code blocks on the page) and local-id
+    generation. One context per page build, so pages can be rendered
+    concurrently in threads or processes. With a ``seed``, local-ids are
+    reproducible and two builds of a page are byte-identical.
+    """
+
+    def __init__(self, page_id: str, seed: int | None = None):
+        self.page_id = page_id
+        self.code_blocks = 0
+        self._rng = random.Random(seed) if seed is not None else None
+
+    def next_index(self) -> int:
+        """Forge index for the next code block on this page."""
+        index = self.code_blocks
+        self.code_blocks += 1
+        return index
+
+    def new_id(self) -> str:
+        if self._rng is None:
+            return str(uuid.uuid4())
+        return str(uuid.UUID(int=self._rng.getrandbits(128), version=4))
 
 
 def toc():
@@ -143,25 +198,22 @@ def code_block(code: str, language: str = "text", title: str = "",
 
 
 def tracked_code_block(code: str, language: str = "text", title: str = "",
-                       collapse: bool = False) -> str:
-    """code_block() with global counter for Forge index tracking."""
-    global _code_block_count
-    result = code_block(code, language, title, collapse=collapse)
-    _code_block_count += 1
-    return result
+                       collapse: bool = False, *, ctx: RenderContext) -> str:
+    """code_block() counted in ctx for Forge index tracking."""
+    ctx.next_index()
+    return code_block(code, language, title, collapse=collapse)
 
 
-def mermaid_diagram(code: str, page_id: str) -> str:
+def mermaid_diagram(code: str, ctx: RenderContext) -> str:
     """Generate mermaid code block + Forge renderer macro.
 
-    Uses global _code_block_count as the Forge index, then increments it.
+    Takes the next Forge index from ctx.
     """
-    global _code_block_count
-    index = _code_block_count
-    _code_block_count += 1
+    index = ctx.next_index()
+    page_id = ctx.page_id
 
-    local_id = str(uuid.uuid4())
-    code_local_id = str(uuid.uuid4())
+    local_id = ctx.new_id()
+    code_local_id = ctx.new_id()
     ext_id = (
         f"ari:cloud:ecosystem::extension/"
         f"{MERMAID_APP_ID}/{MERMAID_ENV_ID}/static/mermaid-diagram"
@@ -256,7 +308,7 @@ def mermaid_diagram(code: str, page_id: str) -> str:
             f'</ac:adf-node>'
         )
 
-    expand_local_id = str(uuid.uuid4())
+    expand_local_id = ctx.new_id()
     code_html = (
         f'<ac:structured-macro ac:local-id="{code_local_id}" '
         f'ac:name="code" ac:schema-version="1">'
@@ -282,9 +334,9 @@ def mermaid_diagram(code: str, page_id: str) -> str:
     return expand_html + forge_html
 
 
-def expand_section(title: str, content: str) -> str:
+def expand_section(title: str, content: str, ctx: RenderContext | None = None) -> str:
     """Wrap content in an Expand macro (collapsed by default)."""
-    local_id = str(uuid.uuid4())
+    local_id = ctx.new_id() if ctx else str(uuid.uuid4())
     return (
         f'<ac:structured-macro ac:local-id="{local_id}" '
         f'ac:name="expand" ac:schema-version="1">'
@@ -313,7 +365,7 @@ def children_macro() -> str:
     )
 
 
-def build_parent_content(page_id: str = ARCH_PAGE_ID) -> str:
+def build_parent_content(ctx: RenderContext) -> str:
     """Parent page: Executive Summary text + Children macro (0 mermaid, 0 code blocks)."""
     sections = []
 
@@ -354,7 +406,7 @@ def build_parent_content(page_id: str = ARCH_PAGE_ID) -> str:
 
 def build_content(page_id: str = ARCH_PAGE_ID) -> str:
     """LEGACY — original monolithic build. Kept for reference."""
-    return build_parent_content(page_id)
+    return build_parent_content(RenderContext(page_id))
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -362,10 +414,8 @@ def build_content(page_id: str = ARCH_PAGE_ID) -> str:
 # ═══════════════════════════════════════════════════════════════
 
 
-def build_page_1(page_id: str) -> str:
+def build_page_1(ctx: RenderContext) -> str:
     """Page 1: Problem Statement & Current Architecture (2 mermaid, 0 code blocks)."""
-    global _code_block_count
-    _code_block_count = 0
     sections = []
 
     sections.append(toc())
@@ -418,7 +468,7 @@ def build_page_1(page_id: str) -> str:
 
     sections.append(mermaid_diagram(
         load_diagram("03-1-backend-pipeline.mmd"),
-        page_id=page_id,
+        ctx,
     ))
 
     sections.append(expand_section("Backend Components (13 ไฟล์)",
@@ -437,13 +487,14 @@ def build_page_1(page_id: str) -> str:
         '<tr><td>Guaranteed time window</td><td><code>app/Models/AdGroupDisplayTimeExclusive.ts</code></td><td>ช่วงเวลา guaranteed ระดับ AdGroup สำหรับแทรกใน loop</td></tr>'
         '<tr><td>Reservation check</td><td><code>app/Services/ServiceHelpers/checkIsBillboardsReserved.ts</code></td><td>ป้องกัน double-booking: ตรวจ overlap ก่อนสร้าง guaranteed avails</td></tr>'
         '<tr><td>Pusher service</td><td><code>app/Services/PusherPlayScheduleService.ts</code></td><td>Channel: play-schedule-{deviceCode}</td></tr>'
-        '</table>'
+        '</table>',
+        ctx=ctx,
     ))
 
     sections.append("<h3>2.2 Player (bd-vision-player)</h3>")
     sections.append(mermaid_diagram(
         load_diagram("03-2-player-architecture.mmd"),
-        page_id=page_id,
+        ctx,
     ))
 
     sections.append(expand_section("Player Features (8 รายการ)",
@@ -460,7 +511,8 @@ def build_page_1(page_id: str) -> str:
         '<tr><td>File cleanup</td><td>ทุก 24 ชม. ช่วง off-hours, ลบแบบ LRU</td><td><code>src/services/file-cleanup.service.ts</code></td></tr>'
         '<tr><td>ตรวจจับ Offline</td><td><code>err?.message === "Load failed"</code></td><td><code>screen.device.schedule.component.tsx</code></td></tr>'
         '<tr><td>PoP (Proof of Play) retry</td><td>Tauri Store (<code>player.history.json</code>), batch 10 รายการ, ทุก 1 นาที</td><td><code>player-history.store.ts</code></td></tr>'
-        '</table>'
+        '</table>',
+        ctx=ctx,
     ))
 
     sections.append("<h3>2.3 Pusher Events</h3>")
@@ -473,16 +525,15 @@ def build_page_1(page_id: str) -> str:
         '<tr><td><code>stop-advertisement</code></td><td>Creative ถูกยกเลิก</td><td>ลบออกจาก local schedule</td></tr>'
         '<tr><td><code>new/update/delete-play-schedule</code></td><td>Schedule CRUD</td><td>ดึง schedules ใหม่</td></tr>'
         '<tr><td><code>un-pair-screen</code></td><td>Device ถูก unpair</td><td>ล้างทั้งหมด กลับหน้า pair</td></tr>'
-        '</table>'
+        '</table>',
+        ctx=ctx,
     ))
 
     return "\n".join(sections)
 
 
-def build_page_2(page_id: str) -> str:
+def build_page_2(ctx: RenderContext) -> str:
     """Page 2: Proposed Architecture (3 mermaid — overview + daily schedule + proposed flow)."""
-    global _code_block_count
-    _code_block_count = 0
     sections = []
 
     sections.append(toc())
@@ -491,7 +542,7 @@ def build_page_2(page_id: str) -> str:
     sections.append("<h2>ภาพรวมสถาปัตยกรรม (Architecture Overview)</h2>")
     sections.append(mermaid_diagram(
         load_diagram("01-proposed-architecture.mmd"),
-        page_id=page_id,
+        ctx,
     ))
 
     sections.append("<h3>ตัวอย่าง Daily Schedule</h3>")
@@ -502,7 +553,7 @@ def build_page_2(page_id: str) -> str:
     ))
     sections.append(mermaid_diagram(
         load_diagram("01-2-daily-schedule.mmd"),
-        page_id=page_id,
+        ctx,
     ))
     sections.append(_gantt_legend_mini())
 
@@ -594,10 +645,8 @@ def build_page_2(page_id: str) -> str:
     return "\n".join(sections)
 
 
-def build_page_3(page_id: str) -> str:
+def build_page_3(ctx: RenderContext) -> str:
     """Page 3: Key Flows (6 mermaid, 0 code blocks)."""
-    global _code_block_count
-    _code_block_count = 0
     sections = []
 
     sections.append(toc())
@@ -606,13 +655,13 @@ def build_page_3(page_id: str) -> str:
     sections.append("<h3>Flow A: เล่นปกติ Online (Happy Path)</h3>")
     sections.append(mermaid_diagram(
         load_diagram("05-1-flow-normal.mmd"),
-        page_id=page_id,
+        ctx,
     ))
 
     sections.append("<h3>Flow B: เน็ตหลุด &rarr; Offline &rarr; เชื่อมต่อใหม่</h3>")
     sections.append(mermaid_diagram(
         load_diagram("05-2-flow-network-drop.mmd"),
-        page_id=page_id,
+        ctx,
     ))
 
     sections.append("<h3>Flow C: Interrupt แบบ Guaranteed Spot (Online)</h3>")
@@ -631,13 +680,13 @@ def build_page_3(page_id: str) -> str:
     ))
     sections.append(mermaid_diagram(
         load_diagram("05-3-flow-exclusive.mmd"),
-        page_id=page_id,
+        ctx,
     ))
 
     sections.append("<h3>Flow D: เปิดเครื่องใหม่ ไม่มี Cache (Fresh Boot)</h3>")
     sections.append(mermaid_diagram(
         load_diagram("05-4-flow-fresh-boot.mmd"),
-        page_id=page_id,
+        ctx,
     ))
 
     sections.append("<h3>Flow E: เหมาช่วงเวลา (Daypart Takeover)</h3>")
@@ -650,7 +699,7 @@ def build_page_3(page_id: str) -> str:
     ))
     sections.append(mermaid_diagram(
         load_diagram("05-5-flow-takeover.mmd"),
-        page_id=page_id,
+        ctx,
     ))
 
     sections.append("<h3>Flow F: เล่นตรงเวลา (Exact-Time Spot)</h3>")
@@ -662,16 +711,14 @@ def build_page_3(page_id: str) -> str:
     ))
     sections.append(mermaid_diagram(
         load_diagram("05-6-flow-exact-time.mmd"),
-        page_id=page_id,
+        ctx,
     ))
 
     return "\n".join(sections)
 
 
-def build_page_4(page_id: str) -> str:
+def build_page_4(ctx: RenderContext) -> str:
     """Page 4: Technical Design — Algorithm & Models (0 mermaid, 4 code blocks)."""
-    global _code_block_count
-    _code_block_count = 0
     sections = []
 
     sections.append(toc())
@@ -816,6 +863,7 @@ def build_page_4(page_id: str) -> str:
         "  Make-good items compensate interrupted ads",
         "typescript", "Ad Decisioning Algorithm v3",
         collapse=True,
+        ctx=ctx,
     ))
 
     # New Data Models
@@ -891,6 +939,7 @@ def build_page_4(page_id: str) -> str:
         "}",
         "typescript", "New Models",
         collapse=True,
+        ctx=ctx,
     ))
 
     sections.append(tracked_code_block(
@@ -927,6 +976,7 @@ def build_page_4(page_id: str) -> str:
         "}",
         "typescript", "Ad Decisioning Engine Service",
         collapse=True,
+        ctx=ctx,
     ))
 
     # New API Endpoint
@@ -986,15 +1036,14 @@ def build_page_4(page_id: str) -> str:
         "}",
         "json", "API Response Format",
         collapse=True,
+        ctx=ctx,
     ))
 
     return "\n".join(sections)
 
 
-def build_page_5(page_id: str) -> str:
+def build_page_5(ctx: RenderContext) -> str:
     """Page 5: Technical Design — Player Components (5 mermaid, 4 code blocks)."""
-    global _code_block_count
-    _code_block_count = 0
     sections = []
 
     sections.append(toc())
@@ -1009,14 +1058,14 @@ def build_page_5(page_id: str) -> str:
     sections.append("<h3>ระบบ Cache 3 ชั้น (3-Tier Playlist Cache)</h3>")
     sections.append(mermaid_diagram(
         load_diagram("06-4-three-tier-cache.mmd"),
-        page_id=page_id,
+        ctx,
     ))
 
     # Player State Machine
     sections.append("<h3>Player State Machine</h3>")
     sections.append(mermaid_diagram(
         load_diagram("06-5-state-machine.mmd"),
-        page_id=page_id,
+        ctx,
     ))
     sections.append(warning_panel(
         "<p><strong>กฎสำคัญ:</strong></p>"
@@ -1044,7 +1093,7 @@ def build_page_5(page_id: str) -> str:
     sections.append("<h4>Player Outbox (PoP Reporting)</h4>")
     sections.append(mermaid_diagram(
         load_diagram("06-6a-outbox.mmd"),
-        page_id=page_id,
+        ctx,
     ))
     sections.append(tracked_code_block(
         "// TypeScript interface\n"
@@ -1065,12 +1114,13 @@ def build_page_5(page_id: str) -> str:
         "// 6. Cleanup: remove 'acked' items older than 24h",
         "typescript", "Outbox Interface",
         collapse=True,
+        ctx=ctx,
     ))
 
     sections.append("<h4>Player Inbox (Schedule Sync)</h4>")
     sections.append(mermaid_diagram(
         load_diagram("06-6b-inbox.mmd"),
-        page_id=page_id,
+        ctx,
     ))
     sections.append(tracked_code_block(
         "// TypeScript implementation\n"
@@ -1095,13 +1145,14 @@ def build_page_5(page_id: str) -> str:
         "}",
         "typescript", "Inbox Deduplication Code",
         collapse=True,
+        ctx=ctx,
     ))
 
     # Version Protocol
     sections.append("<h3>Version Protocol</h3>")
     sections.append(mermaid_diagram(
         load_diagram("06-7-version-protocol.mmd"),
-        page_id=page_id,
+        ctx,
     ))
 
     # PoP Deduplication
@@ -1125,6 +1176,7 @@ def build_page_5(page_id: str) -> str:
         "}",
         "typescript", "Backend Idempotency Check",
         collapse=True,
+        ctx=ctx,
     ))
 
     # Media Cache Lifecycle
@@ -1228,7 +1280,7 @@ def build_page_5(page_id: str) -> str:
     ))
     sections.append(mermaid_diagram(
         load_diagram("06-9-pdooh-integration.mmd"),
-        page_id=page_id,
+        ctx,
     ))
     sections.append(
         '<table>'
@@ -1382,6 +1434,7 @@ def build_page_5(page_id: str) -> str:
         '// Creative เดียวกัน (CR-xxx) แต่คนละ variant ตาม billboard',
         "json", "creative_manifest per Billboard Resolution",
         collapse=True,
+        ctx=ctx,
     ))
 
     # Edge cases
@@ -1415,10 +1468,8 @@ def build_page_5(page_id: str) -> str:
     return "\n".join(sections)
 
 
-def build_page_6(page_id: str) -> str:
+def build_page_6(ctx: RenderContext) -> str:
     """Page 6: Interrupt Controller & Make-Good (2 mermaid, 0 code blocks)."""
-    global _code_block_count
-    _code_block_count = 0
     sections = []
 
     sections.append(toc())
@@ -1442,7 +1493,7 @@ def build_page_6(page_id: str) -> str:
     ))
     sections.append(mermaid_diagram(
         load_diagram("06-10-interrupt-controller.mmd"),
-        page_id=page_id,
+        ctx,
     ))
     sections.append(
         '<table>'
@@ -1470,7 +1521,7 @@ def build_page_6(page_id: str) -> str:
     ))
     sections.append(mermaid_diagram(
         load_diagram("06-11-make-good.mmd"),
-        page_id=page_id,
+        ctx,
     ))
     sections.append(
         '<table>'
@@ -1511,10 +1562,8 @@ def build_page_6(page_id: str) -> str:
     return "\n".join(sections)
 
 
-def build_page_7(page_id: str) -> str:
+def build_page_7(ctx: RenderContext) -> str:
     """Page 7: Event-Driven Architecture (1 mermaid, 2 code blocks)."""
-    global _code_block_count
-    _code_block_count = 0
     sections = []
 
     sections.append(toc())
@@ -1659,6 +1708,7 @@ def build_page_7(page_id: str) -> str:
         "  | DaypartMakeGoodTriggeredEvent    // v2 Daypart",
         "typescript", "Typed Pusher Event Contracts",
         collapse=True,
+        ctx=ctx,
     ))
 
     sections.append("<h3>Domain Events (ระดับ Code ภายใน)</h3>")
@@ -1753,12 +1803,13 @@ def build_page_7(page_id: str) -> str:
         "}",
         "typescript", "Domain Events",
         collapse=True,
+        ctx=ctx,
     ))
 
     sections.append("<h3>แผนภาพ Event Flow</h3>")
     sections.append(mermaid_diagram(
         load_diagram("07-4-event-flow.mmd"),
-        page_id=page_id,
+        ctx,
     ))
 
     # ─── Architectural Decision Record ───
@@ -1800,7 +1851,8 @@ def build_page_7(page_id: str) -> str:
         '<li>- ถ้า scale ถึง 5,000+ จอ อาจต้อง revisit</li>'
         '</ul></td></tr>'
         '<tr><td><strong>Review Date</strong></td><td>Revisit เมื่อ scale &ge; 2,000 billboards หรือ team &ge; 8 devs</td></tr>'
-        '</table>'
+        '</table>',
+        ctx=ctx,
     ))
 
     sections.append("<h3>Checklist การ Implement</h3>")
@@ -1819,10 +1871,8 @@ def build_page_7(page_id: str) -> str:
     return "\n".join(sections)
 
 
-def build_page_8(page_id: str) -> str:
+def build_page_8(ctx: RenderContext) -> str:
     """Page 8: Edge Cases, Migration & Appendix (2 mermaid, 0 code blocks)."""
-    global _code_block_count
-    _code_block_count = 0
     sections = []
 
     sections.append(toc())
@@ -1850,7 +1900,8 @@ def build_page_8(page_id: str) -> str:
         '<tr><td>E6</td><td><strong>SSL certificate expired / DNS failure</strong></td>'
         '<td>fetch fail แต่ internet ยังใช้ได้</td>'
         '<td>Treat เหมือน offline. Player มี Tier 2/3 รองรับ. เพิ่ม <strong>diagnostic log</strong> แยก SSL error จาก network error</td></tr>'
-        '</table>'
+        '</table>',
+        ctx=ctx,
     ))
 
     sections.append("<h3>ปัญหา Schedule/Playlist</h3>")
@@ -1878,7 +1929,8 @@ def build_page_8(page_id: str) -> str:
         '<tr><td>E13</td><td><strong>Concurrent Pusher events</strong> &mdash; 3 events มาพร้อมกัน</td>'
         '<td>Race condition ใน playlist update</td>'
         '<td><strong>Version monotonic:</strong> Player เก็บ <code>current_version</code>. ถ้า <code>event.version</code> &le; current &rarr; skip. ถ้า &gt; current &rarr; process. ถ้า &gt; current+1 (gap) &rarr; full re-fetch</td></tr>'
-        '</table>'
+        '</table>',
+        ctx=ctx,
     ))
 
     sections.append("<h3>ปัญหา Device/Storage</h3>")
@@ -1903,7 +1955,8 @@ def build_page_8(page_id: str) -> str:
         '<tr><td>E19</td><td><strong>localStorage quota exceeded</strong> (5-10MB limit)</td>'
         '<td>เก็บ playlist data ไม่พอ</td>'
         '<td>Migrate heavy data &rarr; <strong>Tauri Store</strong> (JSON file, ไม่มี quota). เก็บเฉพาะ small state ใน localStorage. Playlist data &rarr; Tauri Store</td></tr>'
-        '</table>'
+        '</table>',
+        ctx=ctx,
     ))
 
     sections.append("<h3>ปัญหา Business Logic</h3>")
@@ -1925,7 +1978,8 @@ def build_page_8(page_id: str) -> str:
         '<tr><td>E24</td><td><strong>Multiple devices ใช้ device code เดียวกัน</strong></td>'
         '<td>Clone device &rarr; 2 players same code</td>'
         '<td>Backend: POST <code>/v2/play-history</code> ส่ง <code>device_fingerprint</code> (MAC + hostname). ถ้าไม่ตรง &rarr; reject + alert</td></tr>'
-        '</table>'
+        '</table>',
+        ctx=ctx,
     ))
 
     sections.append("<h3>Edge Cases ของ Guaranteed Spot (P1-G — ไม่ Interrupt)</h3>")
@@ -1970,7 +2024,8 @@ def build_page_8(page_id: str) -> str:
         '<td><strong>Loop extension:</strong> Ad Decisioning Engine extends loop duration to fit guaranteed completely. '
         'Or: guaranteed <code>play_at</code> adjusted to start earlier so it fits within loop. '
         'Config: <code>guaranteed_loop_policy: &quot;extend&quot; | &quot;shift_earlier&quot;</code></td></tr>'
-        '</table>'
+        '</table>',
+        ctx=ctx,
     ))
 
     sections.append("<h4>Edge Cases ของ Flow ผสม (Regular + Exclusive)</h4>")
@@ -1998,13 +2053,14 @@ def build_page_8(page_id: str) -> str:
         '<td>House loop interrupted by guaranteed</td>'
         '<td><strong>Priority model:</strong> P1 (Guaranteed) &gt; P4 (House). Ad Decisioning Engine replaces house avail with guaranteed. '
         'House content resumes after guaranteed completes (next sequence item)</td></tr>'
-        '</table>'
+        '</table>',
+        ctx=ctx,
     ))
 
     sections.append("<h3>Edge Cases ของ Takeover และ Exact-Time (P1-TK / P1-ET)</h3>")
     sections.append(mermaid_diagram(
         load_diagram("08-2-takeover-timeline.mmd"),
-        page_id=page_id,
+        ctx,
     ))
     sections.append("<h4>Timeline การ Interrupt ของ Takeover (Gantt View)</h4>")
     sections.append(info_panel(
@@ -2014,7 +2070,7 @@ def build_page_8(page_id: str) -> str:
     ))
     sections.append(mermaid_diagram(
         load_diagram("08-3-takeover-gantt.mmd"),
-        page_id=page_id,
+        ctx,
     ))
     sections.append(_gantt_legend_mini())
     sections.append(expand_section("TK1-TK8: Takeover & Exact-Time Edge Cases",
@@ -2044,7 +2100,8 @@ def build_page_8(page_id: str) -> str:
         '<td>Repack missed plays ใน window ที่เหลือ (center-offset ปรับใหม่) → ถ้า window หมดก่อน → Level 2 → Level 3 ตาม makegood_preference</td></tr>'
         '<tr><td>TK12</td><td><strong>Daypart window นอก operating hours</strong></td>'
         '<td>Reject at booking — validate <code>startTime &ge; billboard.opening_time</code> AND <code>endTime &le; billboard.closing_time</code>. Production range: 06:00–22:00</td></tr>'
-        '</table>'
+        '</table>',
+        ctx=ctx,
     ))
 
     sections.append("<hr/>")
@@ -2262,7 +2319,8 @@ def build_page_8(page_id: str) -> str:
 
     sections.append(expand_section(
         "Terminology Mapping: 5 tables (Core, Backend, Player, Pusher, API)",
-        _term_content
+        _term_content,
+        ctx=ctx,
     ))
 
     sections.append("<hr/>")
@@ -2284,7 +2342,8 @@ def build_page_8(page_id: str) -> str:
         '<td>Phase 1: แยก AdGroup ต่อ billboard (industry standard — Broadsign/Xibo/Doohly ทุกเจ้าใช้ pattern นี้). Parent Campaign container สำหรับ aggregate reporting</td></tr>'
         '<tr><td>DP7</td><td><strong>playsPerHour เปลี่ยนหลังจาก windows ถูก configure</strong></td>'
         '<td>plays_in_window คำนวณใหม่ทุกครั้ง: <code>round(playsPerHour × windowHours)</code> → แสดง recalculated value ที่ confirm screen ก่อน approve</td></tr>'
-        '</table>'
+        '</table>',
+        ctx=ctx,
     ))
 
     return "\n".join(sections)
@@ -2346,10 +2405,8 @@ def _es_legend() -> str:
     )
 
 
-def build_page_9(page_id: str) -> str:
+def build_page_9(ctx: RenderContext) -> str:
     """Page 9: Event Storming — Big Picture (1 mermaid, 0 code blocks)."""
-    global _code_block_count
-    _code_block_count = 0
     sections = []
 
     sections.append(toc())
@@ -2364,7 +2421,7 @@ def build_page_9(page_id: str) -> str:
 
     # Legend
     sections.append("<h3>สัญลักษณ์ที่ใช้ (Notation Legend)</h3>")
-    sections.append(expand_section("ES Notation Legend (8 elements)", _es_legend()))
+    sections.append(expand_section("ES Notation Legend (8 elements)", _es_legend(), ctx=ctx))
 
     # Big Picture Timeline
     sections.append("<h3>Timeline ของ Domain Events</h3>")
@@ -2375,7 +2432,7 @@ def build_page_9(page_id: str) -> str:
     ))
     sections.append(mermaid_diagram(
         load_diagram("09-1-big-picture.mmd"),
-        page_id=page_id,
+        ctx,
     ))
 
     # Actors
@@ -2427,10 +2484,8 @@ def build_page_9(page_id: str) -> str:
     return "\n".join(sections)
 
 
-def build_page_10(page_id: str) -> str:
+def build_page_10(ctx: RenderContext) -> str:
     """Page 10: Event Storming — Process Modelling (5 mermaid, 0 code blocks)."""
-    global _code_block_count
-    _code_block_count = 0
     sections = []
 
     sections.append(toc())
@@ -2444,7 +2499,7 @@ def build_page_10(page_id: str) -> str:
 
     # Legend
     sections.append("<h3>สัญลักษณ์ที่ใช้ (Notation Legend)</h3>")
-    sections.append(expand_section("ES Notation Legend (8 elements)", _es_legend()))
+    sections.append(expand_section("ES Notation Legend (8 elements)", _es_legend(), ctx=ctx))
 
     # Process A: Schedule Calculation
     sections.append("<hr/>")
@@ -2458,7 +2513,7 @@ def build_page_10(page_id: str) -> str:
     ))
     sections.append(mermaid_diagram(
         load_diagram("10-1-process-schedule-calc.mmd"),
-        page_id=page_id,
+        ctx,
     ))
 
     # Process B: Normal Playback
@@ -2471,7 +2526,7 @@ def build_page_10(page_id: str) -> str:
     ))
     sections.append(mermaid_diagram(
         load_diagram("10-2-process-normal-play.mmd"),
-        page_id=page_id,
+        ctx,
     ))
 
     # Process C: Takeover Interrupt
@@ -2485,7 +2540,7 @@ def build_page_10(page_id: str) -> str:
     ))
     sections.append(mermaid_diagram(
         load_diagram("10-3-process-takeover.mmd"),
-        page_id=page_id,
+        ctx,
     ))
 
     # Process D: Offline & Reconnect
@@ -2498,7 +2553,7 @@ def build_page_10(page_id: str) -> str:
     ))
     sections.append(mermaid_diagram(
         load_diagram("10-4-process-offline.mmd"),
-        page_id=page_id,
+        ctx,
     ))
 
     # Process E: Emergency (P0)
@@ -2511,16 +2566,14 @@ def build_page_10(page_id: str) -> str:
     ))
     sections.append(mermaid_diagram(
         load_diagram("10-5-process-emergency.mmd"),
-        page_id=page_id,
+        ctx,
     ))
 
     return "\n".join(sections)
 
 
-def build_page_11(page_id: str) -> str:
+def build_page_11(ctx: RenderContext) -> str:
     """Page 11: Event Storming — Software Design (2 mermaid, 0 code blocks)."""
-    global _code_block_count
-    _code_block_count = 0
     sections = []
 
     sections.append(toc())
@@ -2533,7 +2586,7 @@ def build_page_11(page_id: str) -> str:
 
     # Legend
     sections.append("<h3>สัญลักษณ์ที่ใช้ (Notation Legend)</h3>")
-    sections.append(expand_section("ES Notation Legend (8 elements)", _es_legend()))
+    sections.append(expand_section("ES Notation Legend (8 elements)", _es_legend(), ctx=ctx))
 
     # Bounded Context Map
     sections.append("<hr/>")
@@ -2544,7 +2597,7 @@ def build_page_11(page_id: str) -> str:
     ))
     sections.append(mermaid_diagram(
         load_diagram("11-1-context-map.mmd"),
-        page_id=page_id,
+        ctx,
     ))
 
     # Aggregates per Context
@@ -2667,16 +2720,14 @@ def build_page_11(page_id: str) -> str:
     ))
     sections.append(mermaid_diagram(
         load_diagram("11-2-acl-translation.mmd"),
-        page_id=page_id,
+        ctx,
     ))
 
     return "\n".join(sections)
 
 
-def build_page_12(page_id: str) -> str:
+def build_page_12(ctx: RenderContext) -> str:
     """Page 12: Use Case — Ad Distribution & Scheduling Cycle (2 mermaid, 0 code blocks)."""
-    global _code_block_count
-    _code_block_count = 0
     sections = []
 
     sections.append(toc())
@@ -2753,7 +2804,7 @@ def build_page_12(page_id: str) -> str:
 <tr><td>32</td><td>Ad-I</td><td>15s</td><td>Campaign</td><td>6:55</td></tr>
 <tr><td>33-55</td><td>Filler 24-46</td><td>10-15s</td><td>House</td><td>7:10-12:00</td></tr>
 </table>
-<p><strong>หมายเหตุ:</strong> Player เล่น <code>sequence[i++]</code> ตามลำดับ &rarr; วนซ้ำ 5 loops/hr</p>"""))
+<p><strong>หมายเหตุ:</strong> Player เล่น <code>sequence[i++]</code> ตามลำดับ &rarr; วนซ้ำ 5 loops/hr</p>""", ctx=ctx))
 
     sections.append('<h3>สรุปตัวเลขทั้งวัน</h3>')
     sections.append("""<table>
@@ -2775,7 +2826,7 @@ def build_page_12(page_id: str) -> str:
     sections.append('<h3>Algorithm Overview</h3>')
     sections.append(mermaid_diagram(
         load_diagram("12-ad-decisioning-steps.mmd"),
-        page_id=page_id,
+        ctx,
     ))
 
     # ─── Section 2: Calculation Cycle ───
@@ -2805,7 +2856,7 @@ def build_page_12(page_id: str) -> str:
 <tr><td>19:00</td><td>Cron rebuild Tier 2</td><td>Buffer 19:00-22:00</td></tr>
 <tr><td>21:55</td><td>Cron Tier 1 สุดท้าย</td><td>Loop 21:55-22:00</td></tr>
 <tr><td>22:00</td><td>ปิดจอ</td><td>&mdash;</td></tr>
-</table>"""))
+</table>""", ctx=ctx))
 
     sections.append('<h3>สรุปจำนวน Cron Jobs ต่อวัน</h3>')
     sections.append("""<table>
@@ -2872,7 +2923,7 @@ def build_page_12(page_id: str) -> str:
     sections.append('<h3>Flow: Ad ใหม่เข้าระบบ</h3>')
     sections.append(mermaid_diagram(
         load_diagram("12-recalc-sequence.mmd"),
-        page_id=page_id,
+        ctx,
     ))
 
     # ─── Section 3: Campaign Pacing Filter ───
@@ -3055,10 +3106,8 @@ def build_page_12(page_id: str) -> str:
     return "\n".join(sections)
 
 
-def build_page_13(page_id: str) -> str:
+def build_page_13(ctx: RenderContext) -> str:
     """Page 13: Use Case — Industry Comparison (1 mermaid, 0 code blocks)."""
-    global _code_block_count
-    _code_block_count = 0
     sections = []
 
     sections.append(toc())
@@ -3127,7 +3176,7 @@ def build_page_13(page_id: str) -> str:
     sections.append('<h3>เปรียบเทียบ Data Flow</h3>')
     sections.append(mermaid_diagram(
         load_diagram("13-industry-comparison.mmd"),
-        page_id=page_id,
+        ctx,
     ))
 
     # ─── Section 2: Comparison Table ───
@@ -3246,7 +3295,8 @@ def build_page_13(page_id: str) -> str:
         '<li><strong>Make-Good → MakeGoodRecord compensation system</strong></li>'
         '<li>Partial play ≠ impression (ไม่นับ billing)</li>'
         '</ul></td></tr>'
-        '</table>'
+        '</table>',
+        ctx=ctx,
     ))
 
     sections.append('<h3>สถาปัตยกรรมเรา vs มาตรฐาน DOOH (14 concepts)</h3>')
@@ -3267,7 +3317,8 @@ def build_page_13(page_id: str) -> str:
         '<tr><td><strong>Creative management</strong></td><td>Upload media + CDN + checksum validation</td><td>มาตรฐาน</td></tr>'
         '<tr><td><strong>Offline resilience</strong></td><td>Cache 3 ชั้น (Live/Buffer/Fallback)</td><td>มาตรฐาน (เทียบเท่า Xibo/BrightSign)</td></tr>'
         '<tr><td><strong>Loop scheduling</strong></td><td>Loop 5 นาที + event-driven ผ่าน Scheduling Engine (BullMQ)</td><td>มาตรฐาน</td></tr>'
-        '</table>'
+        '</table>',
+        ctx=ctx,
     ))
 
     sections.append('<h3>วิธีจัดการ Offline ของ Platform ชั้นนำ</h3>')
@@ -3278,7 +3329,8 @@ def build_page_13(page_id: str) -> str:
         '<tr><td>piSignage</td><td>Default playlist fallback + local media folder + delta sync</td><td>Full campaign window</td></tr>'
         '<tr><td>BrightSign BSN.Cloud</td><td>Local-first: all media cached, network = sync only</td><td>Content-dependent</td></tr>'
         '<tr><td>info-beamer</td><td>3-state degradation (Online/Degraded/Offline) + RTC fallback</td><td>All scheduled content</td></tr>'
-        '</table>'
+        '</table>',
+        ctx=ctx,
     ))
 
     sections.append('<h3>อ้างอิง Open Source</h3>')
@@ -3289,16 +3341,15 @@ def build_page_13(page_id: str) -> str:
         '<tr><td>Xibo .NET Client</td><td><a href="https://github.com/xibosignage/xibo-dotnetclient">xibosignage/xibo-dotnetclient</a></td><td>ScheduleManager.cs: thread polling, priority resolution, disk-resident schedule, Splash fallback</td></tr>'
         '<tr><td>piSignage</td><td><a href="https://github.com/colloqi/piSignage">colloqi/piSignage</a></td><td>Node.js + WebSocket, default playlist fallback, local filesystem media</td></tr>'
         '<tr><td>Anthias (Screenly OSE)</td><td><a href="https://github.com/Screenly/Anthias">Screenly/Anthias</a></td><td>Docker microservices, Redis + SQLite, Celery queue, Qt viewer</td></tr>'
-        '</table>'
+        '</table>',
+        ctx=ctx,
     ))
 
     return "\n".join(sections)
 
 
-def build_page_14(page_id: str) -> str:
+def build_page_14(ctx: RenderContext) -> str:
     """Page 14: Use Case Catalog — Advertiser Scenarios (v3, improved Thai)."""
-    global _code_block_count
-    _code_block_count = 0
     sections = []
 
     sections.append(toc())
@@ -3358,7 +3409,7 @@ def build_page_14(page_id: str) -> str:
     section หลัง Takeover
     โฆษณาปกติ ROS         :done, post, 13:00, 60m
     section PoP
-    PoP batch ส่ง Server   :milestone, pop, 13:00, 0d""", page_id))
+    PoP batch ส่ง Server   :milestone, pop, 13:00, 0d""", ctx))
     sections.append(_gantt_legend())
 
     # ── UC-TK-2 ───────────────────────────────────────────────────
@@ -3390,7 +3441,7 @@ def build_page_14(page_id: str) -> str:
     e8@{ animation: fast }
     e9@{ animation: fast }
     style D fill:#f8d7da,stroke:#dc3545
-    style H fill:#d4edda,stroke:#28a745""", page_id))
+    style H fill:#d4edda,stroke:#28a745""", ctx))
 
     # ── UC-TK-3 ───────────────────────────────────────────────────
     sections.append('<h3>UC-TK-3: Edge Case &mdash; Creative ไม่ผ่าน Review ก่อนถึงเวลา</h3>')
@@ -3420,7 +3471,7 @@ def build_page_14(page_id: str) -> str:
     e8@{ animation: slow }
     style H fill:#f8d7da,stroke:#dc3545
     style I fill:#fff3cd,stroke:#ffc107
-    style G fill:#d4edda,stroke:#28a745""", page_id))
+    style G fill:#d4edda,stroke:#28a745""", ctx))
 
     # ──────────────────────────────────────────────────────────────
     # SECTION 2: Exact Time
@@ -3460,7 +3511,7 @@ def build_page_14(page_id: str) -> str:
     Flash Sale 30s           :crit, etad, 12:00:00, 30s
     ET จบ 12-00-30           :milestone, ee, 12:00:30, 0d
     section กลับ ROS
-    P2 Ad B 15s              :done, a2, 12:00:30, 15s""", page_id))
+    P2 Ad B 15s              :done, a2, 12:00:30, 15s""", ctx))
     sections.append(_gantt_legend())
 
     # ── UC-ET-2 ───────────────────────────────────────────────────
@@ -3485,7 +3536,7 @@ def build_page_14(page_id: str) -> str:
     Window ปิด 12-00-30       :vert, we, 12:00:30, 1s
     section ผลลัพธ์
     Ad จบหลัง window          :milestone, ae, 12:00:40, 0d
-    ET make-good 30s          :active, mg, 12:00:40, 30s""", page_id))
+    ET make-good 30s          :active, mg, 12:00:40, 30s""", ctx))
     sections.append(_gantt_legend())
 
     # ── UC-ET-3 ───────────────────────────────────────────────────
@@ -3515,7 +3566,7 @@ def build_page_14(page_id: str) -> str:
     e7@{ animation: slow }
     e8@{ animation: slow }
     style G fill:#f8d7da,stroke:#dc3545
-    style F fill:#d4edda,stroke:#28a745""", page_id))
+    style F fill:#d4edda,stroke:#28a745""", ctx))
 
     # ──────────────────────────────────────────────────────────────
     # SECTION 3: Guaranteed
@@ -3553,7 +3604,7 @@ def build_page_14(page_id: str) -> str:
     P2 fills               :done, f1, 08:01, 14m
     P2 fills               :done, f2, 08:16, 14m
     P2 fills               :done, f3, 08:31, 14m
-    P2 fills               :done, f4, 08:46, 14m""", page_id))
+    P2 fills               :done, f4, 08:46, 14m""", ctx))
     sections.append(_gantt_legend())
 
     # ── UC-G-2 ────────────────────────────────────────────────────
@@ -3577,7 +3628,7 @@ def build_page_14(page_id: str) -> str:
     Make-good play 1        :active, mg1, 10:00, 1m
     Make-good play 2        :active, mg2, 10:05, 1m
     G play 3 at 10-15       :crit, g5, 10:15, 1m
-    G play 4 at 10-30       :crit, g6, 10:30, 1m""", page_id))
+    G play 4 at 10-30       :crit, g6, 10:30, 1m""", ctx))
     sections.append(_gantt_legend())
 
     # ──────────────────────────────────────────────────────────────
@@ -3624,7 +3675,7 @@ def build_page_14(page_id: str) -> str:
     e10@{ animation: fast }
     e11@{ animation: slow }
     style H fill:#f8d7da,stroke:#dc3545
-    style L fill:#d4edda,stroke:#28a745""", page_id))
+    style L fill:#d4edda,stroke:#28a745""", ctx))
 
     # ── UC-P2-2 ───────────────────────────────────────────────────
     sections.append('<h3>UC-P2-2: Edge Case &mdash; Creative ถูกปฏิเสธระหว่าง Review</h3>')
@@ -3659,7 +3710,7 @@ def build_page_14(page_id: str) -> str:
     e10@{ animation: fast }
     e11@{ animation: slow }
     style F fill:#f8d7da,stroke:#dc3545
-    style E fill:#d4edda,stroke:#28a745""", page_id))
+    style E fill:#d4edda,stroke:#28a745""", ctx))
 
     # ── UC-P2-3 ───────────────────────────────────────────────────
     sections.append('<h3>UC-P2-3: Edge Case &mdash; ป้ายออฟไลน์ระหว่าง Campaign</h3>')
@@ -3686,7 +3737,7 @@ def build_page_14(page_id: str) -> str:
     section PoP Reporting
     PoP ส่ง server ปกติ   :done, p1, 08:00, 60m
     PoP queue ใน device    :active, pq, 09:00, 240m
-    PoP batch sync         :milestone, ps, 13:00, 0d""", page_id))
+    PoP batch sync         :milestone, ps, 13:00, 0d""", ctx))
     sections.append(_gantt_legend())
 
     # ── UC-P2-4 ───────────────────────────────────────────────────
@@ -3713,7 +3764,7 @@ def build_page_14(page_id: str) -> str:
     section Creative C ลด 50 pct
     Creative C play 1      :crit, c1, 08:14, 1m
     Creative C play 2      :crit, c2, 08:34, 1m
-    Creative C play 3      :crit, c3, 08:54, 1m""", page_id))
+    Creative C play 3      :crit, c3, 08:54, 1m""", ctx))
     sections.append(_gantt_legend())
 
     # ──────────────────────────────────────────────────────────────
@@ -3765,7 +3816,7 @@ def build_page_14(page_id: str) -> str:
     P2 fills               :done, f4, 08:51, 19m
     P2 fills               :done, f5, 09:11, 19m
     P2 fills               :done, f6, 09:31, 19m
-    P2 fills               :done, f7, 09:51, 9m""", page_id))
+    P2 fills               :done, f7, 09:51, 9m""", ctx))
     sections.append(_gantt_legend())
 
     # ── UC-DP-2 ────────────────────────────────────────────────────
@@ -3793,7 +3844,7 @@ def build_page_14(page_id: str) -> str:
     DG play 3 at 08-50     :crit, d3, 08:50, 1m
     DG play 4 at 09-50     :crit, d4, 09:50, 1m
     section Make-good Level 1 repack ใน window
-    Level 1 repack 09-40   :active, mg1, 09:40, 1m""", page_id))
+    Level 1 repack 09-40   :active, mg1, 09:40, 1m""", ctx))
     sections.append(_gantt_legend())
 
     # ──────────────────────────────────────────────────────────────
@@ -3833,7 +3884,7 @@ def build_page_14(page_id: str) -> str:
     section หลัง Cancel
     ROS fills แทน slot ว่าง   :done, ros, 10:00, 60m
     section PoP
-    0 plays (cancelled)        :milestone, pop, 10:00, 0d""", page_id))
+    0 plays (cancelled)        :milestone, pop, 10:00, 0d""", ctx))
     sections.append(_gantt_legend())
 
     # ── UC-CX-2 ───────────────────────────────────────────────────
@@ -3858,7 +3909,7 @@ def build_page_14(page_id: str) -> str:
     section หลัง Hard Stop
     House Filler ทันที          :done, fill, 10:00:15, 45s
     section PoP
-    Partial play ไม่นับ         :milestone, pop, 10:00:15, 0d""", page_id))
+    Partial play ไม่นับ         :milestone, pop, 10:00:15, 0d""", ctx))
     sections.append(_gantt_legend())
 
     # ──────────────────────────────────────────────────────────────
@@ -3916,7 +3967,7 @@ def build_page_14(page_id: str) -> str:
     e10@{ animation: slow }
     e11@{ animation: fast }
     style K fill:#d4edda,stroke:#28a745
-    style I fill:#d4edda,stroke:#28a745""", page_id))
+    style I fill:#d4edda,stroke:#28a745""", ctx))
     sections.append('<h4>Timeline: C Takeover Blocks + A/B ROS (วัน 1 มีค.)</h4>')
     sections.append(mermaid_diagram("""gantt
     title UC-AV-1 C จอง 5 Takeover Block 1hr
@@ -3937,7 +3988,7 @@ def build_page_14(page_id: str) -> str:
     C Block 5 Takeover 1hr  :crit, c5, 19:00, 60m
     section Booking Events
     C ยืนยัน booking        :milestone, m1, 07:55, 0d
-    5 slots locked           :milestone, m2, 07:56, 0d""", page_id))
+    5 slots locked           :milestone, m2, 07:56, 0d""", ctx))
     sections.append(_gantt_legend())
     sections.append('<h4>Avails API: โครงสร้าง Response</h4>')
     sections.append("""<table>
@@ -4006,7 +4057,7 @@ def build_page_14(page_id: str) -> str:
     style M fill:#d4edda,stroke:#28a745
     style E fill:#f8d7da,stroke:#dc3545
     style F fill:#fff3cd,stroke:#ffc107
-    style I fill:#cce5ff,stroke:#004085""", page_id))
+    style I fill:#cce5ff,stroke:#004085""", ctx))
     sections.append('<h4>Auto-suggest Algorithm: Even Distribution</h4>')
     sections.append("""<table>
 <tr><th>Step</th><th>การทำงาน</th><th>ผลลัพธ์</th></tr>
@@ -4038,7 +4089,7 @@ def build_page_14(page_id: str) -> str:
     D Block 2               :active, d2, 09:00, 60m
     D Block 3               :active, d3, 12:00, 60m
     D Block 4               :active, d4, 15:00, 60m
-    D Block 5               :active, d5, 17:00, 60m""", page_id))
+    D Block 5               :active, d5, 17:00, 60m""", ctx))
     sections.append(_gantt_legend())
 
     # ── UC-AV-3 ───────────────────────────────────────────────────
@@ -4084,7 +4135,7 @@ def build_page_14(page_id: str) -> str:
     e15@{ animation: fast }
     style M fill:#d4edda,stroke:#28a745
     style I fill:#fff3cd,stroke:#ffc107
-    style E fill:#cce5ff,stroke:#004085""", page_id))
+    style E fill:#cce5ff,stroke:#004085""", ctx))
 
     # ──────────────────────────────────────────────────────────────
     # SECTION 8: Summary
@@ -4176,9 +4227,100 @@ SECTION_BUILDERS = {
 }
 
 
+# Sub-pages in creation (= display) order under the parent
+SUB_SECTIONS = ["1", "2", "3", "4", "5", "6", "7", "8", "9", "10", "11", "12", "13", "14"]
+PUBLISH_WORKERS = 4  # concurrent page uploads; each is 3-4 requests and Confluence throttles per user
+
+
+def render_page(sec: str, page_id: str, seed: int | None = None) -> tuple[str, RenderContext]:
+    """(storage HTML, render context) for one section."""
+    ctx = RenderContext(page_id, seed)
+    _, builder = SECTION_BUILDERS[sec]
+    return builder(ctx), ctx
+
+
+def _render_section(sec: str, page_id: str, seed: int | None = None) -> str:
+    """Build one section's storage HTML (runs in a worker process)."""
+    return render_page(sec, page_id, seed)[0]
+
+
+def render_sections(targets: list[tuple[str, str]], seed: int | None = None) -> dict[str, str]:
+    """{section: content} for (section, page_id) pairs, rendered on a process pool.
+
+    Builders are pure CPU work and keep all state in their RenderContext,
+    so sections can't interfere across (or within) workers.
+    """
+    with ProcessPoolExecutor(max_workers=min(len(targets), os.cpu_count() or 1)) as pool:
+        futures = {sec: pool.submit(_render_section, sec, pid, seed) for sec, pid in targets}
+        return {sec: future.result() for sec, future in futures.items()}
+
+
+_FORGE_INDEX = re.compile(r'<ac:adf-parameter key="index" type="integer">(\d+)</ac:adf-parameter>')
+
+
+def check_render(page_ids: dict) -> bool:
+    """Render every section serially, on threads and on processes; all must match.
+
+    Seeded contexts make builds byte-identical, so any difference means
+    render state leaked between pages. Prints per-section Forge indices.
+    """
+    targets = [(sec, page_ids["parent"] if sec == "parent" else (page_ids["pages"].get(key) or "DRAFT"))
+               for sec, (key, _) in SECTION_BUILDERS.items()]
+    serial = {}
+    for sec, pid in targets:
+        content, ctx = render_page(sec, pid, seed=0)
+        serial[sec] = content
+        indices = [int(i) for i in dict.fromkeys(_FORGE_INDEX.findall(content))]  # node + fallback repeat it
+        print(f"  [{sec:>6}] {ctx.code_blocks:>2} code blocks, mermaid indices {indices}")
+    with ThreadPoolExecutor(max_workers=len(targets)) as pool:
+        threaded = dict(zip(serial, pool.map(lambda t: _render_section(*t, seed=0), targets), strict=True))
+    parallel = render_sections(targets, seed=0)
+
+    ok = True
+    for mode, results in (("threads", threaded), ("processes", parallel)):
+        bad = [sec for sec in serial if results[sec] != serial[sec]]
+        print(f"  {mode}: {'OK' if not bad else 'MISMATCH in ' + ', '.join(bad)}")
+        ok = ok and not bad
+    return ok
+
+
+def publish_pages(api, page_ids: dict, uploads: list[tuple[str, str, str, str | None]],
+                  workers: int = PUBLISH_WORKERS) -> list[str]:
+    """Upload (key, page_id, content, title) pages with bounded concurrency. Returns errors.
+
+    Each page's log is printed in one piece when it finishes; its hash is
+    recorded (and the IDs file saved) from this thread only.
+    """
+    hashes = page_ids.setdefault("hashes", {})
+    errors = []
+
+    def upload(page_id, content, title):
+        lines = []
+        _update_page(api, page_id, content, title, log=lines.append)
+        return lines
+
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        futures = {
+            pool.submit(upload, page_id, content, title): (key, page_id, content, title)
+            for key, page_id, content, title in uploads
+        }
+        for future in as_completed(futures):
+            key, page_id, content, title = futures[future]
+            try:
+                lines = future.result()
+            except Exception as e:
+                errors.append(f"{key}: {e}")
+                print(f"  ❌ {key}: {e}")
+                continue
+            print("\n".join(lines))
+            hashes[key] = content_hash(content, title, page_id)
+            save_page_ids(page_ids)
+    return errors
+
+
 def _get_api():
     creds = load_credentials()
-    return ConfluenceAPI(
+    return PooledConfluenceAPI(
         base_url=creds["CONFLUENCE_URL"],
         auth_header=get_auth_header(
             creds["CONFLUENCE_USERNAME"], creds["CONFLUENCE_API_TOKEN"]
@@ -4187,20 +4329,34 @@ def _get_api():
     )
 
 
-def _update_page(api, page_id: str, content: str, title: str | None = None):
+def _update_page(api, page_id: str, content: str, title: str | None = None, log=print):
     page = api.get_page(page_id)
     version = page["version"]["number"]
     t = title or page["title"]
     api.update_page(page_id=page_id, title=t, content=content, version=version)
     new_ver = version + 1
-    print(f"  Updated: {t} (v{version} -> v{new_ver})")
-    print(f"  URL: https://{{JIRA_SITE}}/wiki/spaces/{SPACE_KEY}/pages/{page_id}")
+    log(f"  Updated: {t} (v{version} -> v{new_ver})")
+    log(f"  URL: https://{{JIRA_SITE}}/wiki/spaces/{SPACE_KEY}/pages/{page_id}")
     # Fix Confluence ADF panel bug: storage→ADF conversion sometimes creates
     # bodiedExtension instead of native panel for success/error/warning macros.
     # This causes "Error loading the extension!" in view mode.
     fixed = _fix_page_panels(api, page_id, t, new_ver)
     if fixed:
-        print(f"  Fixed {fixed} ADF panel(s) (bodiedExtension → native panel)")
+        log(f"  Fixed {fixed} ADF panel(s) (bodiedExtension → native panel)")
+
+
+def _sync_page(api, page_ids: dict, key: str, page_id: str, content: str,
+               title: str | None = None, force: bool = False) -> bool:
+    """_update_page() unless the content hash matches the last upload. Returns True if uploaded."""
+    digest = content_hash(content, title, page_id)
+    hashes = page_ids.setdefault("hashes", {})
+    if not force and hashes.get(key) == digest:
+        print(f"  Unchanged since last upload — skipped ({page_id})")
+        return False
+    _update_page(api, page_id, content, title)
+    hashes[key] = digest
+    save_page_ids(page_ids)
+    return True
 
 
 # Panel macro keys that Confluence should render as native ADF panels
@@ -4264,6 +4420,7 @@ def _fix_page_panels(api, page_id: str, title: str, current_ver: int) -> int:
 def main():
     dry_run = "--dry-run" in sys.argv
     create_all = "--create-all" in sys.argv
+    force = "--force" in sys.argv
 
     # Parse --section N
     section = None
@@ -4285,71 +4442,86 @@ def main():
     page_ids = load_page_ids()
     parent_id = page_ids["parent"]
 
+    # ── Self-check: parallel builds must match serial ones ──
+    if "--check-render" in sys.argv:
+        print("=== Checking render isolation (serial vs threads vs processes) ===")
+        sys.exit(0 if check_render(page_ids) else 1)
+
     # ── Dry-run single section ──
     if dry_run and section:
         if section not in SECTION_BUILDERS:
             print(f"Error: unknown section '{section}'. Valid: {list(SECTION_BUILDERS.keys())}")
             sys.exit(1)
-        key, builder = SECTION_BUILDERS[section]
+        key, _ = SECTION_BUILDERS[section]
         pid = parent_id if section == "parent" else (page_ids["pages"].get(key) or "DRAFT")
-        content = builder(page_id=pid)
+        content, ctx = render_page(section, pid)
         out = Path(__file__).parent.parent / "tasks" / f"arch-page-{section}-preview.html"
         out.parent.mkdir(exist_ok=True)
         out.write_text(content, encoding="utf-8")
         print(f"  DRY RUN section {section} — {out}")
-        print(f"  Content length: {len(content)} chars, code blocks: {_code_block_count}")
+        print(f"  Content length: {len(content)} chars, code blocks: {ctx.code_blocks}")
         return
 
     # ── Dry-run all sections ──
     if dry_run and not section:
         out_dir = Path(__file__).parent.parent / "tasks"
         out_dir.mkdir(exist_ok=True)
-        for sec, (key, builder) in SECTION_BUILDERS.items():
+        for sec, (key, _) in SECTION_BUILDERS.items():
             pid = parent_id if sec == "parent" else (page_ids["pages"].get(key) or "DRAFT")
-            content = builder(page_id=pid)
+            content, ctx = render_page(sec, pid)
             out = out_dir / f"arch-page-{sec}-preview.html"
             out.write_text(content, encoding="utf-8")
-            print(f"  [{sec:>6}] {len(content):>6} chars, {_code_block_count} code blocks → {out.name}")
+            print(f"  [{sec:>6}] {len(content):>6} chars, {ctx.code_blocks} code blocks → {out.name}")
         return
 
     api = _get_api()
 
     # ── Create all sub-pages ──
     if create_all:
-        # Update parent first
-        print("=== Updating parent page ===")
-        content = build_parent_content(page_id=parent_id)
-        _update_page(api, parent_id, content)
-
-        # Create sub-pages
-        for sec in ["1", "2", "3", "4", "5", "6", "7", "8", "9", "10", "11", "12", "13", "14"]:
-            key, builder = SECTION_BUILDERS[sec]
+        # Create missing sub-pages first, one by one, so they keep their order under the parent
+        for sec in SUB_SECTIONS:
+            key, _ = SECTION_BUILDERS[sec]
+            if page_ids["pages"].get(key):
+                continue
             title = SUB_PAGE_TITLES[key]
-            existing_id = page_ids["pages"].get(key)
-
-            if existing_id:
-                print(f"\n=== Updating sub-page {sec}: {title} ===")
-                content = builder(page_id=existing_id)
-                _update_page(api, existing_id, content, title)
-            else:
-                print(f"\n=== Creating sub-page {sec}: {title} ===")
-                # Create with placeholder, then update with real content
-                result = api.create_page(
-                    space_key=SPACE_KEY,
-                    title=title,
-                    content="<p>Loading...</p>",
-                    parent_id=parent_id,
-                )
-                new_id = result.get("id", "unknown")
-                page_ids["pages"][key] = new_id
-                save_page_ids(page_ids)
-                print(f"  Created: {new_id}")
-
-                # Now update with real content (needs page_id for Forge macros)
-                content = builder(page_id=new_id)
-                _update_page(api, new_id, content, title)
-
-        print(f"\n=== Done! Page IDs saved to {PAGE_IDS_FILE} ===")
+            print(f"=== Creating sub-page {sec}: {title} ===")
+            # Create with placeholder; real content needs the page_id for Forge macros
+            result = api.create_page(
+                space_key=SPACE_KEY,
+                title=title,
+                content="<p>Loading...</p>",
+                parent_id=parent_id,
+            )
+            new_id = result.get("id", "unknown")
+            page_ids["pages"][key] = new_id
+            save_page_ids(page_ids)
+            print(f"  Created: {new_id}")
+
+        # Render every section in parallel
+        started = time.perf_counter()
+        targets = [("parent", parent_id)] + [(sec, page_ids["pages"][SECTION_BUILDERS[sec][0]]) for sec in SUB_SECTIONS]
+        contents = render_sections(targets)
+        print(f"\n=== Rendered {len(contents)} sections in {time.perf_counter() - started:.1f}s ===")
+
+        # Publish only what changed since the last upload
+        hashes = page_ids.get("hashes", {})
+        uploads = []
+        for sec, pid in targets:
+            key = SECTION_BUILDERS[sec][0]
+            title = SUB_PAGE_TITLES.get(key)  # parent keeps its current title
+            content = contents[sec]
+            if force or hashes.get(key) != content_hash(content, title, pid):
+                uploads.append((key, pid, content, title))
+        print(f"=== Publishing {len(uploads)} changed page(s), {len(targets) - len(uploads)} unchanged ===")
+        started = time.perf_counter()
+        errors = publish_pages(api, page_ids, uploads)
+        print(f"\n=== Done in {time.perf_counter() - started:.1f}s! {len(uploads) - len(errors)} uploaded, "
+              f"{len(targets) - len(uploads)} unchanged. Page IDs saved to {PAGE_IDS_FILE} ===")
+        if errors:
+            print(f"{len(errors)} upload(s) failed:")
+            for err in errors:
+                print(f"  {err}")
+            sys.exit(1)
         return
 
     # ── Update single section ──
@@ -4357,7 +4529,7 @@ def main():
         if section not in SECTION_BUILDERS:
             print(f"Error: unknown section '{section}'. Valid: {list(SECTION_BUILDERS.keys())}")
             sys.exit(1)
-        key, builder = SECTION_BUILDERS[section]
+        key, _ = SECTION_BUILDERS[section]
         if section == "parent":
             pid = parent_id
         else:
@@ -4376,15 +4548,15 @@ def main():
                 page_ids["pages"][key] = pid
                 save_page_ids(page_ids)
                 print(f"  Created: {pid}")
-        content = builder(page_id=pid)
+        content, _ = render_page(section, pid)
         title = SUB_PAGE_TITLES.get(key)
         print(f"=== Updating section {section} ===")
-        _update_page(api, pid, content, title)
+        _sync_page(api, page_ids, key, pid, content, title, force)
         return
 
     # ── Legacy: update specific page ──
     if update_page_id:
-        content = build_parent_content(page_id=update_page_id)
+        content = build_parent_content(RenderContext(update_page_id))
         print(f"=== Updating page {update_page_id} ===")
         _update_page(api, update_page_id, content)
         return
@@ -4394,6 +4566,8 @@ def main():
     print("  --create-all                Create/update parent + all sub-pages")
     print("  --section N                 Update single section (parent, 1-13)")
     print("  --update PAGE_ID            Legacy: update specific page")
+    print("  --force                     Upload even if content is unchanged since last upload")
+    print("  --check-render              Verify parallel builds match serial ones (no upload)")
 
 
 if __name__ == "__main__":
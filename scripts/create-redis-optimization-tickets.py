@@ -11,12 +11,12 @@ Usage:
 
 import json
 import sys
-import time
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent / ".claude/skills/atlassian-scripts"))
+from common.transport import PooledJiraAPI
 from lib.auth import create_ssl_context, get_auth_header, load_credentials
-from lib.jira_api import JiraAPI, derive_jira_url
+from lib.jira_api import derive_jira_url
 
 # --- ADF helpers ---
 def bold(text):
@@ -637,7 +637,7 @@ def main():
     dry_run = "--dry-run" in sys.argv
 
     creds = load_credentials()
-    api = JiraAPI(
+    api = PooledJiraAPI(
         base_url=derive_jira_url(creds["CONFLUENCE_URL"]),
         auth_header=get_auth_header(creds["CONFLUENCE_USERNAME"], creds["CONFLUENCE_API_TOKEN"]),
         ssl_context=create_ssl_context(),
@@ -673,7 +673,6 @@ def main():
             key = result["key"]
             print(f"         → {key}")
             created.append({"key": key, "summary": summary, "sp": sp})
-            time.sleep(0.5)  # Rate limit
         except Exception as e:
             print(f"         → ERROR: {e}")
             created.append({"key": "ERROR", "summary": summary, "sp": sp, "error": str(e)})
@@ -5,20 +5,32 @@ Configured via .gitattributes + git config (see scripts/setup.sh):
   smudge: placeholder → real values  (on checkout/pull)
   clean:  real values → placeholder  (on add/commit)
 
+  --benchmark [root]: time the compiled rules against the sequential
+  reference over every filtered file under root (default: this repo).
+
+  --process: git's long-running filter protocol (filter.<driver>.process).
+  One process serves every file of a git command, so config loading and
+  interpreter start-up are paid once instead of per file. Per-file
+  results are identical to --smudge / --clean.
+
 If .claude/project-config.json is missing, passes through unchanged.
 """
 
 import json
 import re
 import sys
+from functools import lru_cache
 from pathlib import Path
 
 SCRIPT_DIR = Path(__file__).parent
 CONFIG_PATH = SCRIPT_DIR.parent / ".claude" / "project-config.json"
 
+PKT_MAX_DATA = 65516  # largest pkt-line payload (65520 minus the 4-byte length header)
+
 
+@lru_cache(maxsize=1)
 def load_values():
-    """Load config values. Returns None if config missing."""
+    """Load config values (once per process). Returns None if config missing."""
     if not CONFIG_PATH.exists():
         return None
     with open(CONFIG_PATH) as f:
@@ -44,8 +56,206 @@ def load_values():
     }
 
 
+# --- Compiled rules ---
+#
+# Every rule below is folded into one alternation regex, in the original
+# order, and applied in a single re.sub pass; team member names follow in
+# one more pass over a trie-shaped alternation. Substring prefilters skip
+# either pass when the file contains none of its literal tokens.
+#
+# The alternation deliberately has no groups and every alternative starts
+# with a literal: sre can then reject most positions on the first character,
+# where a MARK or lookbehind up front would make it try every branch at
+# every position (~30x slower than running the rules one by one).
+
+
+class RuleSet:
+    """Ordered (regex, replacement) rules applied in one pass, then literals in a second.
+
+    Where two rules could match at the same position the earlier one wins,
+    as it did when the rules ran one after another. Replacements are literal.
+    """
+
+    def __init__(self, rules, literals, needles):
+        """`literals` ({text: replacement}, e.g. member names) run after `rules`, longest text first.
+
+        The literals get their own pass over the rules' output, as they did
+        after the sequential rules: a name can share text with a rule (a
+        member called "Sam Tathep" next to the "Tathep Platform" rule), so
+        one alternation over both would pick different matches. Literals
+        that overlap each other (one ends with what another starts with)
+        would still differ in a single leftmost pass; those configs keep
+        longest-first str.replace for the literals.
+        """
+        self.pattern = re.compile("|".join(pattern for pattern, _ in rules))
+        self.rules = [(re.compile(pattern).match, repl) for pattern, repl in rules]
+        self.needles = tuple(dict.fromkeys(n for n in needles if n))
+        self.literals = literals
+        self.separate = _interfering(literals)
+        self.literal_pattern = None if self.separate or not literals else re.compile("|".join(_trie_branches(literals)))
+
+    def _replacement(self, m):
+        # Dispatch: the first rule matching here is the alternative re picked
+        content, pos = m.string, m.start()
+        for match, repl in self.rules:
+            if match(content, pos):
+                return repl
+        return m.group()
+
+    def _literal(self, m):
+        return self.literals[m.group()]
+
+    def apply(self, content):
+        if any(n in content for n in self.needles):
+            content = self.pattern.sub(self._replacement, content)
+        if not any(text in content for text in self.literals):
+            return content
+        if self.separate:
+            for text in sorted(self.literals, key=len, reverse=True):
+                content = content.replace(text, self.literals[text])
+            return content
+        return self.literal_pattern.sub(self._literal, content)
+
+
+def _interfering(literals):
+    """True if a single leftmost pass could treat `literals` differently from longest-first replaces."""
+    for a in literals:
+        for b in literals:
+            if a == b:
+                continue
+            if a in literals[b] or any(a.endswith(b[:n]) for n in range(1, min(len(a), len(b)))):
+                return True
+    return False
+
+
+def _trie_branches(words):
+    """Alternatives matching the longest of `words` at a position, with shared prefixes factored out.
+
+    Same result as longest-first alternation, but each position costs one
+    branch per distinct next character instead of one per word. The top
+    level is returned as separate alternatives so each starts with a literal.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}  # end of word
+
+    def build(node):
+        branches = [re.escape(ch) + build(child) for ch, child in node.items() if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f"(?:{body})?" if "" in node else body  # greedy: the longer word first
+
+    return [re.escape(ch) + build(child) for ch, child in trie.items() if ch]
+
+
+def smudge_rules(v):
+    """Smudge rules as (regex, replacement) pairs, in priority order."""
+    pk = v["PROJECT_KEY"]
+    co = v["COMPANY"]
+    return [
+        # PROJECT_KEY
+        (r'"projectKey":\s*"\{\{PROJECT_KEY\}\}"', f'"projectKey": "{pk}"'),
+        (r'project_key:\s*"\{\{PROJECT_KEY\}\}"', f'project_key: "{pk}"'),
+        (r'project_key="\{\{PROJECT_KEY\}\}"', f'project_key="{pk}"'),
+        (r'space_key:\s*"\{\{SPACE_KEY\}\}"', f'space_key: "{pk}"'),
+        (r'space_key="\{\{SPACE_KEY\}\}"', f'space_key="{pk}"'),
+        (r"\{\{PROJECT_KEY\}\}-XXX", f"{pk}-XXX"),
+        # JIRA_SITE / CONFLUENCE_SITE
+        (r"https://\{\{JIRA_SITE\}\}", f"https://{v['JIRA_SITE']}"),
+        (r"https://\{\{CONFLUENCE_SITE\}\}", f"https://{v['CONFLUENCE_SITE']}"),
+        # Custom fields
+        (r"\{\{START_DATE_FIELD\}\}", v["START_DATE_FIELD"]),
+        (r"\{\{SPRINT_FIELD\}\}", v["SPRINT_FIELD"]),
+        # COMPANY
+        (r"\{\{COMPANY\}\} Platform", f"{co} Platform"),
+        (r"for \*\*\{\{COMPANY\}\} Platform\*\*", f"for **{co} Platform**"),
+        (r"Agile Documentation System for \*\*\{\{COMPANY\}\}", f"Agile Documentation System for **{co}"),
+        # COMPANY_LOWER
+        (r"~/Projects/\{\{COMPANY_LOWER\}\}/", f"~/Codes/Works/{v['COMPANY_LOWER']}/"),
+    ]
+
+
+def clean_rules(v):
+    """Clean rules as (regex, replacement) pairs, in priority order."""
+    pk = re.escape(v["PROJECT_KEY"])
+    co = re.escape(v["COMPANY"])
+    # (?<!/browse/)KEY-XXX, with the lookbehind moved past the first character
+    first, rest = v["PROJECT_KEY"][:1], v["PROJECT_KEY"][1:]
+    issue_key = f"{re.escape(first)}(?<!/browse/.){re.escape(rest)}-XXX"
+    rules = [
+        # PROJECT_KEY
+        (rf'"projectKey":\s*"{pk}"', '"projectKey": "{{PROJECT_KEY}}"'),
+        (rf'project_key:\s*"{pk}"', 'project_key: "{{PROJECT_KEY}}"'),
+        (rf'project_key="{pk}"', 'project_key="{{PROJECT_KEY}}"'),
+        (rf'space_key:\s*"{pk}"', 'space_key: "{{SPACE_KEY}}"'),
+        (rf'space_key="{pk}"', 'space_key="{{SPACE_KEY}}"'),
+        # Issue key pattern (but not in URLs/smart links)
+        (issue_key, "{{PROJECT_KEY}}-XXX"),
+        # JIRA_SITE
+        (rf"https://{re.escape(v['JIRA_SITE'])}", "https://{{JIRA_SITE}}"),
+    ]
+    # CONFLUENCE_SITE (only if different from JIRA_SITE)
+    if v["CONFLUENCE_SITE"] != v["JIRA_SITE"]:
+        rules.append((rf"https://{re.escape(v['CONFLUENCE_SITE'])}", "https://{{CONFLUENCE_SITE}}"))
+    rules += [
+        # Custom fields
+        (re.escape(v["START_DATE_FIELD"]), "{{START_DATE_FIELD}}"),
+        (re.escape(v["SPRINT_FIELD"]), "{{SPRINT_FIELD}}"),
+        # COMPANY
+        (rf"{co} Platform", "{{COMPANY}} Platform"),
+        (rf"for \*\*{co} Platform\*\*", "for **{{COMPANY}} Platform**"),
+        (rf"Agile Documentation System for \*\*{co}", "Agile Documentation System for **{{COMPANY}}"),
+        # COMPANY_LOWER
+        (rf"~/Codes/Works/{re.escape(v['COMPANY_LOWER'])}/", "~/Projects/{{COMPANY_LOWER}}/"),
+    ]
+    return rules
+
+
+_RULE_SETS = {}
+
+
+def rule_sets(v):
+    """(smudge, clean) RuleSets for config values `v`, compiled once per process."""
+    cache_key = json.dumps(v, sort_keys=True)
+    if cache_key not in _RULE_SETS:
+        clean_needles = [
+            v["PROJECT_KEY"],
+            v["JIRA_SITE"],
+            v["CONFLUENCE_SITE"],
+            v["START_DATE_FIELD"],
+            v["SPRINT_FIELD"],
+            v["COMPANY"],
+            v["COMPANY_LOWER"],
+        ]
+        # Team member names: {{SLOT_N}} ↔ real name
+        slots = {f"{{{{{slot}}}}}": name for name, slot in v["MEMBER_SLOTS"].items()}
+        names = {name: placeholder for placeholder, name in slots.items()}
+        _RULE_SETS[cache_key] = (
+            RuleSet(smudge_rules(v), slots, ["{{"]),
+            RuleSet(clean_rules(v), names, clean_needles),
+        )
+    return _RULE_SETS[cache_key]
+
+
 def smudge(content, v):
     """Placeholder → real values (checkout/pull)."""
+    return rule_sets(v)[0].apply(content)
+
+
+def clean(content, v):
+    """Real values → placeholder (add/commit)."""
+    return rule_sets(v)[1].apply(content)
+
+
+# --- Sequential reference implementation ---
+
+
+def smudge_sequential(content, v):
+    """Reference smudge: one re.sub pass per rule (see --benchmark)."""
     pk = v["PROJECT_KEY"]
 
     # PROJECT_KEY
@@ -89,8 +299,8 @@ def smudge(content, v):
     return content
 
 
-def clean(content, v):
-    """Real values → placeholder (add/commit)."""
+def clean_sequential(content, v):
+    """Reference clean: one re.sub pass per rule (see --benchmark)."""
     pk = re.escape(v["PROJECT_KEY"])
 
     # PROJECT_KEY
@@ -146,22 +356,193 @@ def clean(content, v):
     return content
 
 
-def main():
-    mode = sys.argv[1] if len(sys.argv) > 1 else "--smudge"
-    content = sys.stdin.buffer.read().decode("utf-8", errors="replace")
+def apply_filter(command, data):
+    """Filter one file's bytes: command is "clean" or "smudge"."""
+    content = data.decode("utf-8", errors="replace")
 
     values = load_values()
     if values is None:
         # No config → pass through unchanged
-        sys.stdout.buffer.write(content.encode("utf-8"))
-        return
+        return content.encode("utf-8")
 
-    if mode == "--clean":
+    if command == "clean":
         content = clean(content, values)
     else:
         content = smudge(content, values)
 
-    sys.stdout.buffer.write(content.encode("utf-8"))
+    return content.encode("utf-8")
+
+
+# --- Long-running process protocol (gitprotocol-common pkt-line framing) ---
+
+
+def read_pkt(stream):
+    """One pkt-line payload, or None for a flush packet. Raises EOFError at end of input."""
+    header = stream.read(4)
+    if not header:
+        raise EOFError
+    size = int(header, 16)
+    if size == 0:
+        return None
+    if size < 4:
+        raise ValueError(f"invalid pkt-line length {header!r}")
+    return stream.read(size - 4)
+
+
+def read_pkt_text(stream):
+    """Text packets up to the next flush, as a list of lines without trailing newline."""
+    lines = []
+    while (pkt := read_pkt(stream)) is not None:
+        lines.append(pkt.decode("utf-8").rstrip("\n"))
+    return lines
+
+
+def read_pkt_content(stream):
+    """Binary packets up to the next flush, joined."""
+    chunks = []
+    while (pkt := read_pkt(stream)) is not None:
+        chunks.append(pkt)
+    return b"".join(chunks)
+
+
+def write_pkt(stream, *lines):
+    """Text packets followed by a flush."""
+    for line in lines:
+        data = f"{line}\n".encode()
+        stream.write(b"%04x" % (len(data) + 4) + data)
+    stream.write(b"0000")
+    stream.flush()
+
+
+def write_pkt_content(stream, data):
+    """Binary content split into max-size packets, followed by a flush."""
+    for i in range(0, len(data), PKT_MAX_DATA):
+        chunk = data[i : i + PKT_MAX_DATA]
+        stream.write(b"%04x" % (len(chunk) + 4) + chunk)
+    stream.write(b"0000")
+    stream.flush()
+
+
+def serve(stdin, stdout):
+    """Answer git's filter-process requests until git closes the pipe."""
+    # Handshake: git-filter-client/version=2 → git-filter-server/version=2
+    welcome = read_pkt_text(stdin)
+    if "git-filter-client" not in welcome or "version=2" not in welcome:
+        raise ValueError(f"unexpected filter handshake: {welcome}")
+    write_pkt(stdout, "git-filter-server", "version=2")
+
+    offered = {line.split("=", 1)[1] for line in read_pkt_text(stdin) if line.startswith("capability=")}
+    write_pkt(stdout, *(f"capability={c}" for c in ("clean", "smudge") if c in offered))
+
+    while True:
+        try:
+            headers = read_pkt_text(stdin)
+        except EOFError:
+            return
+        meta = dict(line.split("=", 1) for line in headers if "=" in line)
+        data = read_pkt_content(stdin)
+        command = meta.get("command")
+        try:
+            if command not in ("clean", "smudge"):
+                raise ValueError(f"unsupported command {command!r}")
+            result = apply_filter(command, data)
+        except Exception as e:  # one bad file must not take down the whole checkout
+            print(f"git-filter: {meta.get('pathname', '?')}: {e}", file=sys.stderr)
+            write_pkt(stdout, "status=error")
+            continue
+        write_pkt(stdout, "status=success")
+        write_pkt_content(stdout, result)
+        write_pkt(stdout)  # empty list: keep status=success
+
+
+# --- Benchmark ---
+
+# Stand-in config for --benchmark when .claude/project-config.json is missing
+BENCHMARK_VALUES = {
+    "PROJECT_KEY": "BEP",
+    "JIRA_SITE": "example.atlassian.net",
+    "CONFLUENCE_SITE": "example.atlassian.net",
+    "START_DATE_FIELD": "customfield_10015",
+    "SPRINT_FIELD": "customfield_10020",
+    "COMPANY": "Tathep",
+    "COMPANY_LOWER": "tathep",
+    "MEMBER_SLOTS": {name: f"SLOT_{i + 1}" for i, name in enumerate(["Joakim", "Jo", "Ann Lee", "สมชาย ใจดี"])},
+}
+
+# Member names that share text with the rules or with each other: smudge and
+# clean must match the sequential filters on these as well as on the files
+BENCHMARK_OVERLAPS = [
+    ({"Sam Tathep": "SLOT_1"}, "Owner: Sam Tathep Platform team\nOwner: {{SLOT_1}} {{COMPANY}} Platform team"),
+    ({"Platform Team": "SLOT_1"}, "the Tathep Platform Team page\nthe {{COMPANY}} {{SLOT_1}} page"),
+    ({"BEP Lead": "SLOT_1", "Lead Dev": "SLOT_2"}, 'project_key="BEP" BEP-XXX by BEP Lead Dev\n{{SLOT_1}} Dev'),
+    ({"Jo": "SLOT_1", "Joakim": "SLOT_2", "customfield": "SLOT_3"}, "Jo, Joakim: customfield_10015 {{SLOT_3}}"),
+]
+
+
+def filtered_files(root):
+    """Tracked files under `root` that .gitattributes routes through this filter."""
+    import subprocess
+
+    listed = subprocess.run(["git", "-C", str(root), "ls-files", "-z"], capture_output=True, check=True).stdout
+    attrs = subprocess.run(
+        ["git", "-C", str(root), "check-attr", "-z", "--stdin", "filter"], input=listed, capture_output=True, check=True
+    ).stdout.split(b"\0")[:-1]
+    # check-attr -z output: NUL-terminated path, attribute, value triples
+    return [
+        Path(root) / path.decode()
+        for path, _, value in zip(attrs[0::3], attrs[1::3], attrs[2::3], strict=True)
+        if value == b"project-config"
+    ]
+
+
+def run_benchmark(root, rounds=5):
+    """Time sequential vs compiled smudge + clean over every filtered file; outputs must match."""
+    import time
+
+    values = load_values() or BENCHMARK_VALUES
+    files = [(p, p.read_bytes().decode("utf-8", errors="replace")) for p in filtered_files(root) if p.is_file()]
+    total = sum(len(text) for _, text in files)
+    print(f"{len(files)} files, {total / 1e6:.1f}M chars, {len(values['MEMBER_SLOTS'])} members, {rounds} rounds")
+
+    mismatches = []
+    for path, text in files:
+        smudged = smudge_sequential(text, values)
+        if smudge(text, values) != smudged or clean(smudged, values) != clean_sequential(smudged, values):
+            mismatches.append(path)
+    for slots, text in BENCHMARK_OVERLAPS:
+        v = {**values, "MEMBER_SLOTS": slots}
+        if smudge(text, v) != smudge_sequential(text, v) or clean(text, v) != clean_sequential(text, v):
+            mismatches.append(f"members {slots}: {text!r}")
+
+    timings = {}
+    for name, do_smudge, do_clean in (
+        ("sequential", smudge_sequential, clean_sequential),
+        ("compiled", smudge, clean),
+    ):
+        t0 = time.perf_counter()
+        for _ in range(rounds):
+            for _, text in files:
+                do_clean(do_smudge(text, values), values)
+        timings[name] = (time.perf_counter() - t0) / rounds
+        print(f"  {name:<11} {timings[name] * 1000:8.1f} ms/round  {total / timings[name] / 1e6:7.1f}M chars/s")
+    print(f"  speedup     {timings['sequential'] / timings['compiled']:8.1f}x")
+
+    for path in mismatches:
+        print(f"  MISMATCH: {path}", file=sys.stderr)
+    return 1 if mismatches else 0
+
+
+def main():
+    mode = sys.argv[1] if len(sys.argv) > 1 else "--smudge"
+    if mode == "--benchmark":
+        root = sys.argv[2] if len(sys.argv) > 2 else SCRIPT_DIR.parent
+        sys.exit(run_benchmark(root))
+    if mode == "--process":
+        serve(sys.stdin.buffer, sys.stdout.buffer)
+        return
+
+    data = sys.stdin.buffer.read()
+    sys.stdout.buffer.write(apply_filter("clean" if mode == "--clean" else "smudge", data))
 
 
 if __name__ == "__main__":
@@ -13,7 +13,8 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '.claude', 'skills', 'atlassian-scripts'))
 
 from lib.auth import create_ssl_context, load_credentials, get_auth_header
-from lib.jira_api import JiraAPI, derive_jira_url
+from lib.jira_api import derive_jira_url
+from common.transport import PooledJiraAPI
 
 DRY_RUN = "--dry-run" in sys.argv
 VERSION_ID = "10268"
@@ -43,7 +44,7 @@ if DRY_RUN:
     sys.exit(0)
 
 creds = load_credentials()
-api = JiraAPI(
+api = PooledJiraAPI(
     base_url=derive_jira_url(creds["CONFLUENCE_URL"]),
     auth_header=get_auth_header(creds["CONFLUENCE_USERNAME"], creds["CONFLUENCE_API_TOKEN"]),
     ssl_context=create_ssl_context(),
@@ -64,5 +65,7 @@ for key in to_update:
         fail.append(key)
 
 print(f"\nDone: {len(ok)} ok, {len(fail)} failed")
+stats = api.pool.stats()
+print(f"Connections: {stats['connections_opened']} opened, {stats['connections_reused']} reused")
 if fail:
     print(f"Failed: {fail}")
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 # /// script
-# requires-python = ">=3.9"
+# requires-python = ">=3.10"
 # ///
 """Parse large MCP tool outputs that exceed Claude's token limit.
 
@@ -8,6 +8,18 @@ Handles two MCP output formats:
   - MCP Atlassian: {"result": "{...JSON...}"}
   - Cache Server:  [{"type":"text","text":"{...JSON...}"}]
 
+Files over STREAM_AUTO_BYTES (or any file with --stream) are parsed
+incrementally: issues are decoded one at a time straight out of the
+escaped inner JSON string, so memory stays flat for 100MB+ dumps.
+
+Each parse also writes a column-wise cache (see PARSE_CACHE_DIR), in chunks
+as it goes, so streaming stays flat; repeated queries against an unchanged
+file skip parsing and read only the columns they use.
+
+Several files (globs and directories are expanded) are parsed in parallel
+worker processes and merged by issue key, keeping the most recently updated
+copy of each issue.
+
 Usage:
   python3 scripts/parse-mcp-output.py <file>                   # default table
   python3 scripts/parse-mcp-output.py <file> --status "In Progress,TO FIX"
@@ -15,6 +27,18 @@ Usage:
   python3 scripts/parse-mcp-output.py <file> --fields key,summary,status
   python3 scripts/parse-mcp-output.py <file> --json            # raw JSON output
   python3 scripts/parse-mcp-output.py <file> --csv             # CSV output
+  python3 scripts/parse-mcp-output.py <file> --ndjson | head    # one JSON object per line
+  python3 scripts/parse-mcp-output.py <file> --max-tokens 8000  # numbered chunks within a token budget
+  python3 scripts/parse-mcp-output.py <file> --max-tokens 8000 --chunk-dir /tmp/chunks  # files + index.json
+  python3 scripts/parse-mcp-output.py <file> -w 'status in ("To Do", "TO FIX") and start_date < 2026-11-01'
+  python3 scripts/parse-mcp-output.py <file> --sort=-sp,key --limit 20
+  python3 scripts/parse-mcp-output.py <file> -g assignee --agg count,sum(sp) --sort=-count
+  python3 scripts/parse-mcp-output.py <file> --stream          # force streaming parse
+  python3 scripts/parse-mcp-output.py <file> --no-cache        # skip the parse cache
+  python3 scripts/parse-mcp-output.py 'dumps/*.txt' --jobs 4    # merge many dumps by key
+  python3 scripts/parse-mcp-output.py dumps/ sprint-42.txt      # directories + files
+  python3 scripts/parse-mcp-output.py --benchmark 100000        # projection rows/sec (synthetic, offline)
+  python3 scripts/parse-mcp-output.py --check-stream            # streaming parser vs json.load (offline)
 
 Examples (Claude Code context):
   # After MCP tool saves to file due to token limit:
@@ -25,10 +49,24 @@ Examples (Claude Code context):
 from __future__ import annotations
 
 import argparse
+import contextlib
 import csv
+import glob
+import hashlib
 import io
+import itertools
 import json
+import operator
+import os
+import pickle
+import re
 import sys
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import TextIO
 
 # -- Field extractors ----------------------------------------------------------
 
@@ -48,9 +86,10 @@ FIELD_EXTRACTORS: dict[str, callable] = {
     ),
     "start_date": lambda i: _custom_field_value(i, "customfield_10015"),
     "sprint": lambda i: _custom_field_value(i, "customfield_10020"),
-    "duedate": lambda i: i.get("duedate", ""),
-    "created": lambda i: i.get("created", "")[:10],
-    "updated": lambda i: i.get("updated", "")[:10],
+    "sp": lambda i: _custom_field_value(i, "customfield_10016"),
+    "duedate": lambda i: i.get("duedate") or "",
+    "created": lambda i: (i.get("created") or "")[:10],
+    "updated": lambda i: (i.get("updated") or "")[:10],
 }
 
 DEFAULT_FIELDS = ["key", "status", "start_date", "assignee", "summary"]
@@ -77,6 +116,93 @@ def _custom_field_value(issue: dict, field: str) -> str:
     return str(raw)
 
 
+# -- Compiled projection -------------------------------------------------------
+#
+# FIELD_EXTRACTORS is the reference definition, but calling one lambda per
+# field per row (each walking dicts through _nested) dominates output time on
+# large dumps. compile_projector() generates one straight-line function per
+# --fields list instead: every lookup is inlined with constant keys.
+# _PROJECTION_SPECS must mirror FIELD_EXTRACTORS (--benchmark checks both
+# produce identical rows); fields without a spec call their extractor.
+
+_PROJECTION_SPECS: dict[str, tuple] = {
+    "key": ("get", "key"),
+    "id": ("get", "id"),
+    "summary": ("head", "summary", 60),
+    "summary_full": ("get", "summary"),
+    "status": ("nested", ("status", "name"), ""),
+    "status_category": ("nested", ("status", "category"), ""),
+    "priority": ("nested", ("priority", "name"), ""),
+    "assignee": ("nested", ("assignee", "display_name"), "Unassigned"),
+    "parent": ("nested", ("parent", "key"), ""),
+    "issuetype": ("nested", ("issuetype", "name"), ""),
+    "labels": ("join", "labels"),
+    "start_date": ("custom", "customfield_10015"),
+    "sprint": ("custom", "customfield_10020"),
+    "sp": ("custom", "customfield_10016"),
+    "duedate": ("text", "duedate", None),
+    "created": ("text", "created", 10),
+    "updated": ("text", "updated", 10),
+}
+
+
+def _projection_code(field: str, out: str, tmp: str, namespace: dict) -> list[str]:
+    """Statements that assign `field` of issue `i` to the local `out`."""
+    spec = _PROJECTION_SPECS.get(field)
+    if spec is None:
+        extract = FIELD_EXTRACTORS.get(field) or _FILTER_COLUMNS.get(field)
+        if extract is None:
+            return [f"{out} = str(get({field!r}, ''))"]
+        namespace[f"x_{out}"] = extract
+        return [f"{out} = x_{out}(i)"]
+
+    kind, name, *arg = spec
+    if kind == "get":
+        return [f"{out} = get({name!r}, '')"]
+    if kind == "head":
+        return [f"{out} = get({name!r}, '')[:{arg[0]}]"]
+    if kind == "text":
+        return [f"{out} = (get({name!r}) or ''){'' if arg[0] is None else f'[:{arg[0]}]'}"]
+    if kind == "join":
+        return [
+            f"{tmp} = get({name!r})",
+            f"{out} = ','.join({tmp}) if isinstance({tmp}, list) else str(get({name!r}, ''))",
+        ]
+    if kind == "custom":
+        return [
+            f"{tmp} = get({name!r})",
+            f"if isinstance({tmp}, dict):",
+            f"    {tmp} = {tmp}.get('value')",
+            f"{out} = '' if {tmp} is None else str({tmp})",
+        ]
+    # nested: walk dicts, anything else on the way yields the fallback
+    first, *rest = name
+    lines = [f"{tmp} = get({first!r})"]
+    for key in rest:
+        lines.append(f"{tmp} = {tmp}.get({key!r}) if isinstance({tmp}, dict) else None")
+    lines.append(f"{out} = str({tmp}) if {tmp} else {arg[0]!r}")
+    return lines
+
+
+@lru_cache(maxsize=64)
+def compile_projector(fields: tuple[str, ...]):
+    """Generated function: issue dict → list of `fields` values, same as FIELD_EXTRACTORS."""
+    namespace: dict = {}
+    body = []
+    for n, field in enumerate(fields):
+        body += _projection_code(field, f"v{n}", f"t{n}", namespace)
+    source = "\n".join(
+        [
+            "def project(i):",
+            "    get = i.get",
+            *(f"    {line}" for line in body),
+            f"    return [{', '.join(f'v{n}' for n in range(len(fields)))}]",
+        ]
+    )
+    exec(compile(source, "<projector>", "exec"), namespace)
+    return namespace["project"]
+
+
 # -- JSON parsing --------------------------------------------------------------
 
 
@@ -121,6 +247,224 @@ def parse_mcp_output(file_path: str) -> list[dict]:
     return []
 
 
+# -- Streaming JSON parsing ----------------------------------------------------
+
+CHUNK_SIZE = 1 << 16  # characters read from the file per refill
+STREAM_AUTO_BYTES = 32 * 1024 * 1024  # stream automatically above this file size
+ISSUE_LIST_KEYS = ("issues", "results", "data", "subtasks")
+
+_WS = re.compile(r"[ \t\r\n]*")
+# Longest run of complete string content: plain chars and whole escape sequences
+_STRING_RUN = re.compile(r'(?:[^"\\]+|\\["\\/bfnrt]|\\u[0-9a-fA-F]{4})*')
+_DECODER = json.JSONDecoder()
+_NUMBER_END = frozenset(",]} \t\r\n")  # what may follow a complete number
+
+
+class _JSONReader:
+    """Pull parser over a stream of text chunks.
+
+    Walks containers key by key / element by element and decodes single
+    values with ``raw_decode``, so only the value being read — not the
+    document — has to be in memory. Consumed input is dropped on refill.
+    """
+
+    def __init__(self, chunks: Iterator[str]):
+        self._chunks = chunks
+        self.buf = ""
+        self.pos = 0
+
+    def _more(self, at_least: int = 1) -> bool:
+        """Append at least `at_least` characters from the source; False at end of input."""
+        if self.pos:
+            self.buf = self.buf[self.pos :]
+            self.pos = 0
+        parts = [self.buf]
+        got = 0
+        for chunk in self._chunks:
+            parts.append(chunk)
+            got += len(chunk)
+            if got >= at_least:
+                break
+        self.buf = "".join(parts)
+        return got > 0
+
+    def peek(self) -> str:
+        """Next non-whitespace character without consuming it ('' at end of input)."""
+        while True:
+            self.pos = _WS.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._more():
+                return ""
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", self.buf, self.pos)
+        self.pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value."""
+        self.peek()
+        need = CHUNK_SIZE
+        while True:
+            try:
+                val, end = _DECODER.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._more(need):
+                    raise
+                need *= 2  # big values: grow geometrically instead of re-parsing per chunk
+                continue
+            # A number is only complete once a delimiter follows: "62544" may be "62544.8"
+            if (
+                isinstance(val, (int, float))
+                and not isinstance(val, bool)
+                and (end == len(self.buf) or self.buf[end] not in _NUMBER_END)
+                and self._more()
+            ):
+                continue
+            self.pos = end
+            return val
+
+    def members(self) -> Iterator[str]:
+        """Yield object keys; the caller must consume each value before resuming."""
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            sep = self.peek()
+            self.pos += 1
+            if sep == "}":
+                return
+            if sep != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", self.buf, self.pos - 1)
+
+    def elements(self) -> Iterator[None]:
+        """Yield once per array element; the caller must consume it before resuming."""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield
+            sep = self.peek()
+            self.pos += 1
+            if sep == "]":
+                return
+            if sep != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", self.buf, self.pos - 1)
+
+    def string_chunks(self) -> Iterator[str]:
+        """Yield the decoded contents of the next JSON string piece by piece."""
+        self.expect('"')
+        while True:
+            end = _STRING_RUN.match(self.buf, self.pos).end()
+            closed = end < len(self.buf) and self.buf[end] == '"'
+            if end > self.pos:
+                text = json.loads(f'"{self.buf[self.pos : end]}"')
+                if not closed and "\ud800" <= text[-1] <= "\udbff":
+                    # High surrogate escape at the edge: keep it for its low half
+                    text, end = text[:-1], end - 6
+                if text:
+                    yield text
+                self.pos = end
+            if closed:
+                self.pos += 1
+                return
+            if end < len(self.buf) and self.buf[end] != "\\":
+                raise json.JSONDecodeError("Invalid control character in string", self.buf, end)
+            if not self._more():
+                raise json.JSONDecodeError("Unterminated string", self.buf, self.pos)
+
+
+def _flatten(issue):
+    """Raw Jira API {key, fields: {...}} → flat {key, summary, status, ...}."""
+    if isinstance(issue, dict) and isinstance(issue.get("fields"), dict):
+        flat = {k: v for k, v in issue.items() if k != "fields"}
+        flat.update(issue["fields"])
+        return flat
+    return issue
+
+
+def _stream_issue_list(reader: _JSONReader) -> Iterator[dict]:
+    for _ in reader.elements():
+        yield _flatten(reader.value())
+
+
+def _stream_data(reader: _JSONReader) -> Iterator[dict]:
+    """Issues from a data object: the first issues-like array, or a {results: {...}} wrapper."""
+    c = reader.peek()
+    if c == "[":
+        yield from _stream_issue_list(reader)
+        return
+    if c != "{":
+        reader.value()
+        return
+    for key in reader.members():
+        c = reader.peek()
+        if key in ISSUE_LIST_KEYS and c == "[":
+            yield from _stream_issue_list(reader)
+            return
+        if key == "results" and c == "{":  # Cache server wraps in {results: {issues: [...]}}
+            yield from _stream_data(reader)
+            return
+        reader.value()
+
+
+def _stream_embedded(reader: _JSONReader) -> Iterator[dict]:
+    """Issues from a value that is either JSON-encoded text or the data itself."""
+    if reader.peek() == '"':
+        yield from _stream_data(_JSONReader(reader.string_chunks()))
+    else:
+        yield from _stream_data(reader)
+
+
+def iter_mcp_issues(file_path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[dict]:
+    """Stream issues from an MCP tool output file, one at a time.
+
+    Same formats as parse_mcp_output(), in constant memory: the inner JSON
+    string is unescaped incrementally and parsed as it is decoded. The
+    first issues array found is used; keys after it are never read.
+    """
+    with open(file_path, encoding="utf-8") as f:
+        reader = _JSONReader(iter(lambda: f.read(chunk_size), ""))
+        c = reader.peek()
+
+        # Format 1: MCP Atlassian — {"result": "JSON_STRING"}; Format 3: plain object
+        if c == "{":
+            for key in reader.members():
+                if key == "result":
+                    yield from _stream_embedded(reader)
+                    return
+                if key in ISSUE_LIST_KEYS and reader.peek() == "[":
+                    yield from _stream_issue_list(reader)
+                    return
+                reader.value()
+            return
+
+        if c != "[":
+            reader.value()  # scalar document (or a decode error for empty input)
+            return
+
+        # Format 2: Cache server — [{"type":"text", "text":"JSON_STRING"}]; else a plain list
+        first = True
+        for _ in reader.elements():
+            if first and reader.peek() == "{":
+                item = {}
+                for key in reader.members():
+                    if key == "text":
+                        yield from _stream_embedded(reader)
+                        return
+                    item[key] = reader.value()
+                yield item
+            else:
+                yield reader.value()
+            first = False
+
+
 def _extract_issues(data: dict) -> list[dict]:
     """Extract issues array from parsed data, normalizing nested fields."""
     issues = []
@@ -138,128 +482,1027 @@ def _extract_issues(data: dict) -> list[dict]:
     # Raw Jira API: {key, fields: {summary, status, ...}}
     # MCP Atlassian: {key, summary, status, ...} (already flat)
     if issues and isinstance(issues[0], dict) and "fields" in issues[0]:
-        normalized = []
-        for issue in issues:
-            flat = {k: v for k, v in issue.items() if k != "fields"}
-            if isinstance(issue.get("fields"), dict):
-                flat.update(issue["fields"])
-            normalized.append(flat)
-        return normalized
+        return [_flatten(issue) for issue in issues]
 
     return issues
 
 
+# -- Query language ------------------------------------------------------------
+#
+#   status in ("To Do", "In Progress") and start_date < 2026-11-01
+#   not assignee ~ joakim or (issuetype = Bug and sp >= 3)
+#   duedate is empty
+#
+# Fields are FIELD_EXTRACTORS names (or raw issue keys). = != in ~ are
+# case-insensitive; < <= > >= compare numerically when both sides are
+# numbers, otherwise as strings (ISO dates order correctly) and never match
+# empty values. An expression is parsed once into a tree and compiled into
+# one closure, evaluated in a single pass over issues or cache rows.
+
+
+class QueryError(ValueError):
+    """Malformed --where / --sort / --group-by / --agg expression."""
+
+
+_QUERY_TOKEN = re.compile(
+    r"""\s*(?:(?P<str>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')|(?P<op><=|>=|!=|=|<|>|~|\(|\)|,)|(?P<word>[^\s()=!<>~,"']+))"""
+)
+_COMPARE_OPS = {"=", "!=", "<", "<=", ">", ">=", "~"}
+_ORDER_OPS = {
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+}
+
+
+def _tokenize(text: str) -> list[tuple[str, str]]:
+    tokens, pos = [], 0
+    text = text.rstrip()
+    while pos < len(text):
+        m = _QUERY_TOKEN.match(text, pos)
+        if not m or m.end() == pos:
+            raise QueryError(f"Unexpected character at {pos}: {text[pos : pos + 10]!r}")
+        pos = m.end()
+        if m.group("str"):
+            tokens.append(("value", re.sub(r"\\(.)", r"\1", m.group("str")[1:-1])))
+        elif m.group("op"):
+            tokens.append(("op", m.group("op")))
+        else:
+            tokens.append(("word", m.group("word")))
+    return tokens
+
+
+class _QueryParser:
+    """Recursive descent: or → and → not → (expr) | comparison."""
+
+    def __init__(self, text: str):
+        self.tokens = _tokenize(text)
+        self.pos = 0
+
+    def parse(self) -> tuple:
+        node = self._or()
+        if self.pos < len(self.tokens):
+            raise QueryError(f"Unexpected {self.tokens[self.pos][1]!r}")
+        return node
+
+    def _peek_word(self) -> str:
+        if self.pos < len(self.tokens) and self.tokens[self.pos][0] == "word":
+            return self.tokens[self.pos][1].lower()
+        return ""
+
+    def _take(self) -> tuple[str, str]:
+        if self.pos >= len(self.tokens):
+            raise QueryError("Unexpected end of expression")
+        self.pos += 1
+        return self.tokens[self.pos - 1]
+
+    def _expect_op(self, op: str):
+        kind, val = self._take()
+        if (kind, val) != ("op", op):
+            raise QueryError(f"Expected {op!r}, got {val!r}")
+
+    def _or(self) -> tuple:
+        node = self._and()
+        while self._peek_word() == "or":
+            self.pos += 1
+            node = ("or", node, self._and())
+        return node
+
+    def _and(self) -> tuple:
+        node = self._not()
+        while self._peek_word() == "and":
+            self.pos += 1
+            node = ("and", node, self._not())
+        return node
+
+    def _not(self) -> tuple:
+        if self._peek_word() == "not":
+            self.pos += 1
+            return ("not", self._not())
+        if self.pos < len(self.tokens) and self.tokens[self.pos] == ("op", "("):
+            self.pos += 1
+            node = self._or()
+            self._expect_op(")")
+            return node
+        return self._comparison()
+
+    def _value(self) -> str:
+        kind, val = self._take()
+        if kind == "op":
+            raise QueryError(f"Expected a value, got {val!r}")
+        return val
+
+    def _comparison(self) -> tuple:
+        kind, field = self._take()
+        if kind != "word":
+            raise QueryError(f"Expected a field name, got {field!r}")
+        word = self._peek_word()
+        if word == "is":
+            self.pos += 1
+            negate = self._peek_word() == "not"
+            self.pos += negate
+            if self._peek_word() != "empty":
+                raise QueryError("Expected 'empty' after 'is'")
+            self.pos += 1
+            return ("empty", field, negate)
+        if word in ("in", "not"):
+            self.pos += 1
+            negate = word == "not"
+            if negate:
+                if self._peek_word() != "in":
+                    raise QueryError("Expected 'in' after 'not'")
+                self.pos += 1
+            self._expect_op("(")
+            values = [self._value()]
+            while self.pos < len(self.tokens) and self.tokens[self.pos] == ("op", ","):
+                self.pos += 1
+                values.append(self._value())
+            self._expect_op(")")
+            return ("in", field, tuple(values), negate)
+        kind, op = self._take()
+        if kind != "op" or op not in _COMPARE_OPS:
+            raise QueryError(f"Expected an operator after {field!r}, got {op!r}")
+        return ("cmp", field, op, self._value())
+
+
+def parse_query(text: str) -> tuple:
+    """Parse a --where expression into a tree of tuples."""
+    return _QueryParser(text).parse()
+
+
+def query_fields(node: tuple) -> set[str]:
+    """Every field an expression tree reads."""
+    if node[0] in ("and", "or"):
+        return query_fields(node[1]) | query_fields(node[2])
+    if node[0] == "not":
+        return query_fields(node[1])
+    return {node[1]}
+
+
+def _to_number(val: str) -> float | None:
+    try:
+        return float(val)
+    except (TypeError, ValueError):
+        return None
+
+
+def compile_query(node: tuple, accessor) -> callable:
+    """Compile a tree into one predicate. `accessor(field)` → callable(record) → str."""
+    kind = node[0]
+    if kind in ("and", "or"):
+        left, right = compile_query(node[1], accessor), compile_query(node[2], accessor)
+        if kind == "and":
+            return lambda r: left(r) and right(r)
+        return lambda r: left(r) or right(r)
+    if kind == "not":
+        inner = compile_query(node[1], accessor)
+        return lambda r: not inner(r)
+
+    get = accessor(node[1])
+    if kind == "empty":
+        negate = node[2]
+        return lambda r: (get(r) == "") != negate
+    if kind == "in":
+        values, negate = {v.lower() for v in node[2]}, node[3]
+        return lambda r: (get(r).lower() in values) != negate
+
+    op, value = node[2], node[3]
+    if op in ("=", "!="):
+        target, negate = value.lower(), op == "!="
+        return lambda r: (get(r).lower() == target) != negate
+    if op == "~":
+        term = value.lower()
+        return lambda r: term in get(r).lower()
+    compare = _ORDER_OPS[op]
+    number = _to_number(value)
+
+    def ordered(r):
+        x = get(r)
+        if number is not None:
+            x = _to_number(x)
+            return x is not None and compare(x, number)
+        return x != "" and compare(x, value)
+
+    return ordered
+
+
+def _issue_accessor(field: str):
+    """Value getter for raw issue dicts (extractors, filter columns, or raw keys)."""
+    extract = FIELD_EXTRACTORS.get(field) or _FILTER_COLUMNS.get(field)
+    if extract:
+        return extract
+    return lambda i: str(i.get(field, ""))
+
+
+def legacy_filter_query(
+    status: str | None = None, assignee: str | None = None, issuetype: str | None = None
+) -> tuple | None:
+    """The --status/--assignee/--issuetype options as one expression tree."""
+    parts = []
+    if status:
+        parts.append(("in", "status", tuple(s.strip() for s in status.split(",")), False))
+    if assignee:
+        parts.append(("or", ("cmp", "_assignee_display", "~", assignee), ("cmp", "_assignee_name", "~", assignee)))
+    if issuetype:
+        parts.append(("in", "issuetype", tuple(t.strip() for t in issuetype.split(",")), False))
+    return _and_all(parts)
+
+
+def _and_all(parts: list) -> tuple | None:
+    node = None
+    for part in parts:
+        node = part if node is None else ("and", node, part)
+    return node
+
+
 # -- Filtering -----------------------------------------------------------------
 
 
 def filter_issues(
-    issues: list[dict],
+    issues: Iterable[dict],
     status: str | None = None,
     assignee: str | None = None,
     issuetype: str | None = None,
-) -> list[dict]:
-    """Filter issues by criteria. Comma-separated values = OR match."""
-    result = issues
+    where: str | None = None,
+) -> Iterator[dict]:
+    """Filter issues lazily in one pass. Comma-separated values = OR match; `where` is a query expression."""
+    predicate = compile_filters(status, assignee, issuetype, where, _issue_accessor)
+    if predicate is None:
+        return iter(issues)
+    return (i for i in issues if predicate(i))
 
-    if status:
-        allowed = {s.strip().lower() for s in status.split(",")}
-        result = [i for i in result if _nested(i, "status", "name").lower() in allowed]
 
-    if assignee:
-        term = assignee.lower()
-        result = [
-            i
-            for i in result
-            if term in _nested(i, "assignee", "display_name", fallback="").lower()
-            or term in _nested(i, "assignee", "name", fallback="").lower()
-        ]
+def compile_filters(status: str | None, assignee: str | None, issuetype: str | None, where: str | None, accessor):
+    """All filter options as one predicate over records read through `accessor` (None = no filter)."""
+    node = _and_all([n for n in (legacy_filter_query(status, assignee, issuetype), where and parse_query(where)) if n])
+    return compile_query(node, accessor) if node else None
 
-    if issuetype:
-        allowed = {t.strip().lower() for t in issuetype.split(",")}
-        result = [i for i in result if _nested(i, "issuetype", "name").lower() in allowed]
 
-    return result
+# -- Sort / group-by / aggregates ---------------------------------------------
 
+_AGG_SPEC = re.compile(r"^(count|sum|avg|min|max)(?:\((\w+)\))?$")
 
-# -- Output formatters ---------------------------------------------------------
 
+def _sort_key(val: str) -> tuple:
+    """Numbers before text (numerically), text case-insensitively, empty last."""
+    if val == "":
+        return (2, 0.0, "")
+    number = _to_number(val)
+    if number is not None:
+        return (0, number, "")
+    return (1, 0.0, val.lower())
 
-def format_table(issues: list[dict], fields: list[str]) -> str:
-    """Format issues as aligned text table."""
-    if not issues:
-        return "(no issues found)"
 
-    # Build rows
-    headers = fields
+def parse_sort(spec: str) -> list[tuple[str, bool]]:
+    """'-sp,key' → [("sp", True), ("key", False)] (leading - = descending)."""
+    keys = []
+    for part in spec.split(","):
+        part = part.strip()
+        if part:
+            keys.append((part.lstrip("-"), part.startswith("-")))
+    if not keys:
+        raise QueryError(f"Empty --sort: {spec!r}")
+    return keys
+
+
+def sort_records(records: Iterable, keys: list[tuple[str, bool]], accessor) -> list:
+    """Stable multi-key sort (last key first), each key ascending or descending; empty values last."""
+    records = list(records)
+    for field, descending in reversed(keys):
+        get = accessor(field)
+        records.sort(key=lambda r: _sort_key(get(r)), reverse=descending)
+        if descending:  # reverse=True moved empty values first — stable partition back to the end
+            records = [r for r in records if get(r) != ""] + [r for r in records if get(r) == ""]
+    return records
+
+
+def parse_aggregates(spec: str) -> list[tuple[str, str | None]]:
+    """'count,sum(sp)' → [("count", None), ("sum", "sp")]."""
+    aggs = []
+    for part in re.findall(r"\w+(?:\(\w+\))?", spec):
+        m = _AGG_SPEC.match(part)
+        if not m or (m.group(1) != "count" and not m.group(2)):
+            raise QueryError(f"Unknown aggregate {part!r} (use count, sum(f), avg(f), min(f), max(f))")
+        aggs.append((m.group(1), m.group(2)))
+    if not aggs:
+        raise QueryError(f"Empty --agg: {spec!r}")
+    return aggs
+
+
+def _column_getter(columns: list[str], field: str):
+    """Getter for one column of grouped output rows."""
+    if field not in columns:
+        raise QueryError(f"Cannot sort grouped output by {field!r} (columns: {', '.join(columns)})")
+    return operator.itemgetter(columns.index(field))
+
+
+def _format_number(x: float) -> str:
+    return str(int(x)) if float(x).is_integer() else f"{x:.2f}".rstrip("0")
+
+
+def aggregate(
+    records: Iterable, group_by: list[str], aggs: list[tuple[str, str | None]], accessor
+) -> tuple[list[list[str]], list[str], int]:
+    """One pass over records → (rows, column names, records seen).
+
+    Groups keep first-seen order; sort the output with --sort on a group
+    or aggregate column name (e.g. --sort=-count).
+    """
+    group_getters = [accessor(f) for f in group_by]
+    agg_getters = [accessor(f) if f else None for _, f in aggs]
+    groups: dict[tuple, list] = {}  # key → [count, per-aggregate [sum, n, min, max]]
+    seen = 0
+    for r in records:
+        seen += 1
+        key = tuple(get(r) for get in group_getters)
+        state = groups.get(key)
+        if state is None:
+            state = groups[key] = [0, [[0.0, 0, None, None] for _ in aggs]]
+        state[0] += 1
+        for get, acc in zip(agg_getters, state[1], strict=True):
+            if get is None:
+                continue
+            val = get(r)
+            if val == "":
+                continue
+            number = _to_number(val)
+            if number is not None:
+                acc[0] += number
+                acc[1] += 1
+            k = (_sort_key(val), val)
+            if acc[2] is None or k < acc[2]:
+                acc[2] = k
+            if acc[3] is None or k > acc[3]:
+                acc[3] = k
+
+    columns = group_by + [f"{name}({field})" if field else name for name, field in aggs]
     rows = []
-    for issue in issues:
-        row = []
-        for f in fields:
-            extractor = FIELD_EXTRACTORS.get(f, lambda i, f=f: str(i.get(f, "")))
-            row.append(extractor(issue))
+    for key, (count, accs) in groups.items():
+        row = list(key)
+        for (name, _), (total, n, lo, hi) in zip(aggs, accs, strict=True):
+            if name == "count":
+                row.append(str(count))
+            elif name == "sum":
+                row.append(_format_number(total))
+            elif name == "avg":
+                row.append(_format_number(total / n) if n else "")
+            else:
+                pick = lo if name == "min" else hi
+                row.append(pick[1] if pick else "")
         rows.append(row)
+    return rows, columns, seen
+
+
+# -- Parse cache ---------------------------------------------------------------
+#
+# One sidecar file per dump (keyed by its absolute path), valid while the
+# dump's size and mtime are unchanged. It stores every FIELD_EXTRACTORS
+# column plus the lowercased filter columns, and value → row indexes for the
+# categorical filters. Columns are written in CACHE_CHUNK_ROWS pickled chunks
+# while the dump is parsed, so building the cache doesn't hold the whole dump
+# in memory; a trailing header records where each column's chunks start, and
+# a query reads only the columns it uses.
+#
+# Layout: [column chunks...] [pickled header] [header offset: 8 bytes LE] [_CACHE_MAGIC]
+
+PARSE_CACHE_DIR = Path.home() / ".cache" / "jira-generator" / "mcp-parse"
+PARSE_CACHE_VERSION = 4
+CACHE_CHUNK_ROWS = 8192  # rows buffered per column before they are written out
+_CACHE_MAGIC = b"MCPCACHE"
+
+_FILTER_COLUMNS = {
+    "_status": lambda i: _nested(i, "status", "name").lower(),
+    "_issuetype": lambda i: _nested(i, "issuetype", "name").lower(),
+    "_assignee_display": lambda i: _nested(i, "assignee", "display_name", fallback="").lower(),
+    "_assignee_name": lambda i: _nested(i, "assignee", "name", fallback="").lower(),
+    "_updated": lambda i: str(i.get("updated") or ""),  # full timestamp, for merge dedup
+}
+_INDEXED_COLUMNS = ("_status", "_issuetype")
+
+
+def _file_signature(file_path: str) -> tuple[str, int, int]:
+    st = os.stat(file_path)
+    return os.path.realpath(file_path), st.st_size, st.st_mtime_ns
+
+
+def parse_cache_path(file_path: str) -> Path:
+    digest = hashlib.sha1(os.path.realpath(file_path).encode("utf-8")).hexdigest()[:16]
+    return PARSE_CACHE_DIR / f"{digest}.pickle"
+
+
+class ParseCache:
+    """Column store of one parsed dump: count, filter indexes, columns read on first use."""
+
+    def __init__(self, f, header: dict):
+        self.count = header["count"]
+        self.indexes: dict[str, dict[str, list[int]]] = header["indexes"]
+        self._file = f
+        self._chunks: dict[str, list[int]] = header["columns"]
+        self._columns: dict[str, list[str]] = {}
+
+    def covers(self, fields: list[str]) -> bool:
+        return all(f in self._chunks for f in fields)
+
+    def column(self, name: str) -> list[str]:
+        if name not in self._columns:
+            column: list[str] = []
+            for offset in self._chunks[name]:
+                self._file.seek(offset)
+                column.extend(pickle.load(self._file))
+            self._columns[name] = column
+        return self._columns[name]
+
+    def select(self, status: str | None = None, assignee: str | None = None, issuetype: str | None = None) -> list[int]:
+        """Row numbers matching the same criteria as filter_issues(), in file order."""
+        rows: set[int] | None = None
+        for name, value in (("_status", status), ("_issuetype", issuetype)):
+            if value:
+                index = self.indexes[name]
+                hits = {r for v in {x.strip().lower() for x in value.split(",")} for r in index.get(v, ())}
+                rows = hits if rows is None else rows & hits
+        ids = sorted(rows) if rows is not None else range(self.count)
+
+        if assignee:
+            term = assignee.lower()
+            display, name = self.column("_assignee_display"), self.column("_assignee_name")
+            ids = [r for r in ids if term in display[r] or term in name[r]]
+        return list(ids)
+
+    def accessor(self, field: str):
+        """Value getter by row number, for compile_query / project."""
+        return self.column(field).__getitem__
+
 
-    # Calculate column widths
-    widths = [len(h) for h in headers]
+class _CacheBuilder:
+    """Writes cache columns to a temp file in chunks as issues stream past."""
+
+    def __init__(self, file_path: str):
+        self.extractors = {**FIELD_EXTRACTORS, **_FILTER_COLUMNS}
+        self.signature = _file_signature(file_path)
+        self.path = parse_cache_path(file_path)
+        self.tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        self.chunks: dict[str, list[int]] = {name: [] for name in self.extractors}
+        self.indexes: dict[str, dict[str, list[int]]] = {name: {} for name in _INDEXED_COLUMNS}
+        self.count = 0
+        self.complete = False
+        self.error: OSError | None = None
+        self._out = None
+
+    def collect(self, issues: Iterable[dict]) -> Iterator[dict]:
+        columns: dict[str, list[str]] = {name: [] for name in self.extractors}
+        appends = [columns[name].append for name in self.extractors]
+        extract = compile_projector(tuple(self.extractors))
+        try:
+            for issue in issues:
+                for append, value in zip(appends, extract(issue), strict=True):
+                    append(value)
+                if len(columns["key"]) >= CACHE_CHUNK_ROWS:
+                    self._flush(columns)
+                yield issue
+            self._flush(columns)
+            self.complete = True
+        finally:
+            if not self.complete:  # parse failed or the reader stopped early
+                self.discard()
+
+    def _open(self):
+        if self._out is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._out = open(self.tmp, "wb")  # noqa: SIM115 - written chunk by chunk, closed by save()/discard()
+        return self._out
+
+    def _flush(self, columns: dict[str, list[str]]):
+        if self.error is None and columns["key"]:
+            try:
+                out = self._open()
+                for name, column in columns.items():
+                    self.chunks[name].append(out.tell())
+                    pickle.dump(column, out, pickle.HIGHEST_PROTOCOL)
+            except OSError as e:
+                self.error = e  # keep parsing; save() reports it
+                self.discard()
+            for name in _INDEXED_COLUMNS:
+                index = self.indexes[name]
+                for row, value in enumerate(columns[name], self.count):
+                    index.setdefault(value, []).append(row)
+        self.count += len(columns["key"])
+        for column in columns.values():
+            column.clear()
+
+    def save(self):
+        """Append the header and move the finished cache into place."""
+        if self.error:
+            raise self.error
+        try:
+            out = self._open()  # new file when the dump had no issues
+            header = {
+                "version": PARSE_CACHE_VERSION,
+                "signature": self.signature,
+                "count": self.count,
+                "columns": self.chunks,
+                "indexes": self.indexes,
+            }
+            offset = out.tell()
+            pickle.dump(header, out, pickle.HIGHEST_PROTOCOL)
+            out.write(offset.to_bytes(8, "little") + _CACHE_MAGIC)
+            out.close()
+            self._out = None
+            os.replace(self.tmp, self.path)
+        except OSError:
+            self.discard()
+            raise
+
+    def discard(self):
+        if self._out is not None:
+            self._out.close()
+            self._out = None
+            with contextlib.suppress(OSError):
+                os.unlink(self.tmp)
+
+
+def load_parse_cache(file_path: str) -> ParseCache | None:
+    """The cache for `file_path`, or None if missing or stale."""
+    try:
+        f = open(parse_cache_path(file_path), "rb")  # noqa: SIM115 - ParseCache reads columns from it on demand
+    except OSError:
+        return None
+    header = None
+    with contextlib.suppress(OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+        f.seek(-8 - len(_CACHE_MAGIC), os.SEEK_END)
+        trailer = f.read()
+        if trailer.endswith(_CACHE_MAGIC):
+            f.seek(int.from_bytes(trailer[:8], "little"))
+            header = pickle.load(f)
+    if (
+        not isinstance(header, dict)
+        or header.get("version") != PARSE_CACHE_VERSION
+        or tuple(header.get("signature", ())) != _file_signature(file_path)
+    ):
+        f.close()
+        return None
+    return ParseCache(f, header)
+
+
+# -- Multi-file merge ----------------------------------------------------------
+#
+# Each dump is parsed in a worker process (through its own parse cache) and
+# only the columns the query needs travel back. Issues are then deduplicated
+# by key — the copy with the latest `updated` wins, ties go to the later file
+# — and the merged rows feed the same filter / sort / group / output steps.
+
+_TIMESTAMP_FORMATS = ("%Y-%m-%dT%H:%M:%S.%f%z", "%Y-%m-%dT%H:%M:%S%z", "%Y-%m-%dT%H:%M:%S.%f", "%Y-%m-%d")
+
+
+def expand_inputs(patterns: list[str]) -> list[str]:
+    """Files named by paths, globs (** recursive) or directories (their files), sorted and unique."""
+    paths: dict[str, None] = {}
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = [
+                os.path.join(pattern, name)
+                for name in os.listdir(pattern)
+                if not name.startswith(".") and os.path.isfile(os.path.join(pattern, name))
+            ]
+        elif glob.has_magic(pattern):
+            matches = [m for m in glob.glob(pattern, recursive=True) if os.path.isfile(m)]
+        else:
+            matches = [pattern]  # missing files surface as FileNotFoundError later
+        for m in sorted(matches):
+            paths.setdefault(m, None)
+    return list(paths)
+
+
+def _updated_rank(value: str) -> float:
+    """Jira `updated` timestamp → epoch seconds (-inf when empty or unparseable)."""
+    for fmt in _TIMESTAMP_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).timestamp()
+        except ValueError:
+            continue
+    return float("-inf")
+
+
+def _file_columns(path: str, fields: list[str], stream: bool, use_cache: bool) -> dict[str, list[str]]:
+    """Worker: the requested columns of one dump, from its parse cache when valid."""
+    cache = load_parse_cache(path) if use_cache else None
+    if cache and cache.covers(fields):
+        return {f: cache.column(f) for f in fields}
+
+    stream = stream or os.path.getsize(path) > STREAM_AUTO_BYTES
+    issues = iter_mcp_issues(path) if stream else parse_mcp_output(path)
+    builder = None
+    if use_cache and cache is None:
+        builder = _CacheBuilder(path)
+        issues = builder.collect(issues)
+
+    columns: dict[str, list[str]] = {f: [] for f in fields}
+    appends = [columns[f].append for f in fields]
+    for row in project(issues, fields):
+        for append, value in zip(appends, row, strict=True):
+            append(value)
+
+    if builder:
+        with contextlib.suppress(OSError):  # the cache is an optimization; the parse itself succeeded
+            builder.save()
+    return columns
+
+
+def merge_files(paths: list[str], fields: Iterable[str], jobs: int, stream: bool = False, use_cache: bool = True):
+    """Parse `paths` in parallel and merge by key. Returns (records, accessor).
+
+    Records keep the order in which keys were first seen across the files.
+    Unreadable files are reported on stderr and skipped.
+    """
+    fields = sorted(set(fields) | {"key", "_updated"})
+    if jobs > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(paths))) as pool:
+            futures = [pool.submit(_file_columns, path, fields, stream, use_cache) for path in paths]
+            outcomes = [_outcome(path, future.result) for path, future in zip(paths, futures, strict=True)]
+    else:
+        outcomes = [_outcome(path, lambda path=path: _file_columns(path, fields, stream, use_cache)) for path in paths]
+
+    best: dict[object, tuple[int, int]] = {}
+    best_rank: dict[object, float] = {}
+    for file_no, columns in enumerate(outcomes):
+        if columns is None:
+            continue
+        for row, (key, updated) in enumerate(zip(columns["key"], columns["_updated"], strict=True)):
+            ident = key or (file_no, row)  # keyless entries are never merged
+            rank = _updated_rank(updated)
+            if ident not in best or rank >= best_rank[ident]:
+                best[ident] = (file_no, row)
+                best_rank[ident] = rank
+
+    def accessor(field: str):
+        by_file = [columns[field] if columns else None for columns in outcomes]
+        return lambda r: by_file[r[0]][r[1]]
+
+    return list(best.values()), accessor
+
+
+def _outcome(path: str, result):
+    try:
+        return result()
+    except (json.JSONDecodeError, OSError, UnicodeDecodeError) as e:
+        print(f"Warning: skipped {path}: {e}", file=sys.stderr)
+        return None
+
+
+# -- Output formatters ---------------------------------------------------------
+#
+# Writers take projected rows (one list of strings per issue, in `fields`
+# order), stream them to a file object and return the number written;
+# format_* are the string-returning equivalents over issue dicts.
+
+
+def project(records: Iterable, fields: list[str], accessor=_issue_accessor) -> Iterator[list[str]]:
+    """Extract `fields` from each record (issue dicts, or cache rows with cache.accessor)."""
+    if accessor is _issue_accessor:
+        return map(compile_projector(tuple(fields)), records)
+    getters = [accessor(f) for f in fields]
+    return ([get(r) for get in getters] for r in records)
+
+
+TABLE_SAMPLE_ROWS = 200  # rows buffered to size table columns; the rest stream through
+TABLE_MAX_WIDTH = {"summary": 55, "summary_full": 80, "labels": 30}
+
+
+def write_table(rows: Iterable[list[str]], fields: list[str], out: TextIO, sample: int = TABLE_SAMPLE_ROWS) -> int:
+    """Write rows as an aligned text table.
+
+    Column widths come from the first `sample` rows (capped per TABLE_MAX_WIDTH),
+    so only those rows are buffered. A later, longer value is truncated in a
+    capped column and overflows its column otherwise — values are never cut
+    short outside the caps.
+    """
+    rows, header, format_row = _table_layout(rows, fields, sample)
+    if header is None:
+        out.write("(no issues found)")
+        return 0
+
+    out.write(header)
+    count = 0
     for row in rows:
+        out.write("\n" + format_row(row))
+        count += 1
+    return count
+
+
+def _table_layout(rows: Iterable[list[str]], fields: list[str], sample: int = TABLE_SAMPLE_ROWS):
+    """(rows, header lines, row formatter) with widths from the first `sample` rows; header None if no rows."""
+    rows = iter(rows)
+    head = list(itertools.islice(rows, sample))
+    if not head:
+        return rows, None, None
+
+    # Calculate column widths from the sample, capped to avoid overflow
+    widths = [len(h) for h in fields]
+    for row in head:
         for i, val in enumerate(row):
             widths[i] = max(widths[i], len(val))
+    caps = [TABLE_MAX_WIDTH.get(f) for f in fields]
+    widths = [min(w, cap) if cap else w for w, cap in zip(widths, caps, strict=True)]
+    cells = [(w, cap) for w, cap in zip(widths, caps, strict=True)]
+
+    header = "  ".join(h.ljust(widths[i]) for i, h in enumerate(fields)) + "\n" + "  ".join("-" * w for w in widths)
+
+    def format_row(row: list[str]) -> str:
+        return "  ".join((val[:w] if cap else val).ljust(w) for val, (w, cap) in zip(row, cells, strict=True))
 
-    # Cap widths to avoid overflow
-    max_width = {"summary": 55, "summary_full": 80, "labels": 30}
-    for i, f in enumerate(fields):
-        if f in max_width:
-            widths[i] = min(widths[i], max_width[f])
+    return itertools.chain(head, rows), header, format_row
 
-    # Format
-    lines = []
-    header_line = "  ".join(h.ljust(widths[i]) for i, h in enumerate(headers))
-    lines.append(header_line)
-    lines.append("  ".join("-" * widths[i] for i in range(len(headers))))
 
+def _json_element(row: list[str], fields: list[str]) -> str:
+    """One row as an indented element of a JSON array (same layout as json.dumps(list, indent=2))."""
+    obj = json.dumps(dict(zip(fields, row, strict=True)), ensure_ascii=False, indent=2)
+    # Not textwrap.indent: it also splits on U+2028/U+2029/U+0085 inside string values
+    return "  " + obj.replace("\n", "\n  ")
+
+
+def write_json(rows: Iterable[list[str]], fields: list[str], out: TextIO) -> int:
+    """Write filtered JSON, one array element at a time."""
+    count = 0
+    out.write("[")
     for row in rows:
-        line = "  ".join(val[: widths[i]].ljust(widths[i]) for i, val in enumerate(row))
-        lines.append(line)
+        out.write(",\n" if count else "\n")
+        out.write(_json_element(row, fields))
+        count += 1
+    out.write("\n]" if count else "]")
+    return count
+
 
-    return "\n".join(lines)
+def write_ndjson(rows: Iterable[list[str]], fields: list[str], out: TextIO) -> int:
+    """Write one compact JSON object per line (NDJSON)."""
+    count = 0
+    for row in rows:
+        out.write(json.dumps(dict(zip(fields, row, strict=True)), ensure_ascii=False) + "\n")
+        count += 1
+    return count
 
 
-def format_json(issues: list[dict], fields: list[str]) -> str:
-    """Format as filtered JSON."""
-    filtered = []
-    for issue in issues:
-        obj = {}
-        for f in fields:
-            extractor = FIELD_EXTRACTORS.get(f, lambda i, f=f: str(i.get(f, "")))
-            obj[f] = extractor(issue)
-        filtered.append(obj)
-    return json.dumps(filtered, ensure_ascii=False, indent=2)
+def write_csv(rows: Iterable[list[str]], fields: list[str], out: TextIO) -> int:
+    """Write CSV rows as they are produced."""
+    writer = csv.writer(out)
+    writer.writerow(fields)
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
 
 
-def format_csv_output(issues: list[dict], fields: list[str]) -> str:
-    """Format as CSV."""
+# -- Token-budgeted chunks -----------------------------------------------------
+#
+# --max-tokens splits the output into numbered chunks that each fit a token
+# budget, so a large result can be read back one piece at a time. Rows are
+# formatted and measured once, in a single pass; a chunk is flushed as soon
+# as the next row would not fit (a row larger than the whole budget gets a
+# chunk of its own, flagged in the index).
+
+ASCII_CHARS_PER_TOKEN = 3.5  # English / JSON / CSV text; errs towards more tokens
+CHUNK_INDEX = "index.json"
+
+
+def estimate_tokens(text: str) -> int:
+    """Fast upper-bound token estimate: ~3.5 ASCII chars per token, 1 token per non-ASCII char.
+
+    Thai (3 bytes in UTF-8) and other non-ASCII text tokenizes at roughly a
+    character per token or better; the UTF-8 length tells how much of it there is.
+    """
+    chars = len(text)
+    wide = (len(text.encode("utf-8")) - chars + 1) // 2  # Thai adds 2 bytes per char
+    return int((chars - wide) / ASCII_CHARS_PER_TOKEN + 0.999) + wide
+
+
+def _chunk_format(fmt: str, rows: Iterable[list[str]], fields: list[str]):
+    """(rows, prefix, row formatter, separator, suffix) for one chunk of `fmt` output."""
+    if fmt == "table":
+        rows, header, format_row = _table_layout(rows, fields)
+        return rows, (header or "") + "\n", format_row, "\n", ""
+    if fmt == "json":
+        return rows, "[\n", lambda row: _json_element(row, fields), ",\n", "\n]"
+    if fmt == "ndjson":
+        return rows, "", lambda row: json.dumps(dict(zip(fields, row, strict=True)), ensure_ascii=False), "\n", ""
+
     buf = io.StringIO()
-    writer = csv.writer(buf)
+    writer = csv.writer(buf, lineterminator="\n")
     writer.writerow(fields)
-    for issue in issues:
-        row = []
-        for f in fields:
-            extractor = FIELD_EXTRACTORS.get(f, lambda i, f=f: str(i.get(f, "")))
-            row.append(extractor(issue))
+    header = buf.getvalue()
+
+    def format_csv_row(row: list[str]) -> str:
+        buf.seek(0)
+        buf.truncate()
         writer.writerow(row)
+        return buf.getvalue()[:-1]
+
+    return rows, header, format_csv_row, "\n", ""
+
+
+def write_chunks(
+    rows: Iterable[list[str]], fields: list[str], fmt: str, max_tokens: int, out: TextIO, chunk_dir: str | None = None
+) -> int:
+    """Write rows as budgeted chunks: to `out` behind '# chunk N' markers, or as files + an index.
+
+    With `chunk_dir`, chunk N goes to chunk-NNN.<fmt> and CHUNK_INDEX lists
+    every chunk's file, row range and estimated tokens; `out` gets the index.
+    """
+    rows, prefix, format_row, separator, suffix = _chunk_format(fmt, rows, fields)
+    base = estimate_tokens(prefix + suffix)
+    sep_tokens = estimate_tokens(separator)
+    ext = {"table": "txt", "ndjson": "jsonl"}.get(fmt, fmt)
+    index = []
+
+    def flush(lines: list[str], tokens: int, first: int):
+        number = len(index) + 1
+        entry = {"chunk": number, "rows": [first, first + len(lines) - 1], "tokens": tokens}
+        if tokens > max_tokens:
+            entry["over_budget"] = True
+        content = prefix + separator.join(lines) + suffix
+        if chunk_dir:
+            entry["file"] = f"chunk-{number:03d}.{ext}"
+            with open(os.path.join(chunk_dir, entry["file"]), "w", encoding="utf-8") as f:
+                f.write(content + "\n")
+        else:
+            if index:
+                out.write("\n")
+            out.write(f"# chunk {number}: rows {first}-{first + len(lines) - 1}, ~{tokens} tokens\n")
+            out.write(content + "\n")
+        index.append(entry)
+
+    if chunk_dir:
+        os.makedirs(chunk_dir, exist_ok=True)
+    lines: list[str] = []
+    tokens = base
+    count = 0
+    for row in rows:
+        line = format_row(row)
+        cost = estimate_tokens(line) + (sep_tokens if lines else 0)
+        if lines and tokens + cost > max_tokens:
+            flush(lines, tokens, count - len(lines) + 1)
+            lines, tokens = [], base
+            cost = estimate_tokens(line)
+        lines.append(line)
+        tokens += cost
+        count += 1
+    if lines:
+        flush(lines, tokens, count - len(lines) + 1)
+
+    if chunk_dir:
+        summary = {"format": fmt, "fields": fields, "max_tokens": max_tokens, "rows": count, "chunks": index}
+        text = json.dumps(summary, ensure_ascii=False, indent=2)
+        with open(os.path.join(chunk_dir, CHUNK_INDEX), "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        out.write(text + "\n")
+    elif not index:
+        out.write("(no issues found)\n")
+    return count
+
+
+def _format(writer, issues: Iterable[dict], fields: list[str]) -> str:
+    buf = io.StringIO()
+    writer(project(issues, fields), fields, buf)
     return buf.getvalue()
 
 
+def format_table(issues: Iterable[dict], fields: list[str]) -> str:
+    """Format issues as aligned text table."""
+    return _format(write_table, issues, fields)
+
+
+def format_json(issues: Iterable[dict], fields: list[str]) -> str:
+    """Format as filtered JSON."""
+    return _format(write_json, issues, fields)
+
+
+def format_csv_output(issues: Iterable[dict], fields: list[str]) -> str:
+    """Format as CSV."""
+    return _format(write_csv, issues, fields)
+
+
+# -- Benchmark -----------------------------------------------------------------
+
+
+def _synthetic_issue(rng, n: int) -> dict:
+    """A search-result issue with the field shapes seen in real dumps (and some gaps)."""
+    issue = {
+        "key": f"BENCH-{n}",
+        "id": str(10000 + n),
+        "summary": rng.choice(["Add endpoint for player stats", "ทดสอบ summary text", "Fix bug"]) * rng.randint(1, 4),
+        "status": {"name": rng.choice(["To Do", "In Progress", "Done"]), "category": "new"},
+        "priority": {"name": rng.choice(["High", "Medium", "Low"])},
+        "issuetype": {"name": rng.choice(["Story", "Subtask", "Bug"])},
+        "labels": rng.choice([["backend", "api"], [], None]),
+        "duedate": rng.choice(["2026-03-27", None]),
+        "created": "2026-01-05T10:00:00.000+0700",
+        "updated": "2026-02-11T16:30:00.000+0700",
+        "customfield_10015": rng.choice(["2026-01-10", {"value": "2026-01-12"}, None]),
+        "customfield_10016": rng.choice([3, 5.0, None]),
+    }
+    if rng.random() < 0.8:
+        issue["assignee"] = {"display_name": rng.choice(["Ann", "Bob"]), "name": "ann"}
+    if rng.random() < 0.5:
+        issue["parent"] = {"key": f"BENCH-{n // 10}"}
+    return issue
+
+
+def run_benchmark(n_issues: int) -> int:
+    """Rows/sec projecting a synthetic n-issue dump: per-field extractors vs the compiled projector."""
+    import random
+    import tempfile
+    import time
+
+    rng = random.Random(42)
+    issues = [_synthetic_issue(rng, n) for n in range(n_issues)]
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+        json.dump({"result": json.dumps({"issues": issues})}, f)
+    try:
+        issues = parse_mcp_output(f.name)
+    finally:
+        os.unlink(f.name)
+
+    print(f"{'fields':>8} {'projector':>12} {'rows/sec':>12}")
+    for fields in (DEFAULT_FIELDS, sorted(FIELD_EXTRACTORS)):
+        timings = {}
+        results = {}
+        for name, run in (
+            (
+                "lookup",
+                lambda fields=fields: [[FIELD_EXTRACTORS.get(f, lambda i: "")(i) for f in fields] for i in issues],
+            ),
+            ("compiled", lambda fields=fields: list(project(issues, fields))),
+        ):
+            t0 = time.perf_counter()
+            results[name] = run()
+            timings[name] = time.perf_counter() - t0
+            print(f"{len(fields):>8} {name:>12} {n_issues / timings[name]:>12,.0f}")
+        if results["lookup"] != results["compiled"]:
+            print("MISMATCH: compiled projector differs from FIELD_EXTRACTORS", file=sys.stderr)
+            return 1
+        print(f"{'':>8} {'speedup':>12} {timings['lookup'] / timings['compiled']:>11.1f}x")
+    return 0
+
+
+def run_stream_check() -> int:
+    """Streaming parser vs json.load on documents cut at every chunk size up to 64.
+
+    Values straddle chunk boundaries at every offset: numbers cut before
+    their fraction or exponent, escapes, surrogate pairs, nested strings.
+    """
+    import random
+    import tempfile
+
+    rng = random.Random(7)
+    issues = [_synthetic_issue(rng, n) for n in range(20)]
+    issues[1].update({"sp": 62544.8, "ratio": -1.5e-3, "big": 1e10, "tricky": 'a"b\\c\u2028\ud83d\ude00é'})
+    data = {"total": 62544.8, "startAt": 0, "issues": issues}
+    documents = {
+        "plain": {"a": 62544.8, "result": data},
+        "result string": {"result": json.dumps(data)},
+        "cache server": [{"type": "text", "text": json.dumps(data, ensure_ascii=False)}],
+    }
+    failures = 0
+    for name, doc in documents.items():
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False, encoding="utf-8") as f:
+            json.dump(doc, f)
+        try:
+            expected = parse_mcp_output(f.name)
+            bad = []
+            for chunk_size in [*range(1, 65), CHUNK_SIZE]:
+                try:
+                    if list(iter_mcp_issues(f.name, chunk_size)) != expected:
+                        bad.append(str(chunk_size))
+                except json.JSONDecodeError:
+                    bad.append(f"{chunk_size} (error)")
+        finally:
+            os.unlink(f.name)
+        print(f"{name:>14}: {'OK' if not bad else 'MISMATCH at chunk sizes ' + ', '.join(bad)}")
+        failures += bool(bad)
+    return 1 if failures else 0
+
+
 # -- Main ----------------------------------------------------------------------
 
 
 def main():
+    if "--check-stream" in sys.argv:
+        sys.exit(run_stream_check())
+    if "--benchmark" in sys.argv:
+        idx = sys.argv.index("--benchmark")
+        size = int(sys.argv[idx + 1]) if idx + 1 < len(sys.argv) else 100_000
+        sys.exit(run_benchmark(size))
+
     parser = argparse.ArgumentParser(
         description="Parse large MCP tool outputs into readable tables",
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog=__doc__,
     )
-    parser.add_argument("file", help="Path to MCP tool output file")
+    parser.add_argument(
+        "files",
+        nargs="+",
+        metavar="file",
+        help="MCP tool output file(s); globs and directories are expanded and merged by key",
+    )
     parser.add_argument(
         "--fields",
         "-f",
@@ -272,40 +1515,138 @@ def main():
     parser.add_argument("--issuetype", "-t", help="Filter by issue type (comma-separated)")
     parser.add_argument("--json", "-j", action="store_true", help="Output as JSON")
     parser.add_argument("--csv", action="store_true", help="Output as CSV")
+    parser.add_argument("--ndjson", action="store_true", help="Output one JSON object per line")
     parser.add_argument("--count", "-c", action="store_true", help="Show count only")
+    parser.add_argument("--where", "-w", help="Query expression, e.g. 'status in (\"To Do\", Bug) and sp >= 3'")
+    parser.add_argument("--sort", help="Comma-separated sort fields, '-' prefix = descending (e.g. --sort=-sp,key)")
+    parser.add_argument("--group-by", "-g", help="Comma-separated fields to group by")
+    parser.add_argument("--agg", help="Aggregates per group: count,sum(f),avg(f),min(f),max(f) (default: count)")
+    parser.add_argument("--limit", "-n", type=int, help="Output at most N rows (after sorting)")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help=f"Parse incrementally in constant memory (automatic above {STREAM_AUTO_BYTES // (1024 * 1024)}MB)",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and don't write the parse cache")
+    parser.add_argument("--max-tokens", type=int, help="Split output into chunks of at most N (estimated) tokens")
+    parser.add_argument("--chunk-dir", help="With --max-tokens: write chunk files + index.json here instead of stdout")
+    parser.add_argument(
+        "--jobs", type=int, default=os.cpu_count() or 1, help="Worker processes when merging several files"
+    )
 
     args = parser.parse_args()
+    fields = [f.strip() for f in args.fields.split(",")]
+    if args.max_tokens is not None and args.max_tokens <= 0:
+        parser.error("--max-tokens must be positive")
+    if args.chunk_dir and args.max_tokens is None:
+        parser.error("--chunk-dir requires --max-tokens")
 
-    # Parse
     try:
-        issues = parse_mcp_output(args.file)
-    except (json.JSONDecodeError, FileNotFoundError) as e:
-        print(f"Error: {e}", file=sys.stderr)
+        where = parse_query(args.where) if args.where else None
+        sort_keys = parse_sort(args.sort) if args.sort else []
+        group_by = [g.strip() for g in args.group_by.split(",") if g.strip()] if args.group_by else []
+        aggs = parse_aggregates(args.agg) if args.agg else ([("count", None)] if group_by else [])
+    except QueryError as e:
+        parser.error(str(e))
+    grouped = bool(group_by or aggs)
+
+    # Every field a record has to provide (grouped output is sorted by its own columns)
+    needed = set(group_by) | {f for _, f in aggs if f} | (query_fields(where) if where else set())
+    if not grouped:
+        needed |= {f for f, _ in sort_keys} | (set() if args.count else set(fields))
+
+    paths = expand_inputs(args.files)
+    if not paths:
+        print(f"Error: no files match {' '.join(args.files)}", file=sys.stderr)
         sys.exit(1)
+    multi = len(paths) > 1
+    file_path = paths[0]
 
-    # Filter
-    issues = filter_issues(
-        issues,
-        status=args.status,
-        assignee=args.assignee,
-        issuetype=args.issuetype,
-    )
+    try:
+        cache = None if args.no_cache or multi else load_parse_cache(file_path)
+        builder = None
 
-    # Count
-    print(f"# {len(issues)} issues", file=sys.stderr)
+        if multi:
+            # Parse each file in a worker, merge by key (latest `updated` wins), then filter
+            legacy = legacy_filter_query(args.status, args.assignee, args.issuetype)
+            columns = needed | (query_fields(legacy) if legacy else set())
+            records, accessor = merge_files(paths, columns, args.jobs, args.stream, not args.no_cache)
+            predicate = compile_filters(args.status, args.assignee, args.issuetype, args.where, accessor)
+            if predicate:
+                records = [r for r in records if predicate(r)]
+        elif cache and cache.covers(needed):
+            # Cached: filter on the indexes, unpickle only the columns the query reads
+            records = cache.select(status=args.status, assignee=args.assignee, issuetype=args.issuetype)
+            accessor = cache.accessor
+            if where:
+                predicate = compile_query(where, accessor)
+                records = [r for r in records if predicate(r)]
+        else:
+            # Parse
+            stream = args.stream or os.path.getsize(file_path) > STREAM_AUTO_BYTES
+            issues = iter_mcp_issues(file_path) if stream else parse_mcp_output(file_path)
+            if not args.no_cache and cache is None:
+                builder = _CacheBuilder(file_path)
+                issues = builder.collect(issues)
 
-    if args.count:
-        sys.exit(0)
+            # Filter (one compiled predicate, single pass)
+            records = filter_issues(
+                issues,
+                status=args.status,
+                assignee=args.assignee,
+                issuetype=args.issuetype,
+                where=args.where,
+            )
+            accessor = _issue_accessor
 
-    # Format
-    fields = [f.strip() for f in args.fields.split(",")]
+        if grouped:
+            rows, fields, matched = aggregate(records, group_by, aggs, accessor)
+            if sort_keys:
+                rows = sort_records(rows, sort_keys, lambda f: _column_getter(fields, f))
+        else:
+            if sort_keys:
+                records = sort_records(records, sort_keys, accessor)
+            rows = records if args.count else project(records, fields, accessor)
+        if args.limit is not None:
+            rows = itertools.islice(rows, max(args.limit, 0))
+
+        # Format (rows are written as they are parsed; the table buffers only its width sample)
+        if args.count:
+            count = len(rows) if isinstance(rows, list) else sum(1 for _ in rows)
+        elif args.max_tokens:
+            fmt = "ndjson" if args.ndjson else "json" if args.json else "csv" if args.csv else "table"
+            count = write_chunks(rows, fields, fmt, args.max_tokens, sys.stdout, args.chunk_dir)
+        elif args.ndjson:
+            count = write_ndjson(rows, fields, sys.stdout)
+        elif args.json:
+            count = write_json(rows, fields, sys.stdout)
+        elif args.csv:
+            count = write_csv(rows, fields, sys.stdout)
+        else:
+            count = write_table(rows, fields, sys.stdout)
+    except (json.JSONDecodeError, FileNotFoundError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    except BrokenPipeError:
+        # Reader went away (e.g. `| head`): stop quietly, and keep the interpreter's
+        # final stdout flush from raising again
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(0)
+    except QueryError as e:
+        parser.error(str(e))
 
-    if args.json:
-        print(format_json(issues, fields))
-    elif args.csv:
-        print(format_csv_output(issues, fields))
+    if not (args.count or args.ndjson or args.max_tokens):
+        print()
+    if grouped:
+        print(f"# {matched} issues in {count} groups", file=sys.stderr)
     else:
-        print(format_table(issues, fields))
+        print(f"# {count} issues", file=sys.stderr)
+
+    if builder and builder.complete:
+        try:
+            builder.save()
+        except OSError as e:
+            print(f"Warning: parse cache not written: {e}", file=sys.stderr)
 
 
 if __name__ == "__main__":
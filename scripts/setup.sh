@@ -114,13 +114,15 @@ fi
 # --- 4. Configure git smudge/clean filter ---
 echo ""
 echo "[4/4] Configuring git filters..."
-CURRENT_SMUDGE=$(cd "$PROJECT_DIR" && git config --get filter.project-config.smudge 2>/dev/null || true)
-EXPECTED_SMUDGE="python3 scripts/git-filter.py --smudge"
+CURRENT_PROCESS=$(cd "$PROJECT_DIR" && git config --get filter.project-config.process 2>/dev/null || true)
+EXPECTED_PROCESS="python3 scripts/git-filter.py --process"
 
-if [ "$CURRENT_SMUDGE" = "$EXPECTED_SMUDGE" ]; then
+if [ "$CURRENT_PROCESS" = "$EXPECTED_PROCESS" ]; then
   echo "  already configured"
 else
   cd "$PROJECT_DIR"
+  # process: one long-running filter per git command; smudge/clean: fallback for older git
+  git config filter.project-config.process "$EXPECTED_PROCESS"
   git config filter.project-config.smudge "python3 scripts/git-filter.py --smudge"
   git config filter.project-config.clean "python3 scripts/git-filter.py --clean"
   echo "  configured (auto placeholder conversion)"
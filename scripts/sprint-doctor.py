@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""Daily sprint hygiene in one pass: alignment + estimation + ranking.
+
+Combines sprint-subtask-alignment.py, sprint-set-fields.py and
+sprint-rank-by-date.py:
+1. Fetch the sprint ONCE with the union of fields all three need
+2. Run the three analyses in memory
+3. Merge every field change for a key into a single update_fields call
+4. Re-rank the board (minimal moves) using the post-fix due dates
+
+Subtasks inherit their parent's sprint, so the sprint fetch already contains
+them — no separate `parent in (...)` queries are needed.
+
+Usage:
+    python3 scripts/sprint-doctor.py                          # dry-run active sprint
+    python3 scripts/sprint-doctor.py --sprint 640             # dry-run specific sprint
+    python3 scripts/sprint-doctor.py --sprint 640 --apply     # update fields, then re-rank
+    python3 scripts/sprint-doctor.py --apply --force          # overwrite existing SP/OE from Size
+    python3 scripts/sprint-doctor.py --apply --no-rank        # skip board re-ranking
+    python3 scripts/sprint-doctor.py --no-cache               # bypass the local sprint snapshot
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / ".claude/skills/atlassian-scripts"))
+
+from common.alignment import PARENT_FIELDS, SUBTASK_FIELDS, analyze_alignment, collect_parents
+from common.estimation import ESTIMATION_FIELDS, estimation_fixes
+from common.invalidation import invalidate_snapshot, invalidation_summary
+from common.issue import parse_issues
+from common.ranking import RANK_FIELDS, plan_rank_moves, rank_candidates, rank_run, sort_for_rank
+from common.snapshot import SnapshotCache, fetch_sprint_issues
+from common.sprint import SKIP_STATUSES, find_active_sprint
+from common.transport import PooledJiraAPI
+from common.updates import DEFAULT_WORKERS, apply_fixes, merge_updates
+from lib.auth import create_ssl_context, get_auth_header, load_credentials
+from lib.jira_api import derive_jira_url
+
+
+def union_fields(*field_lists: str) -> str:
+    """Merge comma-separated field lists, keeping first-seen order."""
+    return ",".join(dict.fromkeys(f for fields in field_lists for f in fields.split(",")))
+
+
+DOCTOR_FIELDS = union_fields(PARENT_FIELDS, SUBTASK_FIELDS, ESTIMATION_FIELDS, RANK_FIELDS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sprint alignment + estimation + ranking from a single fetch")
+    parser.add_argument("--sprint", type=int, help="Sprint ID (default: active sprint)")
+    parser.add_argument("--apply", action="store_true", help="Actually update Jira (default: dry-run)")
+    parser.add_argument("--force", action="store_true", help="Overwrite existing SP/OE values from Size")
+    parser.add_argument("--no-rank", action="store_true", help="Skip board re-ranking")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the local sprint snapshot")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Concurrent update requests")
+    args = parser.parse_args()
+
+    dry_run = not args.apply
+    if dry_run:
+        print("🔍 DRY RUN — use --apply to actually update Jira\n")
+    else:
+        print("⚡ APPLY MODE — updating Jira\n")
+
+    # Connect
+    creds = load_credentials()
+    api = PooledJiraAPI(
+        base_url=derive_jira_url(creds["CONFLUENCE_URL"]),
+        auth_header=get_auth_header(creds["CONFLUENCE_USERNAME"], creds["CONFLUENCE_API_TOKEN"]),
+        ssl_context=create_ssl_context(),
+    )
+
+    sprint_id = args.sprint
+    if not sprint_id:
+        active = find_active_sprint(api)
+        if not active:
+            print("❌ No active sprint found. Use --sprint <id>")
+            return 1
+        sprint_id, sprint_name = active
+        print(f"Auto-detected active sprint: {sprint_name} (ID: {sprint_id})")
+
+    # --- Single fetch ---
+    # Dry runs read through the local snapshot. --apply refreshes it, and skips it
+    # entirely when re-ranking (ranking needs the live board order).
+    cache = None if args.no_cache or (args.apply and not args.no_rank) else SnapshotCache()
+    issues = parse_issues(fetch_sprint_issues(api, sprint_id, DOCTOR_FIELDS, cache, ttl=None if dry_run else 0))
+    parents = collect_parents(issues)
+    active_subtasks = [i for i in issues if i.parent in parents and i.status not in SKIP_STATUSES]
+    print(f"Fetched {len(issues)} issues: {len(parents)} active parents, {len(active_subtasks)} active subtasks\n")
+
+    # --- Analyses ---
+    date_violations, missing_dates, missing_oe, align_fixes = analyze_alignment(parents, active_subtasks)
+    est_fixes = estimation_fixes(issues, force=args.force)
+    # Size-derived estimates win over keyword-guessed OE for the same key
+    updates = merge_updates(align_fixes, est_fixes)
+
+    moves = []
+    if not args.no_rank:
+        # Rank on the due dates the board will have after the updates land
+        planned_due = {key: fields["duedate"] for key, fields, _ in updates if "duedate" in fields}
+        candidates = rank_candidates(issues)
+        target = sort_for_rank(candidates, due_overrides=planned_due)
+        moves = plan_rank_moves([p.key for p in candidates], [p.key for p in target])
+
+    # --- Report ---
+    print("=" * 70)
+    print("SPRINT DOCTOR REPORT")
+    print("=" * 70)
+    print(
+        f"  Alignment: {len(date_violations)} date violations, {len(missing_dates)} missing dates, "
+        f"{len(missing_oe)} missing OE → {len(align_fixes)} fixes"
+    )
+    print(f"  Estimation: {len(est_fixes)} SP/OE from Size")
+    print(f"  Ranking: {sum(len(k) for k, _, _ in moves)} issues to move in {len(moves)} rank calls")
+    print(f"  Merged: {len(updates)} update_fields calls (from {len(align_fixes) + len(est_fixes)} changes)\n")
+
+    for key, fields, reason in updates:
+        field_desc = ", ".join(f"{k}={v}" for k, v in fields.items())
+        print(f"→ {key:<10} | {reason:<24} | {field_desc}")
+    for keys, after, before in moves:
+        anchor = f"after {after}" if after else f"before {before}"
+        print(f"↕ {', '.join(keys)} {anchor}")
+
+    if dry_run:
+        print(f"\n📋 Would send {len(updates)} updates + {len(moves)} rank calls. Use --apply to execute.")
+        return 0
+
+    # --- Apply: field updates first, then ranking ---
+    errors = []
+    if updates:
+        print(f"\n⚡ Applying {len(updates)} updates ({args.workers} workers)...")
+        _, update_errors = apply_fixes(api, updates, args.workers)
+        errors.extend(update_errors)
+
+    if moves:
+        print(f"\n⚡ Re-ranking ({len(moves)} calls)...")
+        for keys, after, before in moves:
+            try:
+                rank_run(api, keys, after, before)
+                print(f"  ✅ {', '.join(keys)}")
+            except Exception as e:
+                print(f"  ❌ {', '.join(keys)}: {e}")
+                errors.append(f"{', '.join(keys)}: {e}")
+
+    if api.mutations:
+        invalidate_snapshot(api.mutations, cache or SnapshotCache())
+        print("\n🔄 " + invalidation_summary(api.mutations, [sprint_id]))
+
+    stats = api.pool.stats()
+    print(f"\n{'=' * 70}")
+    print(
+        f"Summary: {len(updates)} updates, {len(moves)} rank calls, {len(errors)} errors "
+        f"({stats['requests']} requests total)"
+    )
+    if errors:
+        print("\nErrors:")
+        for e in errors:
+            print(f"  ❌ {e}")
+
+    return 0 if not errors else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,12 +5,15 @@ Sorts all parent issues (Story/Task/Bug) in a sprint by:
 1. Due date (ascending — earliest first)
 2. Priority (Highest → Lowest)
 
-This changes the actual board/backlog ordering in Jira.
+This changes the actual board/backlog ordering in Jira. Only issues that are
+out of place move: the longest run already in target order (LIS) stays put,
+and the rest are ranked in contiguous groups of up to 50 per call.
 
 Usage:
     python3 scripts/sprint-rank-by-date.py                    # dry-run active sprint
     python3 scripts/sprint-rank-by-date.py --sprint 640       # dry-run specific sprint
     python3 scripts/sprint-rank-by-date.py --apply            # actually re-rank in Jira
+    python3 scripts/sprint-rank-by-date.py --no-cache         # dry-run without the local sprint snapshot
 """
 
 import os
@@ -18,16 +21,14 @@ import sys
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".claude", "skills", "atlassian-scripts"))
 
+from common.invalidation import invalidate_snapshot, invalidation_summary
+from common.issue import parse_issues
+from common.ranking import RANK_FIELDS, plan_rank_moves, rank_candidates, rank_run, sort_for_rank
+from common.snapshot import SnapshotCache, fetch_sprint_issues
+from common.sprint import BOARD_ID
+from common.transport import PooledJiraAPI
 from lib.auth import create_ssl_context, get_auth_header, load_credentials
-from lib.jira_api import JiraAPI, derive_jira_url
-
-# --- Configuration ---
-BOARD_ID = 2  # BEP board
-SKIP_STATUSES = {"Done", "CANCELED"}
-PARENT_TYPES = {"Story", "Task", "Bug"}
-
-# Priority ordering (lower number = higher priority = ranked first)
-PRIORITY_ORDER = {"Highest": 1, "High": 2, "Medium": 3, "Low": 4, "Lowest": 5}
+from lib.jira_api import derive_jira_url
 
 
 def main():
@@ -46,7 +47,7 @@ def main():
 
     # Connect
     creds = load_credentials()
-    api = JiraAPI(
+    api = PooledJiraAPI(
         base_url=derive_jira_url(creds["CONFLUENCE_URL"]),
         auth_header=get_auth_header(creds["CONFLUENCE_USERNAME"], creds["CONFLUENCE_API_TOKEN"]),
         ssl_context=create_ssl_context(),
@@ -64,41 +65,10 @@ def main():
             print("❌ No active sprint found. Use --sprint <id>")
             return 1
 
-    # Fetch sprint issues
-    fields = "summary,status,issuetype,priority,duedate,assignee"
-    result = api.get_sprint_issues(sprint_id, fields=fields, max_results=50)
-    all_issues = result.get("issues", [])
-
-    # Filter to active parent issues only
-    parents = []
-    for issue in all_issues:
-        f = issue.get("fields", {})
-        status = f.get("status", {}).get("name", "?")
-        itype = f.get("issuetype", {}).get("name", "?")
-
-        if status in SKIP_STATUSES:
-            continue
-        if itype not in PARENT_TYPES:
-            continue
-
-        due = f.get("duedate") or "9999-12-31"
-        priority_name = (f.get("priority") or {}).get("name", "Medium")
-        priority_rank = PRIORITY_ORDER.get(priority_name, 3)
-        assignee = (f.get("assignee") or {}).get("displayName", "Unassigned")
-
-        parents.append(
-            {
-                "key": issue["key"],
-                "summary": f.get("summary", ""),
-                "status": status,
-                "type": itype,
-                "due": due,
-                "priority": priority_name,
-                "priority_rank": priority_rank,
-                "assignee": assignee,
-            }
-        )
-
+    # Fetch sprint issues — active parents in current board order.
+    # --apply needs the live rank order, so only dry runs read the snapshot.
+    cache = SnapshotCache() if dry_run and "--no-cache" not in sys.argv else None
+    parents = rank_candidates(parse_issues(fetch_sprint_issues(api, sprint_id, RANK_FIELDS, cache)))
     print(f"\nFound {len(parents)} active parent issues\n")
 
     if len(parents) < 2:
@@ -106,37 +76,49 @@ def main():
         return 0
 
     # Sort by due date ASC, then priority rank ASC (Highest=1 first)
-    sorted_parents = sorted(parents, key=lambda x: (x["due"], x["priority_rank"]))
+    sorted_parents = sort_for_rank(parents)
 
     # Display sorted order
     print(f"{'#':<3} {'Key':<12} {'Due':<12} {'Priority':<10} {'Status':<16} {'Summary'}")
     print("-" * 100)
     for i, p in enumerate(sorted_parents, 1):
-        due_display = p["due"] if p["due"] != "9999-12-31" else "NO DATE"
-        print(f"{i:<3} {p['key']:<12} {due_display:<12} {p['priority']:<10} {p['status']:<16} {p['summary'][:50]}")
+        print(f"{i:<3} {p.key:<12} {p.due or 'NO DATE':<12} {p.priority:<10} {p.status:<16} {p.summary[:50]}")
+
+    # Plan minimal moves against the current board order
+    moves = plan_rank_moves([p.key for p in parents], [p.key for p in sorted_parents])
+    to_move = sum(len(keys) for keys, _, _ in moves)
+
+    if not moves:
+        print("\n✅ Board already in target order — nothing to re-rank.")
+        return 0
 
     if dry_run:
-        print(f"\n📋 Would re-rank {len(sorted_parents)} issues in this order.")
+        print(f"\n📋 Would move {to_move}/{len(sorted_parents)} issues in {len(moves)} rank calls:")
+        for keys, after, before in moves:
+            anchor = f"after {after}" if after else f"before {before}"
+            print(f"  → {', '.join(keys)} {anchor}")
         print("Use --apply to execute.")
         return 0
 
-    # Apply ranking: rank each issue after the previous one
-    print(f"\n⚡ Re-ranking {len(sorted_parents)} issues...")
+    print(f"\n⚡ Moving {to_move}/{len(sorted_parents)} issues in {len(moves)} rank calls...")
     errors = []
+    ranked = 0
 
-    for i in range(1, len(sorted_parents)):
-        current_key = sorted_parents[i]["key"]
-        prev_key = sorted_parents[i - 1]["key"]
-
+    for keys, after, before in moves:
+        anchor = f"after {after}" if after else f"before {before}"
         try:
-            api.rank_issues([current_key], rank_after_key=prev_key)
-            print(f"  ✅ {current_key} ranked after {prev_key}")
+            rank_run(api, keys, after, before)
+            ranked += len(keys)
+            print(f"  ✅ {', '.join(keys)} ranked {anchor}")
         except Exception as e:
-            print(f"  ❌ {current_key}: {e}")
-            errors.append(f"{current_key}: {e}")
+            print(f"  ❌ {', '.join(keys)}: {e}")
+            errors.append(f"{', '.join(keys)}: {e}")
+
+    if api.mutations:
+        invalidate_snapshot(api.mutations, SnapshotCache())
+        print("\n🔄 " + invalidation_summary(api.mutations, [sprint_id]))
 
     # Summary
-    ranked = len(sorted_parents) - 1 - len(errors)
     print(f"\n{'=' * 60}")
     print(f"Summary: {ranked} ranked, {len(errors)} errors")
 
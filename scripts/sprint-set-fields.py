@@ -11,6 +11,7 @@ Usage:
     python3 scripts/sprint-set-fields.py --sprint 673
     python3 scripts/sprint-set-fields.py --sprint 673 --apply
     python3 scripts/sprint-set-fields.py --sprint 673 --force
+    python3 scripts/sprint-set-fields.py --sprint 673 --no-cache   # bypass the local sprint snapshot
 """
 
 import argparse
@@ -19,40 +20,14 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent / ".claude/skills/atlassian-scripts"))
 
+from common.estimation import ESTIMATION_FIELDS, extract_size_letter, plan_estimate
+from common.invalidation import invalidate_snapshot, invalidation_summary
+from common.issue import parse_issues
+from common.snapshot import SnapshotCache, fetch_sprint_issues
+from common.sprint import SKIP_STATUSES
+from common.transport import PooledJiraAPI
 from lib.auth import create_ssl_context, get_auth_header, load_credentials
-from lib.jira_api import JiraAPI, derive_jira_url
-
-# --- Mappings ---
-SIZE_TO_SP = {"XS": 1, "S": 2, "M": 3, "L": 5, "XL": 8}
-SIZE_TO_HOURS = {"XS": "2h", "S": "4h", "M": "8h", "L": "16h", "XL": "32h"}
-
-SKIP_STATUSES = {"Done", "CANCELED"}
-
-FIELDS = "summary,status,issuetype,parent,customfield_10016,customfield_10107,timetracking"
-
-
-def extract_size_letter(size_value: str | None) -> str | None:
-    """Extract size letter from Jira value like 'M (1-2 days)'."""
-    if not size_value:
-        return None
-    token = size_value.strip().split()[0].upper()
-    return token if token in SIZE_TO_SP else None
-
-
-def fetch_all_sprint_issues(api: JiraAPI, sprint_id: int) -> list[dict]:
-    """Fetch all issues in a sprint with pagination."""
-    issues = []
-    start_at = 0
-    while True:
-        result = api.get_sprint_issues(sprint_id, fields=FIELDS, max_results=50, start_at=start_at)
-        batch = result.get("issues", [])
-        if not batch:
-            break
-        issues.extend(batch)
-        if len(batch) < 50:
-            break
-        start_at += len(batch)
-    return issues
+from lib.jira_api import derive_jira_url
 
 
 def main():
@@ -60,6 +35,7 @@ def main():
     parser.add_argument("--sprint", required=True, type=int, help="Sprint ID (e.g., 673)")
     parser.add_argument("--apply", action="store_true", help="Actually update Jira (default: dry-run)")
     parser.add_argument("--force", action="store_true", help="Overwrite existing SP/OE values")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the local sprint snapshot")
     args = parser.parse_args()
 
     dry_run = not args.apply
@@ -71,14 +47,16 @@ def main():
 
     # Connect
     creds = load_credentials()
-    api = JiraAPI(
+    api = PooledJiraAPI(
         base_url=derive_jira_url(creds["CONFLUENCE_URL"]),
         auth_header=get_auth_header(creds["CONFLUENCE_USERNAME"], creds["CONFLUENCE_API_TOKEN"]),
         ssl_context=create_ssl_context(),
     )
 
     # Fetch
-    issues = fetch_all_sprint_issues(api, args.sprint)
+    # Dry runs read through the local snapshot; --apply always refreshes it first
+    cache = None if args.no_cache else SnapshotCache()
+    issues = parse_issues(fetch_sprint_issues(api, args.sprint, ESTIMATION_FIELDS, cache, ttl=None if dry_run else 0))
     print(f"Found {len(issues)} issues in sprint {args.sprint}\n")
 
     updated = []
@@ -86,40 +64,17 @@ def main():
     errors = []
 
     for issue in issues:
-        key = issue.get("key", "?")
-        f = issue.get("fields", {})
-        status = f.get("status", {}).get("name", "?")
-        issue_type = f.get("issuetype", {}).get("name", "?")
-        summary = f.get("summary", "")[:60]
-        parent = f.get("parent", {})
-        is_subtask = bool(parent and parent.get("key"))
+        key = issue.key
+        status = issue.status
+        issue_type = issue.type
+        summary = issue.summary[:60]
 
         if status in SKIP_STATUSES:
             skipped.append(f"{key} ({status})")
             continue
 
-        # Current values
-        sp = f.get("customfield_10016")
-        size_obj = f.get("customfield_10107")
-        size_value = size_obj.get("value") if isinstance(size_obj, dict) else size_obj
-        size_letter = extract_size_letter(size_value)
-
-        tt = f.get("timetracking", {}) or {}
-        original_est = tt.get("originalEstimate")
-
-        # Subtask-level: has parent and not Story/Bug
-        is_subtask_level = is_subtask and issue_type not in ("Story", "Bug")
-
-        update_fields = {}
-
-        if is_subtask_level:
-            if size_letter and (not original_est or args.force):
-                hours = SIZE_TO_HOURS.get(size_letter)
-                if hours:
-                    update_fields["timetracking"] = {"originalEstimate": hours}
-        else:
-            if size_letter and (not sp or args.force):
-                update_fields["customfield_10016"] = SIZE_TO_SP[size_letter]
+        size_letter = extract_size_letter(issue.size)
+        update_fields = plan_estimate(issue, force=args.force)
 
         if not update_fields:
             skipped.append(f"{key} (no update needed)")
@@ -155,8 +110,9 @@ def main():
         for e in errors:
             print(f"  {e}")
 
-    if not dry_run and updated:
-        print("\nRemember: cache_invalidate after this!")
+    if not dry_run and api.mutations:
+        invalidate_snapshot(api.mutations, cache or SnapshotCache())
+        print("\n" + invalidation_summary(api.mutations, [args.sprint]))
 
     return 0 if not errors else 1
 
@@ -15,100 +15,101 @@ Usage:
     python3 scripts/sprint-subtask-alignment.py                    # dry-run current active sprint
     python3 scripts/sprint-subtask-alignment.py --sprint 640       # dry-run specific sprint
     python3 scripts/sprint-subtask-alignment.py --apply            # actually update Jira
+    python3 scripts/sprint-subtask-alignment.py --apply --workers 8  # fetch/update with 8 concurrent requests
     python3 scripts/sprint-subtask-alignment.py --report-only      # report without fix suggestions
+    python3 scripts/sprint-subtask-alignment.py --no-cache         # bypass the local sprint snapshot
+    python3 scripts/sprint-subtask-alignment.py --benchmark 10000  # time analysis on synthetic subtasks (offline)
 """
 
 import os
-import re
 import sys
-from datetime import datetime, timedelta
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".claude", "skills", "atlassian-scripts"))
 
+from common.alignment import PARENT_FIELDS, SUBTASK_FIELDS, analyze_alignment, collect_parents, estimate_oe
+from common.hierarchy import load_children
+from common.invalidation import invalidate_snapshot, invalidation_summary
+from common.issue import Issue, parse_issues
+from common.snapshot import SnapshotCache, fetch_sprint_issues
+from common.sprint import BOARD_ID, PRIORITY_ORDER, SKIP_STATUSES
+from common.transport import PooledJiraAPI
+from common.updates import DEFAULT_WORKERS, apply_fixes
 from lib.auth import create_ssl_context, get_auth_header, load_credentials
-from lib.jira_api import JiraAPI, derive_jira_url
-
-# --- Configuration ---
-BOARD_ID = 2  # BEP board
-SKIP_STATUSES = {"Done", "CANCELED"}
-PARENT_TYPES = {"Story", "Task", "Bug"}
-
-# Priority ordering (lower number = higher priority = gets earlier dates)
-PRIORITY_ORDER = {"Highest": 1, "High": 2, "Medium": 3, "Low": 4, "Lowest": 5}
-
-# Size → Hours mapping (for subtask OE estimation when parent has Size)
-PARENT_SIZE_TO_SUBTASK_DEFAULT = {"XS": "2h", "S": "4h", "M": "4h", "L": "4h", "XL": "8h"}
-
-# Keyword-based OE estimation for subtasks
-OE_PATTERNS = [
-    (r"migration|schema|table", "2h"),
-    (r"enum|hook|toast|tab|routing|button|action|empty.?state|tag|filter", "2h"),
-    (r"recheck|combine|review|audit", "2h"),
-    (r"transformer|adapter|mapper", "2h"),
-    (r"test|qa|spec", "4h"),
-    (r"route.*controller|controller.*route|endpoint", "4h"),
-    (r"usecase|repository|service", "4h"),
-    (r"api.?integration|connect.*api|เชื่อมต่อ", "4h"),
-    (r"component|layout|sidebar|drawer|panel|card|list|form", "4h"),
-    (r"redlock|lock|race.?condition|security", "4h"),
-    (r"loading|error.?state|success.?state|handle.*state", "2h"),
-    (r"bug|fix|hotfix|แก้", "4h"),
-]
-DEFAULT_OE = "4h"
-
-
-def estimate_oe(summary: str) -> str:
-    """Estimate original_estimate from subtask summary keywords."""
-    lower = summary.lower()
-    for pattern, hours in OE_PATTERNS:
-        if re.search(pattern, lower):
-            return hours
-    return DEFAULT_OE
-
-
-def parse_date(val) -> str | None:
-    """Extract date string from Jira field value."""
-    if isinstance(val, dict):
-        return val.get("value") or None
-    return val or None
-
-
-def clamp_date(date_str: str, min_date: str, max_date: str) -> str:
-    """Clamp a date string within [min_date, max_date] range."""
-    if date_str < min_date:
-        return min_date
-    if date_str > max_date:
-        return max_date
-    return date_str
-
-
-def distribute_dates(count: int, parent_start: str, parent_due: str) -> list[tuple[str, str]]:
-    """Distribute subtask dates evenly within parent range."""
-    start = datetime.strptime(parent_start, "%Y-%m-%d")
-    end = datetime.strptime(parent_due, "%Y-%m-%d")
-    total_days = max((end - start).days, count)
-
-    days_per = max(total_days // count, 1)
-    results = []
-    for i in range(count):
-        s = start + timedelta(days=i * days_per)
-        d = min(s + timedelta(days=days_per - 1), end)
-        # Clamp to parent range
-        s = max(s, start)
-        d = min(d, end)
-        results.append((s.strftime("%Y-%m-%d"), d.strftime("%Y-%m-%d")))
-    return results
+from lib.jira_api import derive_jira_url
+
+
+def run_benchmark(max_subtasks: int) -> int:
+    """Time analyze_alignment on synthetic sprints to show linear scaling.
+
+    Parent count is fixed, so sibling groups grow with the subtask count —
+    the case where the old per-subtask sibling rescan went quadratic.
+    """
+    import random
+    import time
+
+    rng = random.Random(42)
+    n_parents = 50
+    parents = {
+        f"BENCH-{p}": Issue(
+            f"BENCH-{p}",
+            summary=f"Parent {p}",
+            status="In Progress",
+            type="Story",
+            start="2026-01-05",
+            due="2026-03-27",
+            size="M",
+            assignee="Bench",
+        )
+        for p in range(n_parents)
+    }
+
+    print(f"{'subtasks':>10} {'seconds':>10} {'µs/subtask':>12}")
+    size = max(max_subtasks // 8, 1)
+    while True:
+        subtasks = []
+        for i in range(size):
+            has_dates = rng.random() < 0.3
+            subtasks.append(
+                Issue(
+                    f"SUB-{i}",
+                    summary=rng.choice(["Add endpoint", "Write tests", "Build form", "Fix bug"]),
+                    parent=f"BENCH-{i % n_parents}",
+                    priority=rng.choice(list(PRIORITY_ORDER)),
+                    start="2026-01-10" if has_dates else None,
+                    due="2026-01-20" if has_dates else None,
+                    estimate="4h" if rng.random() < 0.5 else None,
+                )
+            )
+        t0 = time.perf_counter()
+        analyze_alignment(parents, subtasks)
+        elapsed = time.perf_counter() - t0
+        print(f"{size:>10} {elapsed:>10.4f} {elapsed / size * 1e6:>12.2f}")
+        if size >= max_subtasks:
+            break
+        size = min(size * 2, max_subtasks)
+    return 0
 
 
 def main():
+    if "--benchmark" in sys.argv:
+        idx = sys.argv.index("--benchmark")
+        size = int(sys.argv[idx + 1]) if idx + 1 < len(sys.argv) else 10_000
+        return run_benchmark(size)
+
     dry_run = "--apply" not in sys.argv
     report_only = "--report-only" in sys.argv
+    # Dry runs read through the local snapshot; --apply always refreshes it first
+    cache = None if "--no-cache" in sys.argv else SnapshotCache()
+    cache_ttl = None if dry_run else 0
 
-    # Parse sprint ID
+    # Parse sprint ID / worker count
     sprint_id = None
+    workers = DEFAULT_WORKERS
     for i, arg in enumerate(sys.argv):
         if arg == "--sprint" and i + 1 < len(sys.argv):
             sprint_id = int(sys.argv[i + 1])
+        if arg == "--workers" and i + 1 < len(sys.argv):
+            workers = int(sys.argv[i + 1])
 
     if dry_run and not report_only:
         print("🔍 DRY RUN — use --apply to actually update Jira\n")
@@ -119,7 +120,7 @@ def main():
 
     # Connect
     creds = load_credentials()
-    api = JiraAPI(
+    api = PooledJiraAPI(
         base_url=derive_jira_url(creds["CONFLUENCE_URL"]),
         auth_header=get_auth_header(creds["CONFLUENCE_USERNAME"], creds["CONFLUENCE_API_TOKEN"]),
         ssl_context=create_ssl_context(),
@@ -138,40 +139,7 @@ def main():
             return 1
 
     # --- Phase 1: Fetch parent issues ---
-    parent_fields = (
-        "summary,status,issuetype,assignee,customfield_10015,duedate,customfield_10016,customfield_10107,timetracking"
-    )
-    subtask_fields = "summary,status,issuetype,parent,assignee,priority,customfield_10015,duedate,timetracking"
-    result = api.get_sprint_issues(sprint_id, fields=parent_fields, max_results=50)
-    all_issues = result.get("issues", [])
-
-    parents = {}
-    for issue in all_issues:
-        key = issue["key"]
-        f = issue.get("fields", {})
-        status = f.get("status", {}).get("name", "?")
-        itype = f.get("issuetype", {}).get("name", "?")
-
-        if status in SKIP_STATUSES:
-            continue
-        if itype not in PARENT_TYPES:
-            continue
-
-        start = parse_date(f.get("customfield_10015"))
-        due = f.get("duedate")
-        size_obj = f.get("customfield_10107")
-        size = size_obj.get("value") if isinstance(size_obj, dict) else size_obj
-        assignee = (f.get("assignee") or {}).get("displayName", "Unassigned")
-
-        parents[key] = {
-            "summary": f.get("summary", ""),
-            "status": status,
-            "type": itype,
-            "start": start,
-            "due": due,
-            "size": size,
-            "assignee": assignee,
-        }
+    parents = collect_parents(parse_issues(fetch_sprint_issues(api, sprint_id, PARENT_FIELDS, cache, cache_ttl)))
 
     print(f"Found {len(parents)} active parent issues\n")
 
@@ -180,156 +148,18 @@ def main():
         return 0
 
     # --- Phase 2: Fetch subtasks ---
-    parent_keys = list(parents.keys())
-    # JQL: fetch in batches of 20 (HR2: no ORDER BY with parent)
-    all_subtasks = []
-    for i in range(0, len(parent_keys), 20):
-        batch = parent_keys[i : i + 20]
-        jql = f"parent in ({','.join(batch)})"
-        sub_result = api.search_issues(jql, fields=subtask_fields, max_results=50)
-        all_subtasks.extend(sub_result.get("issues", []))
+    # Concurrent, fully paginated `parent in (...)` batches (HR2: no ORDER BY with parent)
+    all_subtasks = parse_issues(load_children(api, list(parents.keys()), SUBTASK_FIELDS, cache, cache_ttl, workers))
 
     # Filter out done
-    active_subtasks = []
-    for s in all_subtasks:
-        f = s.get("fields", {})
-        status = f.get("status", {}).get("name", "?")
-        if status not in SKIP_STATUSES:
-            active_subtasks.append(s)
+    active_subtasks = [s for s in all_subtasks if s.status not in SKIP_STATUSES]
 
     print(
         f"Found {len(all_subtasks)} subtasks ({len(active_subtasks)} active, {len(all_subtasks) - len(active_subtasks)} done)\n"
     )
 
     # --- Phase 3: Analyze alignment ---
-    date_violations = []
-    missing_dates = []
-    missing_oe = []
-    fixes = []  # (key, fields_to_update, reason)
-    parent_extensions = {}  # parent_key → new_due (extend parent if subtasks overshoot)
-
-    # Group subtasks by parent for date distribution
-    # Sort each group by priority (Highest first → gets earlier dates)
-    subtasks_by_parent: dict[str, list] = {}
-    for s in active_subtasks:
-        f = s.get("fields", {})
-        parent_key = (f.get("parent") or {}).get("key")
-        if parent_key and parent_key in parents:
-            subtasks_by_parent.setdefault(parent_key, []).append(s)
-
-    def subtask_priority_key(s):
-        """Sort key: priority (Highest=1 first), then due date."""
-        f = s.get("fields", {})
-        p_name = (f.get("priority") or {}).get("name", "Medium")
-        due = f.get("duedate") or "9999-12-31"
-        return (PRIORITY_ORDER.get(p_name, 3), due)
-
-    for parent_key in subtasks_by_parent:
-        subtasks_by_parent[parent_key].sort(key=subtask_priority_key)
-
-    # Pre-scan: find max subtask due per parent (to detect parent extension needed)
-    for parent_key, subs in subtasks_by_parent.items():
-        p = parents[parent_key]
-        p_due = p["due"]
-        if not p_due:
-            continue
-        max_sub_due = p_due
-        for s in subs:
-            sub_due = s.get("fields", {}).get("duedate")
-            if sub_due and sub_due > max_sub_due:
-                max_sub_due = sub_due
-        if max_sub_due > p_due:
-            parent_extensions[parent_key] = max_sub_due
-
-    for s in active_subtasks:
-        key = s["key"]
-        f = s.get("fields", {})
-        parent_key = (f.get("parent") or {}).get("key")
-
-        if not parent_key or parent_key not in parents:
-            continue
-
-        p = parents[parent_key]
-        p_start = p["start"]
-        p_due = p["due"]
-
-        if not p_start or not p_due:
-            continue  # Parent has no dates — can't validate
-
-        # Use extended parent due if applicable
-        effective_p_due = parent_extensions.get(parent_key, p_due)
-
-        sub_start = parse_date(f.get("customfield_10015"))
-        sub_due = f.get("duedate")
-        tt = f.get("timetracking", {}) or {}
-        oe = tt.get("originalEstimate", "")
-
-        update_fields: dict = {}
-
-        # Check dates
-        if not sub_start or not sub_due:
-            missing_dates.append((key, parent_key, sub_start, sub_due))
-            # Fix: distribute within parent range
-            if not report_only:
-                siblings = subtasks_by_parent.get(parent_key, [])
-                missing_in_group = [
-                    x
-                    for x in siblings
-                    if not parse_date(x.get("fields", {}).get("customfield_10015"))
-                    or not x.get("fields", {}).get("duedate")
-                ]
-                if missing_in_group:
-                    idx = next((i for i, x in enumerate(missing_in_group) if x["key"] == key), 0)
-                    dates = distribute_dates(len(missing_in_group), p_start, effective_p_due)
-                    if idx < len(dates):
-                        new_start, new_due = dates[idx]
-                        update_fields["customfield_10015"] = new_start
-                        update_fields["duedate"] = new_due
-        else:
-            # Check HR8 violations — only flag start-before-parent (subtask too early)
-            # For subtask-due > parent-due: extend parent instead of clamping subtask
-            violations = []
-            new_start = sub_start
-
-            if sub_start < p_start:
-                violations.append(f"start {sub_start} < parent start {p_start}")
-                new_start = p_start
-            if sub_due > p_due:
-                violations.append(f"due {sub_due} > parent due {p_due} → extend parent to {effective_p_due}")
-
-            if violations:
-                date_violations.append((key, parent_key, sub_start, sub_due, p_start, p_due, "; ".join(violations)))
-                if not report_only:
-                    new_start = clamp_date(new_start, p_start, effective_p_due)
-                    new_due = sub_due
-                    # If due is before new start, move due to new start
-                    if new_due < new_start:
-                        new_due = new_start
-                    if new_start != sub_start:
-                        update_fields["customfield_10015"] = new_start
-                    if new_due != sub_due:
-                        update_fields["duedate"] = new_due
-
-        # Check OE
-        if not oe:
-            missing_oe.append((key, parent_key, f.get("summary", "")))
-            if not report_only:
-                estimated = estimate_oe(f.get("summary", ""))
-                update_fields["timetracking"] = {"originalEstimate": estimated}
-
-        if update_fields:
-            reason_parts = []
-            if "customfield_10015" in update_fields or "duedate" in update_fields:
-                reason_parts.append("dates")
-            if "timetracking" in update_fields:
-                reason_parts.append(f"OE={update_fields['timetracking']['originalEstimate']}")
-            fixes.append((key, update_fields, ", ".join(reason_parts)))
-
-    # Add parent extension fixes
-    for parent_key, new_due in parent_extensions.items():
-        p = parents[parent_key]
-        if not report_only:
-            fixes.append((parent_key, {"duedate": new_due}, f"extend due {p['due']}→{new_due} (subtasks overshoot)"))
+    date_violations, missing_dates, missing_oe, fixes = analyze_alignment(parents, active_subtasks, report_only)
 
     # --- Phase 4: Report ---
     print("=" * 70)
@@ -366,22 +196,16 @@ def main():
     print(f"FIXES: {len(fixes)} subtasks to update")
     print(f"{'=' * 70}")
 
-    updated = []
-    errors = []
-
     for key, fields_to_update, reason in fixes:
         field_desc = ", ".join(f"{k}={v}" for k, v in fields_to_update.items())
-        print(f"{'→' if dry_run else '✅'} {key:<10} | {reason:<20} | {field_desc}")
-
-        if not dry_run:
-            try:
-                api.update_fields(key, fields_to_update)
-                updated.append(key)
-            except Exception as e:
-                print(f"   ❌ ERROR: {e}")
-                errors.append(f"{key}: {e}")
-        else:
-            updated.append(key)
+        print(f"→ {key:<10} | {reason:<20} | {field_desc}")
+
+    if dry_run:
+        updated = [key for key, _, _ in fixes]
+        errors = []
+    else:
+        print(f"\n⚡ Applying {len(fixes)} updates ({workers} workers)...")
+        updated, errors = apply_fixes(api, fixes, workers)
 
     # Summary
     print(f"\n{'=' * 70}")
@@ -392,8 +216,9 @@ def main():
         for e in errors:
             print(f"  ❌ {e}")
 
-    if not dry_run and updated:
-        print(f"\n⚠️  Remember to cache_invalidate(sprint_id={sprint_id}) after this!")
+    if not dry_run and api.mutations:
+        invalidate_snapshot(api.mutations, cache or SnapshotCache())
+        print("\n🔄 " + invalidation_summary(api.mutations, [sprint_id]))
 
     return 0 if not errors else 1
 